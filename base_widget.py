@@ -5,6 +5,8 @@ import numpy
 from .content.typing import HudAccessibleNode
 from .widget_preferences import HeadUpDisplayUserWidgetPreferences
 from .content.partial_content import HudPartialContent
+from .frame_clock import frame_clock
+from .theme import HudStyleValue
 import copy
 import re
 
@@ -15,6 +17,11 @@ class BaseWidget(metaclass=ABCMeta):
     enabled = False
     theme = None
     event_dispatch = None
+
+    # The theme values that are drawn with, compiled into the style whenever the theme is loaded
+    style_values = [HudStyleValue("focus_colour"), HudStyleValue("event_log_background", default="F5F5F5")]
+    style = None
+
     preferences = None
     mouse_enabled = False
     
@@ -44,7 +51,6 @@ class BaseWidget(metaclass=ABCMeta):
     focus_canvas = None
     
     # Draw cycle handling
-    inactivity_job = None
     stop_drawing = True
     animating = False
     
@@ -229,28 +235,28 @@ class BaseWidget(metaclass=ABCMeta):
             if not self.animating:
                 if self.show_animations and animated:                
                     self.animating = True
-                    cron.cancel(self.inactivity_job)                    
                     self.canvas.resume()
-                    self.inactivity_job = cron.interval("16ms", self.freeze_drawing)
+                    frame_clock.subscribe(self.freeze_drawing)
                 else:
                     self.canvas.freeze()
                     self.stop_drawing = True
 
-    def freeze_drawing(self):
+    def freeze_drawing(self) -> bool:
+        """Checks every frame whether the animation has stopped, returning False to unsubscribe from the frame clock once it has"""
         if not self.canvas:
-            cron.cancel(self.inactivity_job)
+            return False
         elif self.stop_drawing:
             self.animating = False
             self.canvas.freeze()
-            cron.cancel(self.inactivity_job)
+            return False
+        return True
 
     # Clear up all the resources after a disabling
     def clear(self):
         if (self.canvas is not None):
             self.animating = False
             self.stop_drawing = True            
-            cron.cancel(self.inactivity_job)
-            self.inactivity_job = None
+            frame_clock.unsubscribe(self.freeze_drawing)
             self.canvas.freeze()        
             self.canvas.unregister("draw", self.draw_cycle)
             self.canvas.close()
@@ -359,8 +365,8 @@ class BaseWidget(metaclass=ABCMeta):
         pass
         
     def load_theme_values(self):
-        """Respond to theme load ins here"""    
-        pass
+        """Respond to theme load ins here, after loading the style of this widget"""    
+        self.style = self.theme.create_style(self.style_values)
         
     def start_setup(self, setup_type, mouse_position = None):
         """Starts a setup mode that is used for moving, resizing and other various changes that the user might setup"""            
@@ -535,14 +541,13 @@ class BaseWidget(metaclass=ABCMeta):
 
     def draw_focus_name(self, canvas):
         canvas.paint.style = canvas.paint.Style.FILL
-        canvas.paint.color = self.theme.get_colour("event_log_background", "F5F5F5")
+        canvas.paint.color = self.style.event_log_background
         rect = ui.Rect(canvas.x + 2, canvas.y + 2, canvas.width - 4, canvas.height - 4)
         radius = self.font_size
         rrect = skia.RoundRect.from_rect(rect, x=radius, y=radius)
         canvas.draw_rrect(rrect)
         
-        focus_colour = self.theme.get_colour("focus_colour")
-        canvas.paint.color = focus_colour
+        canvas.paint.color = self.style.focus_colour
         canvas.paint.style = canvas.paint.Style.STROKE
         canvas.paint.stroke_width = 4
         
@@ -0,0 +1,524 @@
+# Headless benchmarks of the text layout, rich text conversion, event log drawing and voice command context updates used by the HUD
+# These run on plain Python without Talon, using a deterministic stand-in for the parts of talon.skia and talon.ui that the layout uses
+# The other Talon APIs are replaced by placeholders that do nothing, so the HUD itself can be loaded
+#
+# Usage from the root of the HUD directory:
+#   python benchmarks/layout_benchmarks.py                      Runs all benchmarks and compares them against the stored baselines
+#   python benchmarks/layout_benchmarks.py --update-baselines   Stores the results of this run as the new baselines
+#
+# Timings are stored relative to a calibration workload in pure Python, so the baselines can be shared between machines
+# A benchmark fails the run when it is slower than its baseline by more than the threshold,
+# Or when it measures more text with skia than its baseline, which is deterministic
+#
+# Talon loads every Python file in the user directory, so nothing happens here unless this file is run directly
+import os
+import sys
+import json
+import types
+import time
+import gc
+import random
+import argparse
+import importlib
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+hud_dir = os.path.dirname(benchmarks_dir)
+baselines_file = os.path.join(benchmarks_dir, "baselines.json")
+
+# Name under which the HUD directory is imported, so its relative imports keep working
+hud_package_name = "talon_hud"
+
+class StandInRect:
+    def __init__(self, x=0, y=0, width=0, height=0):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+class StandInPoint2d:
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+class StandInFont:
+    def __init__(self):
+        self.embolden = False
+        self.skew_x = 0
+
+class StandInPaint:
+    """Deterministic stand-in for skia.Paint, where every character has a fixed advance width relative to the text size
+    The bounds of a text are the union of the ink of its glyphs, so leading and trailing spaces do not add to the bounds like in skia
+    """
+    narrow_characters = "iljtf!|.,:;'`()[]{}"
+    wide_characters = "mwMW@%"
+
+    class Style:
+        FILL = "fill"
+        STROKE = "stroke"
+
+    def __init__(self, textsize: int = 18):
+        self.textsize = textsize
+        self.font = StandInFont()
+        self.color = "000000"
+        self.style = self.Style.FILL
+        self.stroke_width = 1
+        self.antialias = True
+        self.measure_count = 0
+
+    def get_advance(self, character: str) -> float:
+        if character == " ":
+            advance = 0.3
+        elif character in self.narrow_characters:
+            advance = 0.3
+        elif character in self.wide_characters:
+            advance = 0.85
+        elif character.isupper():
+            advance = 0.7
+        elif character.isdigit():
+            advance = 0.55
+        else:
+            advance = 0.5
+        if self.font.embolden and character != " ":
+            advance += 0.05
+        return advance * self.textsize
+
+    def measure_text(self, text: str) -> tuple:
+        self.measure_count += 1
+        position = 0.0
+        left = right = top = bottom = None
+        for character in text:
+            advance = self.get_advance(character)
+            if character != " ":
+                glyph_left = position + 0.04 * self.textsize
+                glyph_right = position + advance - 0.06 * self.textsize
+                glyph_top = -0.8 * self.textsize if character.isupper() else -0.7 * self.textsize
+                glyph_bottom = 0.25 * self.textsize if character in "gjpqy" else 0.0
+                left = glyph_left if left is None else min(left, glyph_left)
+                right = glyph_right if right is None else max(right, glyph_right)
+                top = glyph_top if top is None else min(top, glyph_top)
+                bottom = glyph_bottom if bottom is None else max(bottom, glyph_bottom)
+            position += advance
+
+        if left is None:
+            return position, StandInRect(0, 0, 0, 0)
+        return position, StandInRect(left, top, right - left, bottom - top)
+
+class StandInRoundRect:
+    @classmethod
+    def from_rect(cls, rect: StandInRect, x: float = 0, y: float = 0):
+        return cls()
+
+class StandInCanvas:
+    """Stand-in for the canvas that widgets draw on, which only counts the drawing calls"""
+    def __init__(self, paint: StandInPaint):
+        self.paint = paint
+        self.draw_count = 0
+
+    def draw_rrect(self, rrect: StandInRoundRect):
+        self.draw_count += 1
+
+    def draw_rect(self, rect: StandInRect):
+        self.draw_count += 1
+
+    def draw_line(self, x1: float, y1: float, x2: float, y2: float):
+        self.draw_count += 1
+
+    def draw_text(self, text: str, x: float, y: float):
+        self.draw_count += 1
+
+class StandInImage:
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.width = 0
+        self.height = 0
+
+    @classmethod
+    def from_file(cls, filename: str):
+        return cls(filename)
+
+class StandInTalonObject:
+    """Stand-in for the Talon APIs that only need to exist for the HUD to be loaded, like modules, contexts, actions and settings
+    Every attribute and call results in another stand-in, and decorators return the function or class they decorate
+    """
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 1 and len(kwargs) == 0 and callable(args[0]):
+            return args[0]
+        return StandInTalonObject()
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StandInTalonObject()
+
+    def __getitem__(self, key):
+        return StandInTalonObject()
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __iter__(self):
+        return iter([])
+
+    def __bool__(self):
+        return False
+
+class StandInDispatch:
+    def register(self, event: str, callback):
+        pass
+
+    def unregister(self, event: str, callback):
+        pass
+
+    def dispatch(self, event: str, *args):
+        pass
+
+class StandInScreen:
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.width = 1920
+        self.height = 1080
+        self.mm_x = 527.0
+        self.mm_y = 296.0
+        self.dpi = 96
+        self.scale = 1
+        self.rect = StandInRect(0, 0, 1920, 1080)
+        self.visible_rect = StandInRect(0, 0, 1920, 1080)
+
+def install_talon_stand_in():
+    """Registers the stand-in talon modules, only if Talon itself is not available"""
+    if "talon" in sys.modules:
+        return
+
+    talon = types.ModuleType("talon")
+    skia = types.ModuleType("talon.skia")
+    skia.Paint = StandInPaint
+    skia.RoundRect = StandInRoundRect
+    skia.Image = StandInImage
+    ui = types.ModuleType("talon.ui")
+    ui.Rect = StandInRect
+    ui.Screen = object
+    ui.screens = lambda: [StandInScreen()]
+    ui.main_screen = lambda: StandInScreen()
+    talon_types = types.ModuleType("talon.types")
+    point = types.ModuleType("talon.types.point")
+    point.Point2d = StandInPoint2d
+    talon_types.Point2d = StandInPoint2d
+
+    talon.skia = skia
+    talon.ui = ui
+
+    # Modules that the HUD imports, but that are not used by the benchmarked code
+    for name in ["app", "actions", "canvas", "cron", "ctrl", "scope", "settings", "registry", "fs", "speech_system", "clip"]:
+        module = types.ModuleType("talon." + name)
+        module.__getattr__ = lambda attribute: StandInTalonObject()
+        setattr(talon, name, module)
+    talon.Module = StandInTalonObject
+    talon.Context = StandInTalonObject
+    scripting = types.ModuleType("talon.scripting")
+    scripting.Dispatch = StandInDispatch
+    talon.scripting = scripting
+    talon.types = talon_types
+    talon_types.point = point
+
+    # The HUD only writes to the Talon directories when content or preferences are persisted, which the benchmarks do not do
+    talon_init = types.ModuleType("talon_init")
+    talon_init.TALON_USER = hud_dir
+    talon_init.TALON_HOME = hud_dir
+    sys.modules.update({"talon": talon, "talon.skia": skia, "talon.ui": ui, "talon.types": talon_types, "talon.types.point": point,
+        "talon.scripting": scripting, "talon_init": talon_init})
+
+def import_hud_module(name: str):
+    if hud_package_name not in sys.modules:
+        package = types.ModuleType(hud_package_name)
+        package.__path__ = [hud_dir]
+        sys.modules[hud_package_name] = package
+    return importlib.import_module(hud_package_name + "." + name)
+
+def read_file(filename: str) -> str:
+    with open(filename, "r", encoding="utf-8") as file:
+        return file.read()
+
+def load_corpus() -> dict:
+    """Load the bundled documentation and walkthroughs, along with synthetic log messages that are the same on every run"""
+    docs_dir = os.path.join(hud_dir, "docs")
+    rich_texts = [read_file(os.path.join(docs_dir, filename)) for filename in sorted(os.listdir(docs_dir)) if filename.endswith(".txt")]
+    markdown_dirs = [hud_dir, os.path.join(docs_dir, "deprecated_docs")]
+    markdowns = [read_file(os.path.join(directory, filename)) for directory in markdown_dirs for filename in sorted(os.listdir(directory)) if filename.endswith(".md")]
+
+    walkthrough_steps = []
+    for filename in sorted(os.listdir(docs_dir)):
+        if filename.endswith(".json"):
+            walkthrough_steps.extend([step["content"] for step in json.loads(read_file(os.path.join(docs_dir, filename))) if "content" in step])
+
+    # Synthetic log messages with styles, voice commands and the occasional word that does not fit on a line
+    generator = random.Random(2022)
+    vocabulary = sorted(set([word for word in " ".join(rich_texts).split() if "<" not in word and ">" not in word]))
+    styles = ["<*", "</", "<+", "<!!", "<!", "<@", "<cmd@ "]
+    logs = []
+    for _ in range(1000):
+        words = []
+        for _ in range(generator.randint(3, 40)):
+            word = generator.choice(vocabulary)
+            chance = generator.random()
+            if chance < 0.08:
+                word = generator.choice(styles) + word + "/>"
+            elif chance < 0.09:
+                word = "https://example.com/" + "".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(60))
+            words.append(word)
+        logs.append(" ".join(words))
+
+    return {
+        "rich_texts": rich_texts,
+        "markdowns": markdowns,
+        "walkthrough_steps": walkthrough_steps,
+        "logs": logs
+    }
+
+def create_event_log(eventlog, theme):
+    """An event log that is tall enough to show all its logs at once, so none of them are cut off"""
+    event_log = eventlog.HeadUpEventLog("event_log", {}, theme.HeadUpDisplayTheme("light"), None)
+    event_log.y = event_log.limit_y = 0
+    event_log.height = event_log.limit_height = 100000
+    event_log.visual_logs = []
+    return event_log
+
+def create_context_display(display, textpanel, content_builder, corpus: dict):
+    """The HUD with its default widgets and ten more text panels for a total of 20 widgets, where the choice panel shows 100 choices"""
+    hud = display.hud
+    widgets = [widget for widget in hud.widget_manager.widgets]
+    for index in range(20 - len(widgets)):
+        widgets.append(textpanel.HeadUpTextPanel("Text panel " + str(index + 2), {}, hud.theme, hud.event_dispatch))
+    hud.widget_manager.widgets = widgets
+
+    builder = content_builder.HudContentBuilder(None)
+    vocabulary = sorted(set([word for word in " ".join(corpus["logs"]).split() if word.isalpha()]))
+    choices = builder.create_choices([{"text": vocabulary[index * 7 % len(vocabulary)] + " " + str(index)} for index in range(100)], lambda data: None)
+    for widget in widgets:
+        widget.enabled = True
+        if widget.id == "Choices":
+            widget.update_panel(builder.create_panel_content("Pick one of the choices", "choices", "Choices", True, choices=choices))
+    return hud
+
+def create_benchmarks(utils, layout_cache, eventlog, typing, theme, display, textpanel, content_builder, corpus: dict, paint: StandInPaint) -> dict:
+    """Every benchmark has a setup that brings the caches into the same state before every run, and the run that is timed"""
+    widths = [300, 600]
+
+    def clear_layouts_and_measurements():
+        utils.rich_text_layout_cache.clear()
+        utils.text_measurements.clear()
+
+    def measure_words_before(run):
+        # Only the layout is timed, with the words already measured like they are after the HUD has been running for a while
+        def setup():
+            clear_layouts_and_measurements()
+            run()
+            utils.rich_text_layout_cache.clear()
+        return setup
+
+    def fill_layouts():
+        clear_layouts_and_measurements()
+        layout_docs(utils.LINE_BREAKING_GREEDY)
+
+    def layout_docs(line_breaking: str):
+        for width in widths:
+            for text in corpus["rich_texts"]:
+                utils.layout_rich_text(paint, text, width, 1080, line_breaking)
+
+    layout_docs_greedy = lambda: layout_docs(utils.LINE_BREAKING_GREEDY)
+    layout_docs_minimum_raggedness = lambda: layout_docs(utils.LINE_BREAKING_MINIMUM_RAGGEDNESS)
+
+    def layout_docs_resizing():
+        # Dragging the width of a documentation panel one pixel at a time
+        for width in range(300, 400):
+            for text in corpus["rich_texts"]:
+                utils.layout_rich_text(paint, text, width, 1080)
+
+    def layout_logs():
+        for text in corpus["logs"]:
+            utils.layout_rich_text(paint, text, 400, 1080)
+
+    def layout_growing_log():
+        # A text panel whose content grows by a single line at a time, like a log with its history shown
+        incremental_layout = layout_cache.HudIncrementalLayout()
+        text = ""
+        for log in corpus["logs"][:300]:
+            text = text + "\n" + log if text else log
+            utils.layout_rich_text(paint, text, 400, 1080, utils.LINE_BREAKING_GREEDY, None, incremental_layout)
+
+    def convert_markdown():
+        for _ in range(5):
+            for markdown in corpus["markdowns"]:
+                utils.md_to_richtext_content(markdown)
+
+    def retrieve_voice_commands():
+        for _ in range(5):
+            for text in corpus["walkthrough_steps"] + corpus["rich_texts"]:
+                utils.retrieve_available_voice_commands(text)
+
+    log_words = [log.split(" ") for log in corpus["logs"]]
+    def measure_words_bounds():
+        _, space_text_bounds = paint.measure_text(" ")
+        for _ in range(5):
+            for words in log_words:
+                utils.calculate_words_bounds(words, paint, space_text_bounds)
+
+    event_log = create_event_log(eventlog, theme)
+    event_log_canvas = StandInCanvas(paint)
+    def show_event_logs():
+        # Logs that have been visible for a while, so they have been drawn before they start fading out
+        clear_layouts_and_measurements()
+        event_log.visual_logs = [event_log.create_visual_log(typing.HudLogMessage(0, log_type, log)) for log_type, log in
+            zip(["command", "event", "error", "warning", "success"] * 10, corpus["logs"][:50])]
+        event_log.draw(event_log_canvas)
+        for visual_log in event_log.visual_logs:
+            visual_log.animation_tick = -1
+            visual_log.animation_goal = -event_log.ttl_animation_max_duration
+
+    def fade_out_event_logs():
+        while event_log.draw(event_log_canvas):
+            pass
+
+    hud = create_context_display(display, textpanel, content_builder, corpus)
+    def clear_context():
+        hud.widget_contexts = {}
+        hud.context_lists = {}
+
+    def update_changed_context():
+        # Every widget has changed since the previous update, like right after the HUD is enabled
+        for _ in range(100):
+            clear_context()
+            hud.update_context()
+
+    def update_unchanged_context():
+        for _ in range(100):
+            hud.update_context()
+
+    return {
+        "layout_docs_cold": (clear_layouts_and_measurements, layout_docs_greedy),
+        "layout_docs_greedy": (measure_words_before(layout_docs_greedy), layout_docs_greedy),
+        "layout_docs_minimum_raggedness": (measure_words_before(layout_docs_minimum_raggedness), layout_docs_minimum_raggedness),
+        "layout_docs_cached": (fill_layouts, lambda: [layout_docs_greedy() for _ in range(200)]),
+        "layout_docs_resizing": (measure_words_before(layout_docs_resizing), layout_docs_resizing),
+        "layout_long_logs": (clear_layouts_and_measurements, layout_logs),
+        "layout_growing_log": (clear_layouts_and_measurements, layout_growing_log),
+        "md_to_richtext_content": (clear_layouts_and_measurements, convert_markdown),
+        "retrieve_available_voice_commands": (clear_layouts_and_measurements, retrieve_voice_commands),
+        "calculate_words_bounds": (clear_layouts_and_measurements, measure_words_bounds),
+        "draw_fading_event_logs": (show_event_logs, fade_out_event_logs),
+        "update_context": (clear_context, update_changed_context),
+        "update_context_unchanged": (lambda: [clear_context(), hud.update_context()], update_unchanged_context),
+    }
+
+def calibrate(corpus: dict) -> float:
+    """Pure Python workload that the benchmark timings are divided by, to make them comparable between machines"""
+    text = "\n".join(corpus["rich_texts"])
+    counts = {}
+    for line in text.splitlines():
+        for word in line.split(" "):
+            counts[word] = counts.get(word, 0) + len(word)
+    return sum(counts.values())
+
+def time_run(setup, run, calibration_run, repeat: int) -> tuple[float, float]:
+    """Time the fastest run of a benchmark, alternated with the calibration so both are affected by the same load on the machine
+    Like timeit, garbage collection is turned off during the timing so it does not add to some runs at random
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    best_duration = None
+    best_calibration = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calibration_run()
+        calibration = time.perf_counter() - start
+        best_calibration = calibration if best_calibration is None else min(best_calibration, calibration)
+
+        setup()
+        start = time.perf_counter()
+        run()
+        duration = time.perf_counter() - start
+        best_duration = duration if best_duration is None else min(best_duration, duration)
+
+    if gc_enabled:
+        gc.enable()
+    return best_duration, best_calibration
+
+def run_benchmarks(names: list[str], repeat: int) -> dict:
+    install_talon_stand_in()
+    utils = import_hud_module("utils")
+    layout_cache = import_hud_module("layout_cache")
+    eventlog = import_hud_module("widgets.eventlog")
+    typing = import_hud_module("content.typing")
+    theme = import_hud_module("theme")
+    display = import_hud_module("display")
+    textpanel = import_hud_module("widgets.textpanel")
+    content_builder = import_hud_module("content.content_builder")
+
+    corpus = load_corpus()
+    paint = StandInPaint(18)
+    benchmarks = create_benchmarks(utils, layout_cache, eventlog, typing, theme, display, textpanel, content_builder, corpus, paint)
+
+    calibration_run = lambda: [calibrate(corpus) for _ in range(20)]
+    results = {}
+    for name, (setup, run) in benchmarks.items():
+        if names and name not in names:
+            continue
+
+        # Count the measurements of a single run, which do not depend on the machine
+        setup()
+        paint.measure_count = 0
+        run()
+        measure_count = paint.measure_count
+
+        duration, calibration = time_run(setup, run, calibration_run, repeat)
+        results[name] = {
+            "milliseconds": round(duration * 1000, 3),
+            "relative_time": round(duration / calibration, 4),
+            "measure_text_calls": measure_count
+        }
+    return results
+
+def compare_to_baselines(results: dict, baselines: dict, threshold: float) -> list[str]:
+    failures = []
+    print("%-36s %10s %10s %10s %8s %12s" % ("benchmark", "ms", "relative", "baseline", "change", "measures"))
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print("%-36s %10.3f %10.4f %10s %8s %12d" % (name, result["milliseconds"], result["relative_time"], "-", "-", result["measure_text_calls"]))
+            continue
+
+        change = result["relative_time"] / baseline["relative_time"] - 1 if baseline["relative_time"] > 0 else 0.0
+        print("%-36s %10.3f %10.4f %10.4f %7.1f%% %12d" % (name, result["milliseconds"], result["relative_time"], baseline["relative_time"], change * 100, result["measure_text_calls"]))
+        if change > threshold:
+            failures.append("%s is %.1f%% slower than its baseline, which is above the threshold of %.1f%%" % (name, change * 100, threshold * 100))
+        if result["measure_text_calls"] > baseline["measure_text_calls"]:
+            failures.append("%s measures text %d times where its baseline measures %d times" % (name, result["measure_text_calls"], baseline["measure_text_calls"]))
+    return failures
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless benchmarks of the Talon HUD text layout")
+    parser.add_argument("names", nargs="*", help="Only run the benchmarks with these names")
+    parser.add_argument("--repeat", type=int, default=15, help="Amount of runs per benchmark, of which the fastest is used")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Fraction a benchmark may be slower than its baseline before failing")
+    parser.add_argument("--update-baselines", action="store_true", help="Store the results of this run as the new baselines")
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(arguments.names, max(1, arguments.repeat))
+    baselines = json.loads(read_file(baselines_file)) if os.path.exists(baselines_file) else {}
+
+    if arguments.update_baselines:
+        baselines.update({name: {"relative_time": result["relative_time"], "measure_text_calls": result["measure_text_calls"]} for name, result in results.items()})
+        with open(baselines_file, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+            file.write("\n")
+
+    failures = compare_to_baselines(results, baselines, arguments.threshold)
+    for failure in failures:
+        print("REGRESSION: " + failure)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# Headless check that md_to_richtext_content turns markdown into the same rich text as the replace based converter it replaced
+# The old converter is kept here as it was, so any change to the conversion rules shows up as a difference
+#
+# Usage from the root of the HUD directory:
+#   python benchmarks/md_to_richtext_equivalence.py                  Compares the bundled markdown, walkthroughs, edge cases and generated strings
+#   python benchmarks/md_to_richtext_equivalence.py --count 200000   Compares more generated strings
+#
+# The old converter also turned literal "-ESCAPED-STAR-" style text into the escaped character, which is left alone now,
+# So the generated strings do not contain that text
+#
+# Talon loads every Python file in the user directory, so nothing happens here unless this file is run directly
+import os
+import sys
+import json
+import random
+import argparse
+
+from layout_benchmarks import install_talon_stand_in, import_hud_module, read_file, hud_dir
+
+def replace_md_to_richtext_content(utils, md_string: str):
+    """The converter from before the single scan conversion, apart from the sanitizer which is shared"""
+    sanitized_content = utils.sanitize_md_from_unsupported_tags(md_string)
+
+    # Marks to be translated to the internal rich text delimiters
+    mark_voice_command = "-MARK-VOICE-COMMAND-"
+    mark_italic = "-MARK-ITALIC-"
+    mark_italic_u = "-MARK-U-ITALIC-"
+    mark_emphasis = "-MARK-EMPHASIS-"
+    mark_emphasis_u = "-MARK-U-EMPHASIS-"
+    mark_error = "-MARK-ERROR-"
+
+    # Escaped marks
+    escaped_backtick = "-ESCAPED-BACKTICK-"
+    escaped_star = "-ESCAPED-STAR-"
+    escaped_underscore = "-ESCAPED-UNDERSCORE-"
+
+    # Keep escaped characters around
+    md_content = sanitized_content.replace("\\`", escaped_backtick).replace("\\*", escaped_star).replace("\\_", escaped_underscore)\
+        .replace(" ` ", " " + escaped_backtick + " ").replace(" * ", " " + escaped_star + " ").replace(" _ ", " " + escaped_underscore + " ")
+    content_escaped = len(md_content) != len(sanitized_content)
+
+    # Replace all the MD markers
+    md_content = md_content.replace("!!", mark_error)
+    md_content = md_content.replace("__", mark_emphasis_u).replace("**", mark_emphasis)
+    md_content = md_content.replace("_", mark_italic_u).replace("*", mark_italic)
+    md_content = md_content.replace(mark_emphasis + mark_emphasis_u, mark_emphasis + mark_italic_u)\
+        .replace(mark_emphasis_u + mark_emphasis, mark_emphasis_u + mark_italic)
+    md_content = md_content.replace("```", "`").replace("`", mark_voice_command)
+
+    md_content = replace_md_content_mark(md_content, mark_voice_command, "<cmd@")
+    md_content = replace_md_content_mark(md_content, mark_error, "<!!")
+    md_content = replace_md_content_mark(md_content, mark_italic, "</")
+    md_content = replace_md_content_mark(md_content, mark_italic_u, "</")
+    md_content = replace_md_content_mark(md_content, mark_emphasis, "<*")
+    md_content = replace_md_content_mark(md_content, mark_emphasis_u, "<*")
+
+    # Only unescape the content if we have escaped
+    if content_escaped:
+        md_content = md_content.replace(escaped_backtick, "`").replace(escaped_star, "*").replace(escaped_underscore, "_")
+
+    return md_content
+
+def replace_md_content_mark(md_content: str, mark_to_replace: str, token: str) -> str:
+    mark_opened = False
+    token_splits = md_content.split(mark_to_replace)
+    if len(token_splits) > 0:
+        replaced_content = token_splits[0]
+        for split_token in token_splits[1:]:
+            mark_opened = not mark_opened
+            replaced_content += ( token if mark_opened else "/>" ) + split_token
+        md_content = replaced_content
+    return md_content
+
+def load_markdown_cases() -> dict:
+    """The bundled documentation and the contents of the walkthrough steps, by file name"""
+    docs_dir = os.path.join(hud_dir, "docs")
+    cases = {}
+    for directory in [hud_dir, docs_dir, os.path.join(docs_dir, "deprecated_docs")]:
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".md"):
+                cases[os.path.relpath(os.path.join(directory, filename), hud_dir)] = read_file(os.path.join(directory, filename))
+            elif filename.endswith(".json") and directory == docs_dir:
+                steps = json.loads(read_file(os.path.join(directory, filename)))
+                for index, step in enumerate(steps):
+                    if "content" in step:
+                        cases[filename + " step " + str(index + 1)] = step["content"]
+    return cases
+
+# Marks that open and close in ways the conversion rules have to decide on
+edge_cases = [
+    # Nested marks
+    "**bold _italic_ bold**",
+    "__bold *italic* bold__",
+    "***bold italic***",
+    "___bold italic___",
+    "**__bold__**",
+    "__**bold**__",
+    "*italic **bold** italic*",
+    "_italic __bold__ italic_",
+    "!!error **bold `command` bold** error!!",
+    # Unclosed marks
+    "**bold",
+    "__bold",
+    "*italic",
+    "_italic",
+    "`command",
+    "```command",
+    "!!error",
+    "**bold _italic",
+    "closed **bold** and **open",
+    "snake_case_name and *a",
+    # Voice commands inside emphasis
+    "**say `hud theme dark`**",
+    "__say `hud theme dark`__",
+    "*say `focus chrome` now*",
+    "_say ```head up show``` now_",
+    "!!say `head up hide`!!",
+    "**say `<cmd@ literal/>`**",
+    "*<cmd@ head up show/>*",
+    # Escapes
+    "\\*not italic\\* and \\_not italic\\_ and \\`not a command\\`",
+    "a * b _ c ` d",
+    "a * * b",
+    "a _ _ _ b",
+    "** bold with spaces **",
+    "\\**bold**",
+    "**bold\\**",
+    # Line breaks and unsupported tags
+    "---\n**bold**",
+    "**bold\nover lines**",
+    "<img src=\"image.png\"/>\n*italic*",
+    "# Title\n\n* list item\n* `command`\n",
+    "",
+]
+
+def generate_cases(count: int, seed: int = 2022) -> list[str]:
+    """Strings made up of marks, escapes, spaces, words and line breaks, which are the same on every run"""
+    generator = random.Random(seed)
+    pieces = ["*", "**", "_", "__", "`", "```", "!!", "\\*", "\\_", "\\`", " ", " ", "  ", "\n", "word", "a", "b_c", "<cmd@", "/>", "#", "-"]
+    return ["".join(generator.choice(pieces) for _ in range(generator.randint(1, 24))) for _ in range(count)]
+
+def compare(utils, cases) -> list[tuple]:
+    mismatches = []
+    for name, md_string in cases:
+        expected = replace_md_to_richtext_content(utils, md_string)
+        result = utils.md_to_richtext_content(md_string)
+        if result != expected:
+            mismatches.append((name, md_string, expected, result))
+    return mismatches
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compares the markdown to rich text conversion against the replace based converter")
+    parser.add_argument("--count", type=int, default=20000, help="Amount of generated strings to compare")
+    parser.add_argument("--seed", type=int, default=2022, help="Seed of the generated strings")
+    arguments = parser.parse_args()
+
+    install_talon_stand_in()
+    utils = import_hud_module("utils")
+
+    markdown_cases = list(load_markdown_cases().items())
+    edge = [("edge case " + str(index + 1), md_string) for index, md_string in enumerate(edge_cases)]
+    generated = [("generated " + str(index + 1), md_string) for index, md_string in enumerate(generate_cases(arguments.count, arguments.seed))]
+
+    failed = False
+    for title, cases in [("markdown files and walkthroughs", markdown_cases), ("edge cases", edge), ("generated strings", generated)]:
+        mismatches = compare(utils, cases)
+        print("%-36s %8d compared %8d different" % (title, len(cases), len(mismatches)))
+        for name, md_string, expected, result in mismatches[:5]:
+            print("DIFFERENT: %s\n  markdown: %r\n  expected: %r\n  result:   %r" % (name, md_string, expected, result))
+        failed = failed or len(mismatches) > 0
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from talon import cron, settings, ui
+from typing import Callable
+import time
+
+class HudCanvasPool:
+    """Keeps canvases that are no longer used hidden, so they can be moved and shown again instead of creating a new one
+    Screen regions are published often by things like the focus indicator, which would otherwise create and close a canvas every time
+    At most max_size canvases are kept around, and canvases that have not been reused for idle_seconds are closed
+    """
+    max_size: int
+    idle_seconds: float
+    idle_canvases: list
+    eviction_job = None
+
+    created: int
+    reused: int
+    closed: int
+
+    def __init__(self, max_size: int = 16, idle_seconds: float = 30):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.idle_canvases = []
+        self.eviction_job = None
+        self.created = 0
+        self.reused = 0
+        self.closed = 0
+
+    def acquire(self, rect: ui.Rect, generate_canvas: Callable, visible: bool = True):
+        """Get a canvas placed on the given rect, reusing the most recently released canvas if there is one"""
+        if len(self.idle_canvases) > 0:
+            canvas, _ = self.idle_canvases.pop()
+            self.reused += 1
+            canvas.rect = rect
+            # The capture setting might have changed since the canvas was created
+            canvas.allows_capture = settings.get("user.talon_hud_allows_capture")
+            if visible:
+                canvas.show()
+        else:
+            canvas = generate_canvas(rect.x, rect.y, rect.width, rect.height)
+            self.created += 1
+            if not visible:
+                canvas.hide()
+        return canvas
+
+    def release(self, canvas):
+        """Hide a canvas whose draw callbacks have been unregistered, so it can be reused later"""
+        if len(self.idle_canvases) >= self.max_size:
+            self.close(canvas)
+            return
+
+        canvas.hide()
+        self.idle_canvases.append((canvas, time.monotonic()))
+        if self.eviction_job is None:
+            self.eviction_job = cron.after(str(int(self.idle_seconds * 1000)) + "ms", self.evict_idle)
+
+    def evict_idle(self):
+        self.eviction_job = None
+        current_time = time.monotonic()
+        idle_canvases = []
+        for canvas, released_on in self.idle_canvases:
+            if current_time - released_on >= self.idle_seconds:
+                self.close(canvas)
+            else:
+                idle_canvases.append((canvas, released_on))
+        self.idle_canvases = idle_canvases
+
+        # Check again when the oldest remaining canvas has been idle for long enough
+        if len(self.idle_canvases) > 0:
+            remaining_seconds = self.idle_seconds - (current_time - self.idle_canvases[0][1])
+            self.eviction_job = cron.after(str(max(1, int(remaining_seconds * 1000))) + "ms", self.evict_idle)
+
+    def close(self, canvas):
+        canvas.close()
+        self.closed += 1
+
+    def clear(self):
+        """Close all the hidden canvases"""
+        if self.eviction_job is not None:
+            cron.cancel(self.eviction_job)
+            self.eviction_job = None
+        for canvas, _ in self.idle_canvases:
+            self.close(canvas)
+        self.idle_canvases = []
+
+    def get_statistics(self) -> dict:
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "closed": self.closed,
+            "idle": len(self.idle_canvases)
+        }
+
+# The pool of screen region canvases shared by all screen overlays
+canvas_pool = HudCanvasPool()
@@ -1,7 +1,7 @@
 from .state import HeadUpDisplayContent
 from .typing import *
 from typing import Union, Any, Callable
-from ..utils import retrieve_available_voice_commands
+from ..utils import retrieve_available_voice_commands, string_to_speakable_string, tokenize_rich_text
 import time
 
 # Class for managing a part of the HUD content
@@ -35,13 +35,13 @@ class HudContentBuilder():
             commands = {}
         else:
             for voice_command in voice_commands:
-                commands.append(HudDynamicVoiceCommand(voice_command, voice_commands[voice_command]))
+                commands.append(HudDynamicVoiceCommand(voice_command, voice_commands[voice_command], string_to_speakable_string(voice_command)))
             
-        return HudPanelContent(topic, title, [content], buttons, time.time(), show, voice_commands=commands, choices=choices)
+        return HudPanelContent(topic, title, [content], buttons, time.time(), show, voice_commands=commands, choices=choices, speakable_title=string_to_speakable_string(title), rich_text_tokens=tokenize_rich_text(content))
 
     def create_button(self, text: str, callback: Callable[[], None], image: str = "") -> HudButton:
         """Create a button used in the Talon HUD"""
-        return HudButton(image, text, ui.Rect(0,0,0,0), callback)
+        return HudButton(image, text, ui.Rect(0,0,0,0), callback, string_to_speakable_string(text))
         
     def create_screen_region(self, topic: str, colour: str = None, icon: str = None, title: str = None, hover_visibility: Union[bool, int] = False, x: int = 0, y: int = 0, width: int = 0, height: int = 0, relative_x: int = 0, relative_y: int = 0) -> HudScreenRegion:
         """Create a HUD screen region, where by default it is active all over the available space and it is visible only on a hover"""
@@ -54,15 +54,16 @@ class HudContentBuilder():
         choices = []
         for index, choice_data in enumerate(choices_list):
             image = choice_data["image"] if "image" in choice_data else ""
-            choices.append(HudChoice(image, choice_data["text"], choice_data, "selected" in choice_data and choice_data["selected"], ui.Rect(0,0,0,0)))
+            choices.append(HudChoice(image, choice_data["text"], choice_data, "selected" in choice_data and choice_data["selected"], ui.Rect(0,0,0,0), string_to_speakable_string(choice_data["text"])))
         return HudChoices(choices, callback, multiple)
 
     def create_walkthrough_step(self, content: str, context_hint: str = "", tags: list[str] = None, modes: list[str] = None, app: str = "", restore_callback: Callable[[str], None] = None) -> HudWalkThroughStep:
         """Create a walkthrough step used inside of a walkthrough in the Talon HUD"""
-        voice_commands = retrieve_available_voice_commands(content)
+        rich_text_tokens = tokenize_rich_text(content)
+        voice_commands = retrieve_available_voice_commands(content, rich_text_tokens)
         tags = [] if tags is None else tags
         modes = [] if modes is None else modes
-        return HudWalkThroughStep(content, context_hint, tags, modes, app, voice_commands, restore_callback)
+        return HudWalkThroughStep(content, context_hint, tags, modes, app, voice_commands, restore_callback, rich_text_tokens=rich_text_tokens)
     
     def create_walkthrough(self, title, walkthrough_steps: list[HudWalkThroughStep]) -> HudWalkThrough:
         """Create a walkthrough for the Talon HUD"""
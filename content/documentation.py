@@ -1,6 +1,6 @@
 from talon import app, actions, Module, cron, fs
 import os
-from ..utils import md_to_richtext_content
+from ..utils import md_file_to_richtext_content
 
 mod = Module()
 
@@ -38,11 +38,12 @@ class HeadUpDocumentation:
             if self.development_mode:
                 self.watch_documentation_file(True)
             
-            text_file = open(self.files[title], "r")
-            documentation = text_file.read()
-            text_file.close()
             if self.files[title].endswith(".md"):
-                documentation = md_to_richtext_content(documentation)
+                documentation = md_file_to_richtext_content(self.files[title])
+            else:
+                text_file = open(self.files[title], "r")
+                documentation = text_file.read()
+                text_file.close()
             actions.user.hud_publish_content(documentation, "documentation", title)
 
     def show_overview(self):
@@ -0,0 +1,112 @@
+from talon import cron
+from collections import deque
+from .typing import HudContentEvent, CONTENT_EVENT_PRIORITY_BULK
+from typing import Callable
+import time
+
+# Schedules the content events by priority
+# Interactive and normal events are sent right away, while bulk events are queued
+# And sent in ticks, where every tick only spends a limited amount of time on bulk events
+# This makes sure a burst of log messages or screen regions cannot delay content the user is waiting on
+# Follow-up work, like showing content that was held back while handling an event, is done at the start of the next tick
+class HudContentEventScheduler:
+    budget_ms = 0
+    tick_ms = 16
+    queue = None
+    callbacks = None
+    job = None
+    send_event: Callable[[HudContentEvent], None] = None
+
+    # Statistics to measure the queue depth and the time bulk events spend waiting
+    sent_event_count = 0
+    queued_event_count = 0
+    max_queue_depth = 0
+    total_wait_ms = 0.0
+    max_wait_ms = 0.0
+    tick_count = 0
+
+    def __init__(self, send_event: Callable[[HudContentEvent], None], budget_ms: int = 0, tick_ms: int = 16):
+        self.send_event = send_event
+        self.budget_ms = budget_ms
+        self.tick_ms = tick_ms
+        self.queue = deque()
+        self.callbacks = []
+
+    def set_budget(self, budget_ms: int):
+        self.budget_ms = max(0, int(budget_ms)) if budget_ms else 0
+        if self.budget_ms == 0:
+            self.flush()
+
+    def schedule(self, event: HudContentEvent):
+        if self.budget_ms <= 0 or event.priority != CONTENT_EVENT_PRIORITY_BULK:
+            self.sent_event_count += 1
+            self.send_event(event)
+        else:
+            self.queue.append((time.perf_counter(), event))
+            self.queued_event_count += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+            if self.job is None:
+                self.job = cron.after(str(self.tick_ms) + "ms", self.tick)
+
+    # Call the callback on the next tick, before any queued bulk events are sent
+    def schedule_callback(self, callback: Callable[[], None]):
+        self.callbacks.append(callback)
+        if self.job is None:
+            self.job = cron.after(str(self.tick_ms) + "ms", self.tick)
+
+    # Send queued bulk events until the budget of this tick runs out, always sending at least one to make progress
+    def tick(self):
+        self.job = None
+        self.tick_count += 1
+        self.call_callbacks()
+        start_time = time.perf_counter()
+        budget_s = self.budget_ms / 1000
+        sent = 0
+        while len(self.queue) > 0 and (sent == 0 or time.perf_counter() - start_time < budget_s):
+            self.send_queued_event()
+            sent += 1
+
+        if len(self.queue) > 0 and self.job is None:
+            self.job = cron.after(str(self.tick_ms) + "ms", self.tick)
+
+    # Callbacks scheduled by the callbacks themselves are left for the next tick
+    def call_callbacks(self):
+        callbacks = self.callbacks
+        self.callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def send_queued_event(self):
+        queued_at, event = self.queue.popleft()
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.sent_event_count += 1
+        self.send_event(event)
+
+    # Call the scheduled callbacks and send all the queued events right away
+    def flush(self):
+        cron.cancel(self.job)
+        self.job = None
+        self.call_callbacks()
+        while len(self.queue) > 0:
+            self.send_queued_event()
+
+    def get_statistics(self) -> dict:
+        queued_sent_count = self.queued_event_count - len(self.queue)
+        return {
+            "budget_ms": self.budget_ms,
+            "queue_depth": len(self.queue),
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent_event_count,
+            "queued": self.queued_event_count,
+            "average_wait_ms": self.total_wait_ms / queued_sent_count if queued_sent_count > 0 else 0.0,
+            "max_wait_ms": self.max_wait_ms,
+            "ticks": self.tick_count
+        }
+
+    def destroy(self):
+        self.callbacks = []
+        self.flush()
+        cron.cancel(self.job)
+        self.job = None
@@ -0,0 +1,83 @@
+from collections import deque
+from .typing import HudContentEvent
+import dataclasses
+
+# Topic types that are not journaled, as they only ever get appended to and are kept in their own bounded store
+journal_ignored_topic_types = ["log_messages", "particles"]
+
+# Bounded, append-only journal of the replace and remove content events
+# Once the journal is full, its events are compacted into a snapshot of the content,
+# So a new HUD instance after a reload only needs to apply the snapshot and replay the events after it
+# Rather than turning every poller off and on again to repopulate its widgets
+class HudContentJournal:
+    max_length = 100
+    events = None
+    snapshot = None
+    compaction_count = 0
+    recorded_event_count = 0
+
+    def __init__(self, topic_types: dict, max_length: int = 100):
+        self.max_length = max(1, max_length)
+        self.events = deque()
+        self.snapshot = {}
+        self.compaction_count = 0
+        self.recorded_event_count = 0
+        for topic_type in topic_types:
+            if topic_type not in journal_ignored_topic_types:
+                self.snapshot[topic_type] = dict(topic_types[topic_type])
+
+    def set_max_length(self, max_length: int):
+        self.max_length = max(1, max_length)
+        if len(self.events) >= self.max_length:
+            self.compact()
+
+    def record(self, event: HudContentEvent):
+        if event.operation not in ["replace", "remove"] or event.topic_type in journal_ignored_topic_types:
+            return
+
+        if len(self.events) >= self.max_length:
+            self.compact()
+        self.events.append(event)
+        self.recorded_event_count += 1
+
+    # Fold the journaled events into the snapshot so only the last state of every topic remains
+    def compact(self):
+        for event in self.events:
+            if event.operation == "replace":
+                if event.topic_type not in self.snapshot:
+                    self.snapshot[event.topic_type] = {}
+                self.snapshot[event.topic_type][event.topic] = event.content
+            elif event.topic_type in self.snapshot and event.topic in self.snapshot[event.topic_type]:
+                del self.snapshot[event.topic_type][event.topic]
+        self.events.clear()
+        self.compaction_count += 1
+
+    # Get a content dump of the snapshot containing only the given topic types and topics
+    def get_snapshot_event(self, topic_types: list[str], topics: list[str]) -> HudContentEvent:
+        snapshot_topic_types = {}
+        for topic_type in topic_types:
+            if topic_type in self.snapshot:
+                snapshot_topic_types[topic_type] = {}
+                for topic in topics:
+                    if topic in self.snapshot[topic_type]:
+                        snapshot_topic_types[topic_type][topic] = self.snapshot[topic_type][topic]
+        return HudContentEvent("content_dump", "", {"topic_types": snapshot_topic_types}, "dump")
+
+    # Get the events to replay after the snapshot has been applied
+    # Replaying should restore the content without reopening widgets that were closed in the meantime
+    def get_replay_events(self) -> list[HudContentEvent]:
+        replay_events = []
+        if "variable" in self.snapshot:
+            for topic in self.snapshot["variable"]:
+                replay_events.append(HudContentEvent("variable", topic, self.snapshot["variable"][topic], "replace"))
+        for event in self.events:
+            replay_events.append(dataclasses.replace(event, show=False))
+        return replay_events
+
+    def get_statistics(self) -> dict:
+        return {
+            "max_length": self.max_length,
+            "length": len(self.events),
+            "recorded": self.recorded_event_count,
+            "compactions": self.compaction_count
+        }
@@ -0,0 +1,141 @@
+from collections import deque
+from .typing import HudLogMessage
+import sys
+
+# Bounded storage for the log messages of the HUD
+# Every log type ( command, phrase, event etc. ) gets its own ring buffer,
+# So appending is constant time and older messages are dropped once the limit of a type is reached
+# Every stored log receives a stable id, which can be used to look up the log in constant time
+# The store behaves like a dictionary of log type to messages to stay compatible with the topic types structure
+class HudLogStore(dict):
+    default_limit = 50
+    limits = None
+    memory_usage = 0
+    next_id = 1
+    logs_by_id = None
+
+    def __init__(self, default_limit = 50, limits = None, topics = None):
+        super().__init__()
+        self.default_limit = default_limit
+        self.limits = {} if limits is None else dict(limits)
+        self.memory_usage = 0
+        self.next_id = 1
+        self.logs_by_id = {}
+        if topics is not None:
+            for topic in topics:
+                self.extend(topic, topics[topic])
+
+    def get_limit(self, topic: str) -> int:
+        return self.limits[topic] if topic in self.limits else self.default_limit
+
+    # Change the maximum amount of messages kept for a log type, dropping the oldest messages if needed
+    def set_limit(self, topic: str, limit: int):
+        self.limits[topic] = max(1, limit)
+        if topic in self:
+            buffer = self[topic]
+            while len(buffer) > self.limits[topic]:
+                self.forget_log(buffer.popleft())
+            self[topic] = deque(buffer, maxlen=self.limits[topic])
+
+    def get_buffer(self, topic: str) -> deque:
+        if topic not in self:
+            self[topic] = deque(maxlen=self.get_limit(topic))
+        return self[topic]
+
+    def get_log(self, log_id: int) -> HudLogMessage:
+        return self.logs_by_id[log_id] if log_id in self.logs_by_id else None
+
+    def append(self, topic: str, log: HudLogMessage):
+        buffer = self.get_buffer(topic)
+        if len(buffer) == buffer.maxlen:
+            self.forget_log(buffer[0])
+        buffer.append(log)
+        self.remember_log(log)
+
+    def extend(self, topic: str, logs: list[HudLogMessage]):
+        for log in logs:
+            self.append(topic, log)
+
+    # Insert a log before the given index, dropping the oldest log if the buffer is full
+    def insert(self, topic: str, index: int, log: HudLogMessage):
+        buffer = self.get_buffer(topic)
+        if index >= len(buffer):
+            self.append(topic, log)
+            return
+
+        if len(buffer) == buffer.maxlen:
+            self.forget_log(buffer.popleft())
+            index -= 1
+
+            # The log would have been the oldest log, so it is dropped right away
+            if index < 0:
+                return
+        buffer.insert(index, log)
+        self.remember_log(log)
+
+    # Insert a log directly after a stored log, which is constant time when the stored log is the latest log
+    def insert_after(self, topic: str, previous_log: HudLogMessage, log: HudLogMessage):
+        buffer = self.get_buffer(topic)
+        if len(buffer) == 0 or buffer[-1] is previous_log:
+            self.append(topic, log)
+        else:
+            index = len(buffer)
+            for buffer_index in range(len(buffer) - 1, -1, -1):
+                if buffer[buffer_index] is previous_log:
+                    index = buffer_index + 1
+                    break
+            self.insert(topic, index, log)
+
+    # Change the message of a stored log while keeping the memory usage up to date
+    def revise_message(self, log: HudLogMessage, message: str):
+        self.memory_usage -= self.get_log_size(log)
+        log.message = message
+        self.memory_usage += self.get_log_size(log)
+
+    def clear_topic(self, topic: str):
+        if topic in self:
+            for log in self[topic]:
+                self.forget_log(log)
+            self[topic].clear()
+
+    # Get the last amount of logs of a type in chronological order
+    def last(self, topic: str, amount: int = 1) -> list[HudLogMessage]:
+        if topic not in self or amount <= 0:
+            return []
+
+        buffer = self[topic]
+        amount = min(amount, len(buffer))
+        logs = [buffer[-index] for index in range(1, amount + 1)]
+        logs.reverse()
+        return logs
+
+    # Get all the logs of a type that were added at or after the given timestamp in chronological order
+    def since(self, topic: str, timestamp: float) -> list[HudLogMessage]:
+        if topic not in self:
+            return []
+
+        logs = []
+        for log in reversed(self[topic]):
+            if log.time < timestamp:
+                break
+            logs.append(log)
+        logs.reverse()
+        return logs
+
+    def remember_log(self, log: HudLogMessage):
+        if getattr(log, "id", None) is None:
+            log.id = self.next_id
+        self.next_id = max(self.next_id, log.id + 1)
+        self.logs_by_id[log.id] = log
+        self.memory_usage += self.get_log_size(log)
+
+    def forget_log(self, log: HudLogMessage):
+        if getattr(log, "id", None) in self.logs_by_id:
+            del self.logs_by_id[log.id]
+        self.memory_usage -= self.get_log_size(log)
+
+    def get_log_size(self, log: HudLogMessage) -> int:
+        return sys.getsizeof(log) + sys.getsizeof(log.message)
+
+    def get_memory_usage(self) -> int:
+        return self.memory_usage
@@ -1,5 +1,6 @@
 from .typing import HudContentEvent, CLAIM_WIDGET_TOPIC_TYPE, CLAIM_BROADCAST
 from typing import Any
+from collections import deque
 import copy
 
 
@@ -8,9 +9,11 @@ class HudPartialContent:
 
     topic_types = None
     persisted_topics = None
+    topic_versions = None
 	
     def __init__(self, topic_types = []):
         self.persisted_topics = []
+        self.topic_versions = {}
         self.topic_types = {}
         for topic_type in topic_types:
             self.topic_types[topic_type] = {}
@@ -24,7 +27,7 @@ class HudPartialContent:
         if topic_type in self.topic_types:
             for ordered_topic in self.persisted_topics:
                 if ordered_topic in self.topic_types[topic_type] and ( topic == None or topic == ordered_topic ):
-                    if isinstance(self.topic_types[topic_type][ordered_topic], list):
+                    if isinstance(self.topic_types[topic_type][ordered_topic], (list, deque)):
                         topic_contents.extend(self.topic_types[topic_type][ordered_topic])
                     else:
                         topic_contents.append(self.topic_types[topic_type][ordered_topic])
@@ -50,6 +53,7 @@ class HudPartialContent:
                     self.remove_topic(topic_type, current_topic)
 
         self.topic_types[topic_type][topic] = content
+        self.topic_versions.pop((topic_type, topic), None)
         if topic_type != "variable" and topic not in self.persisted_topics:
             self.persisted_topics.append(topic)
 
@@ -65,6 +69,12 @@ class HudPartialContent:
 
         if topic in self.topic_types[topic_type]:
             del self.topic_types[topic_type][topic]
+        self.topic_versions.pop((topic_type, topic), None)
+
+    # Check whether the exact version of the content of a topic is already known
+    def has_topic_version(self, topic_type, topic, content, version) -> bool:
+        return (topic_type, topic) in self.topic_versions and self.topic_versions[(topic_type, topic)] == version and \
+            topic in self.topic_types[topic_type] and self.topic_types[topic_type][topic] is content
 
     # Get a unique list of all the current topics on the widget
     def get_current_topics(self):
@@ -77,10 +87,18 @@ class HudPartialContent:
         elif event.operation == "remove":
             self.remove_topic(event.topic_type, event.topic)
         elif event.operation == "dump":
+            versions = event.content["versions"] if "versions" in event.content else {}
             for topic_type in event.content["topic_types"]:
                 if topic_type not in self.topic_types:
                     continue
                 for topic in event.content["topic_types"][topic_type]:
                     if topic in self.persisted_topics:
-                        self.set_topic(topic_type, topic, event.content["topic_types"][topic_type][topic])
+                        content = event.content["topic_types"][topic_type][topic]
+                        version = versions[topic_type][topic] if topic_type in versions and topic in versions[topic_type] else None
+                        if version is not None and self.has_topic_version(topic_type, topic, content, version):
+                            continue
+
+                        self.set_topic(topic_type, topic, content)
+                        if version is not None:
+                            self.topic_versions[(topic_type, topic)] = version
         # Other types of content events need manual changing ( patch and append for example )
@@ -28,7 +28,7 @@ class SpeechPoller(Poller):
             self.generate_phrase_debug_content()
             
     def generate_phrase_debug_content(self):    
-        phrases = self.content._content.topic_types["log_messages"]["phrase"] if "phrase" in self.content._content.topic_types["log_messages"] else []
+        phrases = self.content._content.get_log_messages("phrase")
 
         last_mic = ""
         last_model = ""
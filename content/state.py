@@ -1,9 +1,14 @@
-from talon import actions, Module, ui, app, ctrl
+from talon import actions, Module, ui, app, ctrl, cron, settings
 from talon.types.point import Point2d
 from talon_init import TALON_USER
 from talon.scripting import Dispatch
-from .typing import HudPanelContent, HudButton, HudChoice, HudChoices, HudScreenRegion, HudDynamicVoiceCommand, HudLogMessage, HudContentEvent, HudAbilityIcon, HudStatusIcon, HudStatusOption, HudParticle
+from .typing import HudPanelContent, HudButton, HudChoice, HudChoices, HudScreenRegion, HudDynamicVoiceCommand, HudLogMessage, HudContentEvent, HudAbilityIcon, HudStatusIcon, HudStatusOption, HudParticle, CONTENT_EVENT_PRIORITY_INTERACTIVE
+from ..utils import string_to_speakable_string, tokenize_rich_text
+from .log_store import HudLogStore
+from .journal import HudContentJournal
+from .event_scheduler import HudContentEventScheduler
 from typing import Callable, Any, Union
+from collections import deque
 import time
 import os
 import copy
@@ -11,6 +16,9 @@ import random
 
 max_log_length = 50
 mod = Module()
+mod.setting("talon_hud_event_coalescing_ms", type=int, default=0, desc="Window in milliseconds in which superseded replace and remove content events are collapsed into one - 0 disables the coalescing")
+mod.setting("talon_hud_bulk_event_budget_ms", type=int, default=0, desc="Milliseconds per tick spent on sending bulk content events like logs, particles and screen regions, so they cannot delay interactive content - 0 sends them right away")
+mod.setting("talon_hud_content_journal_length", type=int, default=0, desc="Amount of content events kept in memory to restore the widgets after a reload before they are compacted - 0 disables the journal")
 
 CLAIM_BROADCAST = 0 # Broadcast to any widget that listens for this topic type
 CLAIM_WIDGET = 1 # Claim a single widget and send the content towards it
@@ -26,11 +34,28 @@ class HeadUpDisplayContent(Dispatch):
     save_up_events = True
     saved_events = None
     
+    # Coalescing of replace and remove events that are superseded within the same window
+    coalesce_window_ms = 0
+    coalesce_job = None
+    coalesced_events = None
+    dispatched_event_count = 0
+    dropped_event_count = 0
+    
+    # Scheduling of bulk content events behind interactive content events
+    event_scheduler = None
+    
+    # Every change to a topic increases its version, so widgets can skip topics they already have
+    content_version = 0
+    topic_versions = None
+    
+    # Optional journal of content events used to restore the HUD quickly after a reload
+    journal = None
+    
     topic_types = {
         "variable": {
             "mode": "command"
         },
-        "log_messages": {
+        "log_messages": HudLogStore(max_log_length, topics={
             "command": [],
             "error": [],
             "event": [],
@@ -38,7 +63,7 @@ class HeadUpDisplayContent(Dispatch):
             "success": [],
             "phrase": [],
             "announcer": []
-        },
+        }),
         "walkthrough_step": {},
         "text": {},
         "choice": {},
@@ -54,6 +79,7 @@ class HeadUpDisplayContent(Dispatch):
         if not topic_type in self.topic_types:
             self.topic_types[topic_type] = {}
         self.topic_types[topic_type][panel_content.topic] = panel_content
+        self.increase_topic_version(topic_type, panel_content.topic)
         self.dispatch("broadcast_update", HudContentEvent(topic_type, panel_content.topic, panel_content, "replace", CLAIM_WIDGET_TOPIC_TYPE, panel_content.show ))
     
     # Publish content directly through the event system
@@ -68,13 +94,19 @@ class HeadUpDisplayContent(Dispatch):
     # Update a topic type if the content has changed
     def update_topic_type(self, topic_type, topic, data, send_event = True) -> bool:
         updated = False
-        if topic_type in self.topic_types:
+        if topic_type == "log_messages":
+            updated = self.replace_log_messages(topic, data)
+            if updated and send_event:
+               self.dispatch("broadcast_update", HudContentEvent(topic_type, topic, data, "replace"))
+        elif topic_type in self.topic_types:
             if not topic in self.topic_types[topic_type]:
                self.topic_types[topic_type][topic] = None
                
             if self.topic_types[topic_type][topic] != data:
                updated = True
             self.topic_types[topic_type][topic] = data
+            if updated:
+               self.increase_topic_version(topic_type, topic)
             
             if updated and send_event:
                self.dispatch("broadcast_update", HudContentEvent(topic_type, topic, data, "replace"))
@@ -84,7 +116,12 @@ class HeadUpDisplayContent(Dispatch):
     def extend_topic_type(self, topic_type, topic, data, send_event = True):
         updated = False    
     
-        if topic_type in self.topic_types:
+        if topic_type == "log_messages":
+            self.get_log_store().extend(topic, data if isinstance(data, list) else [data])
+            self.increase_topic_version(topic_type, topic)
+            if send_event:
+                self.dispatch("broadcast_update", HudContentEvent(topic_type, topic, list(self.get_log_store()[topic]), "replace"))
+        elif topic_type in self.topic_types:
             if topic not in self.topic_types[topic_type]:
                self.topic_types[topic_type][topic] = []
             if isinstance(data, list) and len(data) > 0:
@@ -93,6 +130,7 @@ class HeadUpDisplayContent(Dispatch):
             else:
                self.topic_types[topic_type][topic].append(data)
                updated = True
+            self.increase_topic_version(topic_type, topic)
             
             if updated and send_event:
                 self.dispatch("broadcast_update", HudContentEvent(topic_type, topic, self.topic_types[topic_type][topic], "replace"))
@@ -102,21 +140,68 @@ class HeadUpDisplayContent(Dispatch):
         removed = False
         if topic_type in self.topic_types:
             if topic in self.topic_types[topic_type]:
-               del self.topic_types[topic_type][topic]
+               # The logs are removed through the log store to keep its ids and memory usage up to date
+               if topic_type == "log_messages":
+                   self.get_log_store().clear_topic(topic)
+               else:
+                   del self.topic_types[topic_type][topic]
+               self.increase_topic_version(topic_type, topic)
                removed = True
             if removed and send_event:
                 self.dispatch("broadcast_update", HudContentEvent(topic_type, topic, None, "remove"))
         return removed
 
+    def increase_topic_version(self, topic_type, topic):
+        if self.topic_versions is None:
+            self.topic_versions = {}
+        if topic_type not in self.topic_versions:
+            self.topic_versions[topic_type] = {}
+        self.content_version += 1
+        self.topic_versions[topic_type][topic] = self.content_version
+
+    def get_topic_version(self, topic_type, topic) -> int:
+        if self.topic_versions is not None and topic_type in self.topic_versions and topic in self.topic_versions[topic_type]:
+            return self.topic_versions[topic_type][topic]
+        return 0
+
+    # Replace the logs of a type in the log store, returning whether the logs have changed
+    def replace_log_messages(self, topic, data) -> bool:
+        log_store = self.get_log_store()
+        logs = [] if data is None else list(data) if isinstance(data, (list, tuple, deque)) else [data]
+        previous_logs = list(log_store[topic]) if topic in log_store else []
+        if previous_logs == logs:
+            return False
+        
+        log_store.clear_topic(topic)
+        log_store.extend(topic, logs)
+        self.increase_topic_version("log_messages", topic)
+        return True
+
+    # Get the bounded log store, converting log lists kept around from before a reload if necessary
+    def get_log_store(self) -> HudLogStore:
+        if not isinstance(self.topic_types["log_messages"], HudLogStore):
+            self.topic_types["log_messages"] = HudLogStore(max_log_length, topics=self.topic_types["log_messages"])
+        return self.topic_types["log_messages"]
+
+    # Get the stored logs of a type, optionally only the last amount or the ones added since a timestamp
+    def get_log_messages(self, topic, amount = None, since = None) -> list[HudLogMessage]:
+        log_store = self.get_log_store()
+        if since is not None:
+            logs = log_store.since(topic, since)
+            return logs[-amount:] if amount is not None and amount > 0 else logs
+        elif amount is not None:
+            return log_store.last(topic, amount)
+        else:
+            return list(log_store[topic]) if topic in log_store else []
+
     def append_to_log_messages(self, topic, log_message, timestamp = None, metadata = None):    
         log_message = HudLogMessage(timestamp if timestamp else time.monotonic(), topic, log_message, metadata)
-        if topic not in self.topic_types["log_messages"]:
-            self.topic_types["log_messages"][topic] = []
-        self.topic_types["log_messages"][topic].append(log_message)
-        self.topic_types["log_messages"][topic][-max_log_length:]
+        self.get_log_store().append(topic, log_message)
+        self.increase_topic_version("log_messages", topic)
         
-        if self.queued_log_splits:
-            self.revise_log(True)
+        revised_logs = self.apply_queued_log_splits(log_message)
+        if revised_logs:
+            self.dispatch("broadcast_update", HudContentEvent("log_messages", topic, revised_logs, "patch"))
         else:
             self.dispatch("broadcast_update", HudContentEvent("log_messages", topic, log_message, "append"))
 
@@ -125,69 +210,85 @@ class HeadUpDisplayContent(Dispatch):
             actions.sleep(sleep_s)
         
         if self.throttled_logs:
-            for log_message in self.throttled_logs:
-                self.topic_types["log_messages"][log_message.type].append(log_message)
-                self.topic_types["log_messages"][log_message.type][-max_log_length:]
-                if self.queued_log_splits:
-                    self.revise_log(True)
+            log_store = self.get_log_store()
+            throttled_logs = self.throttled_logs
+            self.throttled_logs = []
+            
+            # Logs revised by queued splits are batched into a single patch per log type
+            patched_logs = {}
+            for log_message in throttled_logs:
+                log_store.append(log_message.type, log_message)
+                self.increase_topic_version("log_messages", log_message.type)
+                revised_logs = self.apply_queued_log_splits(log_message)
+                if revised_logs:
+                    if log_message.type not in patched_logs:
+                        patched_logs[log_message.type] = []
+                    patched_logs[log_message.type].extend(revised_logs)
                 else:
                     self.dispatch("broadcast_update", HudContentEvent("log_messages", log_message.type, log_message, "append"))
-            self.throttled_logs = []
+            
+            for type in patched_logs:
+                self.dispatch("broadcast_update", HudContentEvent("log_messages", type, patched_logs[type], "patch"))
+            
+            # Throttled splits of the shown logs add new throttled logs, which are shown in a follow-up flush
+            if self.throttled_logs:
+                self.get_event_scheduler().schedule_callback(self.show_throttled_logs)
 
-    def revise_log(self, send_update = False):
-        revised_indecis = []
-        updated_logs = []
-        for queue_index, queued_log in enumerate(self.queued_log_splits):
-            type = queued_log["type"]
-            prefix = queued_log["prefix"]
-            discard_remaining = queued_log["discard_remaining"]
-            throttled = queued_log["throttled"]
+    # Apply the first queued split of the log type that matches the log, returning the logs that were revised or added
+    def apply_queued_log_splits(self, log: HudLogMessage) -> list[HudLogMessage]:
+        if not self.queued_log_splits or log.type not in self.queued_log_splits:
+            return []
             
-            log_amount = len(self.topic_types["log_messages"][type])
-            if log_amount > 0:
-                
-                index = log_amount - 1
-                log = self.topic_types["log_messages"][type][index] if index != -1 and index < log_amount else None
-                
-                if index != -1 and log is not None and log.message.startswith(prefix):
-                    revised_indecis.append( queue_index )
-                    remaining = log.message[len(prefix):].lstrip()
-                    if remaining:
-                        self.topic_types["log_messages"][type][index].message = prefix.strip()
-                               
-                        revised_logs = [self.topic_types["log_messages"][type][index]]
-                        if not discard_remaining:
-                            remainder_log = HudLogMessage(log.time, type, remaining)
-                            
-                            if not throttled:
-                                revised_logs.append(remainder_log)
-                                if index >= log_amount or index == 1:
-                                    self.topic_types["log_messages"][type].append(remainder_log)
-                                else:
-                                    self.topic_types["log_messages"][type].insert(index, remainder_log)
-                            else:
-                                self.throttled_logs.append(remainder_log)
-                        
-                        if send_update == False:
-                            event = HudContentEvent("log_messages", type, revised_logs, "patch")
-                            self.dispatch("broadcast_update", event)
-    
-        # Remove the queued splits from the log in reverse to preserve the order
-        revised_indecis.reverse()
-        for queue_index in revised_indecis:
-            self.queued_log_splits.pop(queue_index)
+        queued_splits = self.queued_log_splits[log.type]
+        for queue_index, queued_split in enumerate(queued_splits):
+            revised_logs = self.split_log(log, queued_split)
+            if revised_logs is not None:
+                del queued_splits[queue_index]
+                if len(queued_splits) == 0:
+                    del self.queued_log_splits[log.type]
+                return revised_logs
+        return []
+
+    # Split a log at the prefix, returning None if the log does not match the prefix
+    # The remainder is either discarded, throttled until the throttled logs are shown or inserted directly after the log
+    def split_log(self, log: HudLogMessage, log_split: dict) -> list[HudLogMessage]:
+        prefix = log_split["prefix"]
+        if not log.message.startswith(prefix):
+            return None
+        
+        remaining = log.message[len(prefix):].lstrip()
+        if not remaining:
+            return []
         
-        if send_update and len(updated_logs):
-            self.dispatch("broadcast_update", HudContentEvent("log_messages", type, updated_logs, "patch"))
+        log_store = self.get_log_store()
+        log_store.revise_message(log, prefix.strip())
+        revised_logs = [log]
+        if not log_split["discard_remaining"]:
+            remainder_log = HudLogMessage(log.time, log.type, remaining)
+            if log_split["throttled"]:
+                self.throttled_logs.append(remainder_log)
+            else:
+                log_store.insert_after(log.type, log, remainder_log)
+                revised_logs.append(remainder_log)
+        self.increase_topic_version("log_messages", log.type)
+        return revised_logs
     
+    # Split the latest log of the type, or queue the split until a log of the type matches it
     def edit_log_message(self, prefix, throttled = False, discard_remaining = False, type = "command"):
         if self.queued_log_splits is None:
-            self.queued_log_splits = []
+            self.queued_log_splits = {}
         if self.throttled_logs == None:
             self.throttled_logs = []
-        self.queued_log_splits.append({"type": type, "prefix": prefix, 
-            "discard_remaining": discard_remaining, "throttled": throttled})
-        self.revise_log()
+        
+        log_split = {"type": type, "prefix": prefix, "discard_remaining": discard_remaining, "throttled": throttled}
+        latest_logs = self.get_log_store().last(type, 1)
+        revised_logs = self.split_log(latest_logs[0], log_split) if len(latest_logs) > 0 else None
+        if revised_logs is None:
+            if type not in self.queued_log_splits:
+                self.queued_log_splits[type] = deque(maxlen=max_log_length)
+            self.queued_log_splits[type].append(log_split)
+        elif revised_logs:
+            self.dispatch("broadcast_update", HudContentEvent("log_messages", type, revised_logs, "patch"))
         
     def save_events(self):
         self.save_up_events = True
@@ -197,28 +298,153 @@ class HeadUpDisplayContent(Dispatch):
         if self.saved_events is None or len(self.saved_events) == 0:
             return
         
-        for event in self.saved_events:
+        # Clear the saved events before dispatching to make sure they are only sent once
+        saved_events = self.saved_events
+        self.saved_events = []
+        for event in saved_events:
             self.dispatch(event["type"], event["event"])
         
     # Get a full content dump to be used in refreshing widgets after a code update
     def get_content_dump(self) -> HudContentEvent:
         return HudContentEvent("content_dump", "", {"topic_types": copy.copy(self.topic_types)}, "dump")
 
+    # Get a content dump containing only the given topic types and topics along with their versions
+    # The content itself is shared rather than copied, so the cost only depends on the amount of requested topics
+    def get_content_snapshot(self, topic_types: list[str], topics: list[str]) -> HudContentEvent:
+        snapshot_topic_types = {}
+        snapshot_versions = {}
+        for topic_type in topic_types:
+            if topic_type in self.topic_types:
+                snapshot_topic_types[topic_type] = {}
+                snapshot_versions[topic_type] = {}
+                for topic in topics:
+                    if topic in self.topic_types[topic_type]:
+                        snapshot_topic_types[topic_type][topic] = self.topic_types[topic_type][topic]
+                        snapshot_versions[topic_type][topic] = self.get_topic_version(topic_type, topic)
+        
+        return HudContentEvent("content_dump", "", {"topic_types": snapshot_topic_types, "versions": snapshot_versions, "version": self.content_version}, "dump")
+
     def dispatch(self, type: str, event):
         if self.save_up_events:
             if self.saved_events == None:
                 self.saved_events = []
             self.saved_events.append({"type": type, "event": event})
         else:
-            super().dispatch(type, event)
+            if type == "broadcast_update" and self.journal is not None:
+                self.journal.record(event)
+        
+            if type == "broadcast_update":
+                self.get_event_scheduler().schedule(event)
+            else:
+                self.dispatched_event_count += 1
+                super().dispatch(type, event)
+
+    def get_event_scheduler(self) -> HudContentEventScheduler:
+        if self.event_scheduler is None:
+            self.event_scheduler = HudContentEventScheduler(self.send_broadcast_update)
+        return self.event_scheduler
+
+    def send_broadcast_update(self, event: HudContentEvent):
+        if self.coalesce_window_ms > 0:
+            self.coalesce_event(event)
+        else:
+            self.dispatched_event_count += 1
+            super().dispatch("broadcast_update", event)
+
+    # Hold back replace and remove events until the end of the window, so only the last event per topic is sent
+    # Append and patch events are sent right away, but pending events of the same topic are sent first to keep their order
+    # Interactive events are never held back
+    def coalesce_event(self, event: HudContentEvent):
+        if self.coalesced_events is None:
+            self.coalesced_events = {}
+    
+        key = (event.topic_type, event.topic)
+        if event.operation in ["replace", "remove"] and event.priority != CONTENT_EVENT_PRIORITY_INTERACTIVE:
+            if key in self.coalesced_events:
+                superseded_event = self.coalesced_events[key]
+                if event.operation == "replace" and superseded_event.operation == "replace":
+                    event.show = event.show or superseded_event.show
+                    event.claim = max(event.claim, superseded_event.claim)
+                del self.coalesced_events[key]
+                self.dropped_event_count += 1
+            self.coalesced_events[key] = event
+            
+            if self.coalesce_job is None:
+                self.coalesce_job = cron.after(str(self.coalesce_window_ms) + "ms", self.flush_coalesced_events)
+        else:
+            if key in self.coalesced_events:
+                self.flush_coalesced_events()
+            self.dispatched_event_count += 1
+            super().dispatch("broadcast_update", event)
+
+    def flush_coalesced_events(self):
+        cron.cancel(self.coalesce_job)
+        self.coalesce_job = None
+        if self.coalesced_events:
+            coalesced_events = self.coalesced_events
+            self.coalesced_events = {}
+            for event in coalesced_events.values():
+                self.dispatched_event_count += 1
+                super().dispatch("broadcast_update", event)
+
+    def set_coalesce_window(self, coalesce_window_ms: int):
+        self.coalesce_window_ms = max(0, int(coalesce_window_ms)) if coalesce_window_ms else 0
+        if self.coalesce_window_ms == 0:
+            self.flush_coalesced_events()
+
+    def get_coalescing_statistics(self) -> dict:
+        return {
+            "window_ms": self.coalesce_window_ms,
+            "dispatched": self.dispatched_event_count,
+            "dropped": self.dropped_event_count,
+            "pending": len(self.coalesced_events) if self.coalesced_events else 0
+        }
+
+    # Enable, resize or disable the content journal, a length of zero disables it
+    def set_journal_length(self, journal_length: int):
+        if journal_length and journal_length > 0:
+            if self.journal is None:
+                self.journal = HudContentJournal(self.topic_types, journal_length)
+            else:
+                self.journal.set_max_length(journal_length)
+        else:
+            self.journal = None
+
+    # Take over the journal of a previous content state after a reload, as it matches the kept topic types
+    def restore_journal(self, journal: HudContentJournal):
+        if self.journal is not None:
+            if journal is not None:
+                journal.set_max_length(self.journal.max_length)
+                self.journal = journal
+            else:
+                self.journal = HudContentJournal(self.topic_types, self.journal.max_length)
+
+    def get_journal_statistics(self) -> dict:
+        return self.journal.get_statistics() if self.journal is not None else {"max_length": 0, "length": 0, "recorded": 0, "compactions": 0}
+
+    def set_bulk_event_budget(self, budget_ms: int):
+        self.get_event_scheduler().set_budget(budget_ms)
 
     def destroy(self):
-        pass
+        settings.unregister("user.talon_hud_event_coalescing_ms", self.set_coalesce_window)
+        settings.unregister("user.talon_hud_content_journal_length", self.set_journal_length)
+        settings.unregister("user.talon_hud_bulk_event_budget_ms", self.set_bulk_event_budget)
+        if self.event_scheduler is not None:
+            self.event_scheduler.destroy()
+        cron.cancel(self.coalesce_job)
+        self.coalesce_job = None
+        self.coalesced_events = None
 
 hud_content = HeadUpDisplayContent()
 
 def on_ready():
     global hud_content
+    hud_content.set_coalesce_window(settings.get("user.talon_hud_event_coalescing_ms", 0))
+    settings.register("user.talon_hud_event_coalescing_ms", hud_content.set_coalesce_window)
+    hud_content.set_journal_length(settings.get("user.talon_hud_content_journal_length", 0))
+    settings.register("user.talon_hud_content_journal_length", hud_content.set_journal_length)
+    hud_content.set_bulk_event_budget(settings.get("user.talon_hud_bulk_event_budget_ms", 0))
+    settings.register("user.talon_hud_bulk_event_budget_ms", hud_content.set_bulk_event_budget)
     actions.user.hud_internal_register("HeadUpDisplayContent", hud_content)
 
 app.register('ready', on_ready)
@@ -241,6 +467,31 @@ class Actions:
         global hud_content
         hud_content.show_throttled_logs(sleep_s)
 
+    def hud_set_log_limit(type: str, limit: int):
+        """Set the maximum amount of log messages of the given type that are kept in memory"""
+        global hud_content
+        hud_content.get_log_store().set_limit(type, limit)
+
+    def hud_get_event_coalescing_statistics() -> dict:
+        """Get the amount of content events that were dispatched and dropped because they were superseded"""
+        global hud_content
+        return hud_content.get_coalescing_statistics()
+
+    def hud_get_content_event_queue_statistics() -> dict:
+        """Get the depth of the bulk content event queue along with the time the queued events have waited"""
+        global hud_content
+        return hud_content.get_event_scheduler().get_statistics()
+
+    def hud_get_content_journal_statistics() -> dict:
+        """Get the length of the content journal along with the amount of recorded events and compactions"""
+        global hud_content
+        return hud_content.get_journal_statistics()
+
+    def hud_get_log_memory_usage() -> int:
+        """Get the estimated amount of bytes in use by the log messages kept in memory"""
+        global hud_content
+        return hud_content.get_log_store().get_memory_usage()
+
     def hud_add_status_icon(id: str, image: str):
         """Add an unclickable icon to the status bar"""
         global hud_content
@@ -294,16 +545,16 @@ class Actions:
             commands = {}
         else:
             for voice_command in voice_commands:
-                commands.append(HudDynamicVoiceCommand(voice_command, voice_commands[voice_command]))
+                commands.append(HudDynamicVoiceCommand(voice_command, voice_commands[voice_command], string_to_speakable_string(voice_command)))
             
-        content = HudPanelContent(topic, title, [content], buttons, time.time(), show, voice_commands=commands)
+        content = HudPanelContent(topic, title, [content], buttons, time.time(), show, voice_commands=commands, speakable_title=string_to_speakable_string(title), rich_text_tokens=tokenize_rich_text(content))
         
         global hud_content
         hud_content.publish("text", content)
         
     def hud_create_button(text: str, callback: Callable[[], None], image: str = ""):
         """Create a button used in the Talon HUD"""
-        return HudButton(image, text, ui.Rect(0,0,0,0), callback)
+        return HudButton(image, text, ui.Rect(0,0,0,0), callback, string_to_speakable_string(text))
         
     def hud_create_status_option(icon_topic: str, default_option: HudButton, activated_option: HudButton):
         """Create an option entry to show in the options in the status bar"""
@@ -348,7 +599,7 @@ class Actions:
         choices = []
         for index, choice_data in enumerate(choices_list):
             image = choice_data["image"] if "image" in choice_data else ""
-            choices.append(HudChoice(image, choice_data["text"], choice_data, "selected" in choice_data and choice_data["selected"], ui.Rect(0,0,0,0)))
+            choices.append(HudChoice(image, choice_data["text"], choice_data, "selected" in choice_data and choice_data["selected"], ui.Rect(0,0,0,0), string_to_speakable_string(choice_data["text"])))
         return HudChoices(choices, callback, multiple)
 
     def hud_publish_mouse_particle(type:str, colour:str = None, image:str = '', diameter:int = 10):
@@ -370,6 +621,6 @@ class Actions:
         if content == "":
             content = "Pick any from the following choices using <*option <number>/>"
         
-        content = HudPanelContent("choice", title, [content], [], time.time(), True, choices)
+        content = HudPanelContent("choice", title, [content], [], time.time(), True, choices, speakable_title=string_to_speakable_string(title), rich_text_tokens=tokenize_rich_text(content))
         global hud_content
         hud_content.publish("choice", content)
@@ -3,17 +3,30 @@ from talon import ui
 from talon.types.point import Point2d
 from typing import Callable, Any
 
-@dataclass
+# Rich text is shared between the widgets through the layout cache, so it cannot be changed after creation
+@dataclass(frozen=True)
 class HudRichText:
     x: int
     y: int
     width: int
     height: int
-    styles: list[str]
+    styles: tuple[str]
     text: str
 
 class HudRichTextLine: list[HudRichText]
 
+# Kinds of tokens in a tokenized rich text
+RICH_TEXT_TOKEN_TEXT = 0 # A run of text without any delimiters or line endings
+RICH_TEXT_TOKEN_STYLE_START = 1 # The start of a style, where the value is the name of the style
+RICH_TEXT_TOKEN_STYLE_END = 2 # The end of the last started style
+RICH_TEXT_TOKEN_LINE_END = 3 # A line ending, where the value is the line ending used in the text
+
+# Rich text split into its tokens once, so the layout, stripping and voice command extraction do not need to split it again
+@dataclass(frozen=True)
+class HudRichTextTokens:
+    text: str
+    tokens: tuple[tuple[int, str]]
+
 @dataclass
 class HudChoice:
     image: str
@@ -21,6 +34,7 @@ class HudChoice:
     data: Any
     selected: bool
     rect: ui.Rect
+    speakable_text: str = None
     
 @dataclass
 class HudChoices:
@@ -42,11 +56,13 @@ class HudButton:
     text: str
     rect: ui.Rect
     callback: Callable[[Any], None]
+    speakable_text: str = None
 
 @dataclass
 class HudDynamicVoiceCommand:
     command: str
     callback: Callable[[Any], None]
+    speakable_command: str = None
 
 @dataclass
 class HudPanelContent:
@@ -58,6 +74,8 @@ class HudPanelContent:
     show: bool
     choices: HudChoices = None
     voice_commands: list[HudDynamicVoiceCommand] = None
+    speakable_title: str = None
+    rich_text_tokens: HudRichTextTokens = None
 
 HOVER_VISIBILITY_ON = 1 # Only show the items when the region is hovered by the mouse
 HOVER_VISIBILITY_OFF = 0 # Keep the screen region active regardless of mouse hover
@@ -94,6 +112,7 @@ class HudWalkThroughStep:
     said_walkthrough_commands: list[str] = None
     progress: HudContentPage = None    
     show_context_hint: bool = False
+    rich_text_tokens: HudRichTextTokens = None
 
 @dataclass    
 class HudWalkThrough:
@@ -113,6 +132,19 @@ CLAIM_BROADCAST = 0 # Broadcast to any widget that listens for this topic type
 CLAIM_WIDGET = 1 # Claim a single widget and send the content towards it
 CLAIM_WIDGET_TOPIC_TYPE = 2 # Claim a single widget and clear out the topic type attached to it
 
+CONTENT_EVENT_PRIORITY_INTERACTIVE = 0 # Content the user is waiting on, always sent before other content
+CONTENT_EVENT_PRIORITY_NORMAL = 1 # Content sent right away
+CONTENT_EVENT_PRIORITY_BULK = 2 # High volume content that can be spread out over multiple ticks
+
+content_event_priorities = {
+    "variable": CONTENT_EVENT_PRIORITY_INTERACTIVE,
+    "choice": CONTENT_EVENT_PRIORITY_INTERACTIVE,
+    "walkthrough_step": CONTENT_EVENT_PRIORITY_INTERACTIVE,
+    "log_messages": CONTENT_EVENT_PRIORITY_BULK,
+    "particles": CONTENT_EVENT_PRIORITY_BULK,
+    "screen_regions": CONTENT_EVENT_PRIORITY_BULK
+}
+
 @dataclass
 class HudContentEvent:
     topic_type: str
@@ -121,6 +153,11 @@ class HudContentEvent:
     operation: str = "replace"
     claim: int = CLAIM_BROADCAST
     show: bool = False
+    priority: int = None
+    
+    def __post_init__(self):
+        if self.priority is None:
+            self.priority = content_event_priorities[self.topic_type] if self.topic_type in content_event_priorities else CONTENT_EVENT_PRIORITY_NORMAL
     
 @dataclass
 class HudLogMessage:
@@ -128,6 +165,7 @@ class HudLogMessage:
     type: str
     message: str
     metadata: Any = None
+    id: int = None
     
 @dataclass
 class HudAbilityIcon:
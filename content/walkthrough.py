@@ -1,7 +1,7 @@
 from typing import Callable, Any
 from talon import app, Module, actions, Context, speech_system, cron, scope, fs
 from .typing import HudWalkThrough, HudWalkThroughStep, HudContentPage
-from ..utils import retrieve_available_voice_commands, md_to_richtext_content
+from ..utils import retrieve_available_voice_commands, md_file_to_richtext_content, tokenize_rich_text
 from ..configuration import hud_get_configuration
 import os
 import json
@@ -174,15 +174,14 @@ class WalkthroughPoller:
                         walkthrough_step = self.content.create_walkthrough_step(**step)
                         steps.append( walkthrough_step )
         elif filename.endswith(".md"):
-            with open(filename) as md_file:
-                richtext_content = md_to_richtext_content(md_file.read())
-                richtext_lines = richtext_content.splitlines()
-                for richtext_line in richtext_lines:
-                    if richtext_line != "":
-                        step = copy.copy(walkthrough_defaults)
-                        step["content"] = richtext_line
-                        walkthrough_step = self.content.create_walkthrough_step(**step)
-                        steps.append( walkthrough_step )
+            richtext_content = md_file_to_richtext_content(filename)
+            richtext_lines = richtext_content.splitlines()
+            for richtext_line in richtext_lines:
+                if richtext_line != "":
+                    step = copy.copy(walkthrough_defaults)
+                    step["content"] = richtext_line
+                    walkthrough_step = self.content.create_walkthrough_step(**step)
+                    steps.append( walkthrough_step )
         return steps
         
     def add_walkthrough(self, walkthrough: HudWalkThrough):
@@ -402,10 +401,11 @@ class Actions:
 
     def hud_create_walkthrough_step(content: str, context_hint: str = "", tags: list[str] = None, modes: list[str] = None, app: str = "", restore_callback: Callable[[Any, Any], None] = None):
         """Create a step for a walk through"""
-        voice_commands = retrieve_available_voice_commands(content)
+        rich_text_tokens = tokenize_rich_text(content)
+        voice_commands = retrieve_available_voice_commands(content, rich_text_tokens)
         tags = [] if tags is None else tags
         modes = [] if modes is None else modes
-        return HudWalkThroughStep(content, context_hint, tags, modes, app, voice_commands, restore_callback)
+        return HudWalkThroughStep(content, context_hint, tags, modes, app, voice_commands, restore_callback, rich_text_tokens=rich_text_tokens)
 
     def hud_create_walkthrough(title: str, steps: list[HudWalkThroughStep]):
         """Create a walk through with all the required steps"""
@@ -9,6 +9,8 @@ from .preferences import HeadUpDisplayUserPreferences
 from .theme import HeadUpDisplayTheme
 from .event_dispatch import HeadUpEventDispatch
 from .widget_manager import HeadUpWidgetManager
+from .subscription_index import HeadUpSubscriptionIndex
+from .poller_references import HeadUpPollerReferences
 from .content.content_builder import HudContentBuilder
 from .layout_widget import LayoutWidget
 from .widgets.textpanel import HeadUpTextPanel
@@ -16,7 +18,10 @@ from .widgets.choicepanel import HeadUpChoicePanel
 from .widgets.contextmenu import HeadUpContextMenu
 from .content.typing import HudPanelContent, HudButton, HudContentEvent, HudContentPage
 from .content.poller import Poller
-from .utils import string_to_speakable_string
+from .content.journal import journal_ignored_topic_types
+from .utils import string_to_speakable_string, get_speakable_text, rich_text_layout_cache, text_measurements
+from .frame_clock import frame_clock
+from .canvas_pool import canvas_pool
 
 # Taken from knausj/code/numbers to make Talon HUD standalone
 # The numbers should realistically stay very low for choices, because you don't want choice overload for the user, up to 100
@@ -57,6 +62,7 @@ mod.tag("talon_hud_visible", desc="Tag that shows that the Talon HUD is visible"
 mod.tag("talon_hud_choices_visible", desc="Tag that shows there are choices available on screen that can be chosen")
 mod.setting("talon_hud_environment", type="string", desc="Which environment to set the HUD in - Useful for setting up a HUD for screen recording or other tasks")
 mod.setting("talon_hud_allows_capture", type=bool, default=True, desc="Whether or not the HUD is captured in screenshots.")
+mod.setting("talon_hud_layout_cache_kb", type=int, default=1024, desc="Maximum amount of kilobytes used to cache calculated text layouts")
 
 ctx.tags = ["user.talon_hud_available"]
 ctx.settings["user.talon_hud_environment"] = ""
@@ -94,11 +100,18 @@ class HeadUpDisplay:
     focus_grace_period = 0
     start_idle_period = 0
     prev_mouse_pos = None
-    mouse_poller = None
     current_talon_hud_environment = ""
 
     enabled_voice_commands = {}
     update_preferences_debouncer = None
+    
+    # Cached state of the Talon lists to only update them when their contents have changed
+    context_lists = None
+    widget_contexts = None
+    theme_context = None
+    context_list_assignments = 0
+    context_list_skips = 0
+    context_widget_recalculations = 0
     update_context_debouncer = None
     update_environment_debouncer = None
     
@@ -109,10 +122,14 @@ class HeadUpDisplay:
         self.pollers = {}
         self.keep_alive_pollers = []
         self.disable_poller_job = None
+        self.context_lists = {}
+        self.widget_contexts = {}
         self.theme = HeadUpDisplayTheme(self.preferences.prefs["theme_name"])
         self.event_dispatch = HeadUpEventDispatch()
         self.show_animations = self.preferences.prefs["show_animations"]
         self.widget_manager = HeadUpWidgetManager(self.preferences, self.theme, self.event_dispatch)
+        self.subscription_index = HeadUpSubscriptionIndex(self.widget_manager.widgets)
+        self.poller_references = HeadUpPollerReferences()
 
     def start(self, current_flow="initialize"):
         self.set_current_flow(current_flow)
@@ -125,7 +142,10 @@ class HeadUpDisplay:
                 actions.user.hud_add_log("warning", "Microphone is set to \"None\"!\n\nNo voice commands will be registered.")
         
         self.set_current_flow("manual")
-        self.distribute_content()
+        if current_flow == "restore" and self.display_state.journal is not None:
+            self.restore_content()
+        else:
+            self.distribute_content()
         # Make sure auto focusing can only start a second after the HUD has started up
         # To make sure the content updating does not fling the focus for the user everywhere during booting
         cron.after("1s", lambda self=self: self.set_auto_focus(self.preferences.prefs["auto_focus"]))
@@ -153,8 +173,9 @@ class HeadUpDisplay:
             self.event_dispatch.register("detect_autofocus", self.update_focus_grace_period)
 
             # Reload the preferences just in case a screen change happened in between the hidden state
-            if persisted or self.current_flow in ["repair", "initialize"]:
+            if persisted or self.current_flow in ["repair", "restore", "initialize"]:
                 reload_theme = self.widget_manager.reload_preferences(True, self.current_talon_hud_environment)
+                self.subscription_index.rebuild(self.widget_manager.widgets)
                 if reload_theme != self.theme.name:
                     self.switch_theme(reload_theme, True)
 
@@ -165,6 +186,8 @@ class HeadUpDisplay:
             
             ui.register("screen_change", self.reload_preferences)
             settings.register("user.talon_hud_environment", self.hud_environment_change)
+            self.set_layout_cache_size(settings.get("user.talon_hud_layout_cache_kb", 1024))
+            settings.register("user.talon_hud_layout_cache_kb", self.set_layout_cache_size)
             self.determine_active_setup_mouse()
             if persisted:
                 self.preferences.persist_preferences({"enabled": True})
@@ -196,6 +219,7 @@ class HeadUpDisplay:
             self.display_state.unregister("broadcast_update", self.broadcast_update)
             ui.unregister("screen_change", self.reload_preferences)
             settings.unregister("user.talon_hud_environment", self.hud_environment_change)            
+            settings.unregister("user.talon_hud_layout_cache_kb", self.set_layout_cache_size)
             self.determine_active_setup_mouse()
             
             # Only change the tags upon a user action - No automatic flow should set tags to prevent cascades
@@ -231,10 +255,7 @@ class HeadUpDisplay:
         for widget in self.widget_manager.widgets:
             if not widget.enabled and widget.id == id:
                 widget.enable(True)                
-                for topic, poller in self.pollers.items():
-                    if topic in widget.current_topics and (not hasattr(self.pollers[topic], "enabled") or not self.pollers[topic].enabled):
-                        self.pollers[topic].enable()
-
+                self.update_poller_references(widget)
                 self.update_context()
                 break
         self.set_current_flow("manual")
@@ -256,6 +277,7 @@ class HeadUpDisplay:
             if widget.id == id:
                 if content_key not in widget.subscriptions:
                     widget.subscriptions.append(content_key)
+                    self.subscription_index.update_subscriptions(widget)
         self.set_current_flow("manual")
 
     def unsubscribe_content_id(self, id, content_key):
@@ -264,6 +286,7 @@ class HeadUpDisplay:
             if widget.id == id:
                 if content_key in widget.subscriptions:
                     widget.subscriptions.remove(content_key)
+                    self.subscription_index.update_subscriptions(widget)
         self.set_current_flow("manual")
 
     def set_widget_preference(self, id, property, value, persisted=False):
@@ -271,12 +294,15 @@ class HeadUpDisplay:
         for widget in self.widget_manager.widgets:
             if widget.id == id:
                 widget.set_preference(property, value, persisted)
+                self.subscription_index.update_subscriptions(widget)
+                self.refresh_widget_topics(widget)
         self.determine_active_setup_mouse()
         self.set_current_flow("manual")
 
     def add_theme(self, theme_name, theme_dir):
         if os.path.exists(theme_dir):
             self.custom_themes[theme_name] = theme_dir
+            self.theme_context = None
         else:
             app.notify("Invalid directory for '" + theme_name + "': " + theme_dir)
     
@@ -294,7 +320,7 @@ class HeadUpDisplay:
         
         # Temporarily disable preference persisting during the transition between environments
         # As content updates during the transition can override previous files        
-        if flow in ["repair", "initialize", "environment_changed"]:
+        if flow in ["repair", "restore", "initialize", "environment_changed"]:
             self.preferences.disable()
         else:
             self.preferences.enable()
@@ -339,6 +365,7 @@ class HeadUpDisplay:
             self.set_current_flow("manual")
 
     def reload_theme(self, name=None, flags=None):
+        self.theme_context = None
         self.theme = HeadUpDisplayTheme(self.theme.name, self.theme.theme_dir)
         for widget in self.widget_manager.widgets:
             show_animations = widget.show_animations
@@ -382,6 +409,7 @@ class HeadUpDisplay:
     def reload_preferences(self, _= None):
         """Reload user preferences ( in case a monitor switches or something )"""
         self.widget_manager.reload_preferences(False, self.current_talon_hud_environment)
+        self.subscription_index.rebuild(self.widget_manager.widgets)
     
     def connect_internal(self, type: str, data: Any):
         """Connect classes after they are loaded in to make sure they can be reloaded after changes have been made"""
@@ -407,9 +435,35 @@ class HeadUpDisplay:
         self.allow_update_context = False
         self.display_state.save_events()
 
-        content_dump = self.display_state.get_content_dump()
+        # Every widget only receives the topics it can display
         for widget in self.widget_manager.widgets:
-            widget.content_handler(content_dump)
+            widget.content_handler(self.display_state.get_content_snapshot(widget.topic_types, widget.current_topics))
+        self.subscription_index.update_all_current_topics()
+        self.update_all_poller_references()
+
+        self.update_context()
+        self.allow_update_context = True
+        self.display_state.flush_events()
+
+    def restore_content(self):
+        """Restores the content of the widgets from the snapshot of the content journal and replays the events that happened after it"""
+        self.allow_update_context = False
+        self.display_state.save_events()
+        
+        journal = self.display_state.journal
+        for widget in self.widget_manager.widgets:
+            snapshot_event = journal.get_snapshot_event(widget.topic_types, widget.current_topics)
+            
+            # Topic types that are not journaled, like the log messages, are taken from their own stores instead
+            ignored_topic_types = [topic_type for topic_type in widget.topic_types if topic_type in journal_ignored_topic_types]
+            if ignored_topic_types:
+                content_snapshot = self.display_state.get_content_snapshot(ignored_topic_types, widget.current_topics)
+                snapshot_event.content["topic_types"].update(content_snapshot.content["topic_types"])
+            widget.content_handler(snapshot_event)
+        self.subscription_index.update_all_current_topics()
+        for event in journal.get_replay_events():
+            self.broadcast_update(event)
+        self.synchronize_pollers()
 
         self.update_context()
         self.allow_update_context = True
@@ -428,14 +482,8 @@ class HeadUpDisplay:
             self.keep_alive_pollers.append(topic)
             self.pollers[topic].enable()
         # Automatically enable the poller if it was active on restart        
-        else:
-            enabled = False
-            for widget in self.widget_manager.widgets:
-                if topic in widget.current_topics and widget.enabled and \
-                    (not hasattr(self.pollers[topic], "enabled") or not self.pollers[topic].enabled):
-                    self.pollers[topic].enable()
-                    enabled = True
-                    break
+        elif self.poller_references.is_referenced(topic) and not self.is_poller_enabled(topic):
+            self.pollers[topic].enable()
 
     def remove_poller(self, topic: str):
         if topic in self.pollers:
@@ -453,42 +501,64 @@ class HeadUpDisplay:
     	# Enable the poller afterwards
         if topic in self.pollers and \
             topic not in self.keep_alive_pollers and \
-            (not hasattr(self.pollers[topic], "enabled") or not self.pollers[topic].enabled):
+            not self.is_poller_enabled(topic):
             self.pollers[topic].enable()
 
+    def is_poller_enabled(self, topic: str) -> bool:
+        return getattr(self.pollers[topic], "enabled", False)
+
+    # Synchronize all the pollers with the widgets that display their topics
+    # This is only needed after flows in which the pollers were not updated directly
     def synchronize_pollers(self, disable_pollers = True, enable_pollers = True):
-        attached_topics = list(self.keep_alive_pollers)
-        if self.enabled:
-            for widget in self.widget_manager.widgets:
-                if widget.current_topics and widget.enabled:
-                    attached_topics.extend(widget.current_topics)
-        
+        self.update_all_poller_references()
+
         # First - Disable all pollers from making content updates to prevent race conditions with content events from occurring
         if disable_pollers:
-            for topic, poller in self.pollers.items():
-                if topic not in attached_topics and (hasattr(self.pollers[topic], "enabled") and self.pollers[topic].enabled):
+            for topic in self.pollers:
+                if topic not in self.keep_alive_pollers and not self.poller_references.is_referenced(topic) \
+                    and self.is_poller_enabled(topic):
                     self.pollers[topic].disable()
 
         # Then - Automatically start pollers that are connected to widgets
         if enable_pollers:
-            for topic, poller in self.pollers.items():
-                if topic in attached_topics and (not hasattr(self.pollers[topic], "enabled") or not self.pollers[topic].enabled):
+            for topic in self.pollers:
+                if (topic in self.keep_alive_pollers or self.poller_references.is_referenced(topic)) \
+                    and not self.is_poller_enabled(topic):
                     self.pollers[topic].enable()
 
     # Synchronize the pollers attached to a single widget
     def synchronize_widget_poller(self, widget_id):
-        current_topics = []
         for widget in self.widget_manager.widgets:
             if widget.id == widget_id:
-                current_topics = widget.current_topics
+                self.update_poller_references(widget)
                 break
 
-        for topic in current_topics:
-            if topic in self.pollers and topic not in self.keep_alive_pollers:
-                if widget.enabled and (not hasattr(self.pollers[topic], "enabled") or not self.pollers[topic].enabled):
-                    self.pollers[topic].enable()
-                elif not widget.enabled and (hasattr(self.pollers[topic], "enabled") and self.pollers[topic].enabled):
-                    self.pollers[topic].disable()
+    # Update the topic references of a widget, and only enable or disable the pollers whose reference count crosses zero
+    def update_poller_references(self, widget, synchronize = True):
+        referenced_topics, dereferenced_topics = self.poller_references.update_widget(widget, self.enabled and widget.enabled)
+
+        # For certain flows that trigger a lot of events we do not allow the pollers to be updated
+        # As it can lead to faulty state - These flows synchronize all the pollers after they have finished
+        if not synchronize or self.current_flow in ["repair", "restore", "initialize", "environment_changed"]:
+            return
+
+        # First - Disable pollers to prevent race conditions with content events from occurring
+        for topic in dereferenced_topics:
+            if topic in self.pollers and topic not in self.keep_alive_pollers and self.is_poller_enabled(topic):
+                self.pollers[topic].disable()
+
+        for topic in referenced_topics:
+            if topic in self.pollers and not self.is_poller_enabled(topic):
+                self.pollers[topic].enable()
+
+    def update_all_poller_references(self):
+        for widget in self.widget_manager.widgets:
+            self.update_poller_references(widget, False)
+
+    # Keep the content routing and the poller references up to date after the topics of a widget might have changed
+    def refresh_widget_topics(self, widget):
+        self.subscription_index.update_current_topics(widget)
+        self.update_poller_references(widget)
 
     # Check if the widgets are finished unloading, then disable the poller
     # This should only run when we have a state poller
@@ -520,12 +590,9 @@ class HeadUpDisplay:
             topic = event.topic
             using_fallback = True
             widget_to_claim = None
-            widgets_with_topic = []
-            for widget in self.widget_manager.widgets:
-                if event.topic_type in widget.topic_types and topic in widget.current_topics:
-                    widgets_with_topic.append(widget)
-                
-                if event.topic_type in widget.topic_types and ( topic in widget.subscriptions or ("*" in widget.subscriptions and using_fallback)):
+            widgets_with_topic = self.subscription_index.get_widgets_with_topic(event.topic_type, topic)
+            for widget in self.subscription_index.get_claim_candidates(event.topic_type, topic):
+                if topic in widget.subscriptions or using_fallback:
                     if topic in widget.current_topics:
                         widget_to_claim = widget
                     else:
@@ -539,8 +606,10 @@ class HeadUpDisplay:
                 for widget in widgets_with_topic:
                     if widget.id != widget_to_claim.id:
                         widget.clear_topic(event.topic)
+                        self.refresh_widget_topics(widget)
                 
                 updated = widget_to_claim.content_handler(event)
+                self.refresh_widget_topics(widget_to_claim)
                 
                 # Check if we need to autofocus the content
                 if event.show and time.time() < self.focus_grace_period:
@@ -549,24 +618,9 @@ class HeadUpDisplay:
                         if not self.auto_focus:
                             self.focus_grace_period = 0
         else:
-            for widget in self.widget_manager.widgets:
-                if event.topic_type == "variable" or (event.topic_type in widget.topic_types and \
-                    (event.topic in widget.subscriptions or \
-                    ("*" in widget.subscriptions and "!" + event.topic not in widget.subscriptions))):
-
-                    current_enabled_state = widget.enabled
-                    updated = widget.content_handler(event)
-                    if widget.enabled != current_enabled_state:
-                        if event.topic in self.pollers and event.topic not in self.keep_alive_pollers:
-                            if widget.enabled:
-                                self.pollers[event.topic].enable()
-                            else:
-                                self.pollers[event.topic].disable()
-
-        # For certain flows that trigger a lot of events we do not allow the pollers to be updated
-        # As it can lead to faulty state
-        if self.current_flow not in ["repair", "initialize", "environment_changed"]:
-            self.synchronize_pollers()
+            for widget in self.subscription_index.get_broadcast_targets(event.topic_type, event.topic):
+                updated = widget.content_handler(event)
+                self.refresh_widget_topics(widget)
 
         if updated and self.allow_update_context:
             self.update_context()
@@ -580,11 +634,11 @@ class HeadUpDisplay:
                 has_setup_modes = True
                 break
     
-        if has_setup_modes and not self.mouse_poller:
-            self.mouse_poller = cron.interval("16ms", self.poll_mouse_pos_for_setup)
-        if not has_setup_modes and self.mouse_poller:
-            cron.cancel(self.mouse_poller)
-            self.mouse_poller = None
+        polling_mouse = frame_clock.is_subscribed(self.poll_mouse_pos_for_setup)
+        if has_setup_modes and not polling_mouse:
+            frame_clock.subscribe(self.poll_mouse_pos_for_setup)
+        if not has_setup_modes and polling_mouse:
+            frame_clock.unsubscribe(self.poll_mouse_pos_for_setup)
 
     # Send mouse events to enabled widgets that have an active setup going on
     def poll_mouse_pos_for_setup(self):
@@ -691,73 +745,145 @@ class HeadUpDisplay:
         choices = {}
         quick_choices = {}
         numerical_choices = {}
-        themes = {}
         enabled_voice_commands = {}
         
-        themes_directory = os.path.dirname(os.path.abspath(__file__)) + "/themes"
-        themes_list = os.listdir(themes_directory)
-        for theme in themes_list:
-            if theme != "_base_theme":
-                themes[string_to_speakable_string(theme)] = theme
-        for custom_theme_name in self.custom_themes:
-            themes[string_to_speakable_string(custom_theme_name)] = custom_theme_name
-        
+        # Only recalculate the voice commands of widgets that have changed since the last update
         for widget in self.widget_manager.widgets:
-            current_widget_names = [string_to_speakable_string(widget.id)]        
-            if isinstance(widget, HeadUpTextPanel):
-                content_title = string_to_speakable_string(widget.panel_content.title)
-                if content_title:
-                    current_widget_names.append(string_to_speakable_string(widget.panel_content.title))
-                    
-            for widget_name in current_widget_names:
-                widget_names[widget_name] = widget.id
-                
-            # Add quick choices
-            for index, button in enumerate(widget.buttons):
-                choice_title = string_to_speakable_string(button.text)
-                if choice_title:
-                    for widget_name in current_widget_names:
-                        quick_choices[widget_name + " " + choice_title] = widget.id + "|" + str(index)
-            
-            # Add context choices
-            if widget.enabled and isinstance(widget, HeadUpContextMenu):
-                for index, button in enumerate(widget.buttons):
-                    choice_title = string_to_speakable_string(button.text)
-                    if choice_title:
-                        choices[choice_title] = widget.id + "|" + str(index)
-
-            # Add extra voice commands ( for instance, ones alluded to in text )
-            if widget.enabled and isinstance(widget, HeadUpTextPanel) and widget.panel_content.voice_commands:
-                for index, voice_command in enumerate(widget.panel_content.voice_commands):
-                    enabled_voice_command = string_to_speakable_string(voice_command.command)
-                    if enabled_voice_command:
-                        enabled_voice_commands[enabled_voice_command] = voice_command.callback
-             
-            # Add choice panel choices
-            if widget.enabled and isinstance(widget, HeadUpChoicePanel):
+            widget_context = self.get_widget_context(widget)
+            widget_names.update(widget_context["widget_names"])
+            quick_choices.update(widget_context["quick_choices"])
+            choices.update(widget_context["choices"])
+            numerical_choices.update(widget_context["numerical_choices"])
+            enabled_voice_commands.update(widget_context["enabled_voice_commands"])
+            if widget_context["choices_visible"]:
                 self.choices_visible = True
-                for index, choice in enumerate(widget.choices):
-                    choice_title = string_to_speakable_string(choice.text)
-                    if choice_title:
-                        choices[choice_title] = widget.id + "|" + str(index)
-                    numerical_choices[numerical_choice_strings[index]] = widget.id + "|" + str(index)
-                        
-                if widget.panel_content.choices and widget.panel_content.choices.multiple:
-                    choices["confirm"] = widget.id + "|" + str(index + 1)
         
         # Make sure the list is never empty to prevent Talon issue #495
         # This workaround will be removed when the current beta is merged with the regular version
         if len(choices) == 0:
             choices["head up choice empty command"] = "|"
         
-        ctx.lists["user.talon_hud_numerical_choices"] = numerical_choices
-        ctx.lists["user.talon_hud_widget_names"] = widget_names
-        ctx.lists["user.talon_hud_choices"] = choices
-        ctx.lists["user.talon_hud_quick_choices"] = quick_choices
-        ctx.lists["user.talon_hud_themes"] = themes
+        self.update_context_list("user.talon_hud_numerical_choices", numerical_choices)
+        self.update_context_list("user.talon_hud_widget_names", widget_names)
+        self.update_context_list("user.talon_hud_choices", choices)
+        self.update_context_list("user.talon_hud_quick_choices", quick_choices)
+        self.update_context_list("user.talon_hud_themes", self.get_theme_context())
         
         self.enabled_voice_commands = enabled_voice_commands
-        ctx.lists["user.talon_hud_widget_enabled_voice_commands"] = enabled_voice_commands.keys()
+        self.update_context_list("user.talon_hud_widget_enabled_voice_commands", list(enabled_voice_commands.keys()))
+
+    # Only assign a Talon list if its contents have changed, as every assignment causes the grammar to be recompiled
+    def update_context_list(self, list_name: str, list_contents):
+        if list_name in self.context_lists and self.context_lists[list_name] == list_contents:
+            self.context_list_skips += 1
+        else:
+            self.context_lists[list_name] = list_contents
+            self.context_list_assignments += 1
+            ctx.lists[list_name] = list_contents
+
+    # The available themes only change when a theme is added or when a watched theme directory changes
+    def get_theme_context(self) -> dict:
+        if self.theme_context is None:
+            themes = {}
+            themes_directory = os.path.dirname(os.path.abspath(__file__)) + "/themes"
+            themes_list = os.listdir(themes_directory)
+            for theme in themes_list:
+                if theme != "_base_theme":
+                    themes[string_to_speakable_string(theme)] = theme
+            for custom_theme_name in self.custom_themes:
+                themes[string_to_speakable_string(custom_theme_name)] = custom_theme_name
+            self.theme_context = themes
+        
+        return self.theme_context
+
+    # Get the state of a widget that influences the voice commands available
+    def get_widget_context_signature(self, widget) -> tuple:
+        is_text_panel = isinstance(widget, HeadUpTextPanel)
+        title = widget.panel_content.title if is_text_panel else None
+        buttons = tuple(button.text for button in widget.buttons)
+        voice_commands = None
+        if widget.enabled and is_text_panel and widget.panel_content.voice_commands:
+            voice_commands = tuple((voice_command.command, voice_command.callback) for voice_command in widget.panel_content.voice_commands)
+        
+        choices = None
+        if widget.enabled and isinstance(widget, HeadUpChoicePanel):
+            choices = (tuple(choice.text for choice in widget.choices), \
+                widget.panel_content.choices is not None and widget.panel_content.choices.multiple)
+        
+        return (widget.enabled, title, buttons, voice_commands, choices)
+
+    # Get the voice commands of a single widget, recalculating them only if the widget has changed
+    def get_widget_context(self, widget) -> dict:
+        signature = self.get_widget_context_signature(widget)
+        if widget.id in self.widget_contexts and self.widget_contexts[widget.id]["signature"] == signature:
+            return self.widget_contexts[widget.id]
+        
+        widget_context = {
+            "signature": signature,
+            "widget_names": {},
+            "quick_choices": {},
+            "choices": {},
+            "numerical_choices": {},
+            "enabled_voice_commands": {},
+            "choices_visible": False
+        }
+        
+        # Content created through the content builder carries its speakable forms, content from before a reload might not
+        current_widget_names = [string_to_speakable_string(widget.id)]
+        if isinstance(widget, HeadUpTextPanel):
+            content_title = get_speakable_text(widget.panel_content.title, getattr(widget.panel_content, "speakable_title", None))
+            if content_title:
+                current_widget_names.append(content_title)
+                
+        for widget_name in current_widget_names:
+            widget_context["widget_names"][widget_name] = widget.id
+            
+        # Add quick choices
+        for index, button in enumerate(widget.buttons):
+            choice_title = get_speakable_text(button.text, getattr(button, "speakable_text", None))
+            if choice_title:
+                for widget_name in current_widget_names:
+                    widget_context["quick_choices"][widget_name + " " + choice_title] = widget.id + "|" + str(index)
+        
+        # Add context choices
+        if widget.enabled and isinstance(widget, HeadUpContextMenu):
+            for index, button in enumerate(widget.buttons):
+                choice_title = get_speakable_text(button.text, getattr(button, "speakable_text", None))
+                if choice_title:
+                    widget_context["choices"][choice_title] = widget.id + "|" + str(index)
+
+        # Add extra voice commands ( for instance, ones alluded to in text )
+        if widget.enabled and isinstance(widget, HeadUpTextPanel) and widget.panel_content.voice_commands:
+            for index, voice_command in enumerate(widget.panel_content.voice_commands):
+                enabled_voice_command = get_speakable_text(voice_command.command, getattr(voice_command, "speakable_command", None))
+                if enabled_voice_command:
+                    widget_context["enabled_voice_commands"][enabled_voice_command] = voice_command.callback
+         
+        # Add choice panel choices
+        if widget.enabled and isinstance(widget, HeadUpChoicePanel):
+            widget_context["choices_visible"] = True
+            for index, choice in enumerate(widget.choices):
+                choice_title = get_speakable_text(choice.text, getattr(choice, "speakable_text", None))
+                if choice_title:
+                    widget_context["choices"][choice_title] = widget.id + "|" + str(index)
+                widget_context["numerical_choices"][numerical_choice_strings[index]] = widget.id + "|" + str(index)
+                    
+            if widget.panel_content.choices and widget.panel_content.choices.multiple:
+                widget_context["choices"]["confirm"] = widget.id + "|" + str(len(widget.choices))
+        
+        self.widget_contexts[widget.id] = widget_context
+        self.context_widget_recalculations += 1
+        return widget_context
+
+    def get_context_statistics(self) -> dict:
+        return {
+            "list_assignments": self.context_list_assignments,
+            "skipped_list_assignments": self.context_list_skips,
+            "widget_recalculations": self.context_widget_recalculations
+        }
+
+    def set_layout_cache_size(self, kilobytes: int):
+        rich_text_layout_cache.set_max_bytes(max(0, kilobytes) * 1024)
 
     def hud_environment_change(self, hud_environment: str):
         if self.current_talon_hud_environment != hud_environment:
@@ -770,6 +896,7 @@ class HeadUpDisplay:
 
     def debounce_environment_change(self, _=None, __=None):
         reload_theme = self.widget_manager.reload_preferences(True, self.current_talon_hud_environment)
+        self.subscription_index.rebuild(self.widget_manager.widgets)
         # Switch the theme and make sure there is no lengthy animation between modes 
         # as they can happen quite frequently
         self.switch_theme(reload_theme, True)
@@ -781,6 +908,7 @@ class HeadUpDisplay:
 
     def destroy(self):
         cron.cancel(self.disable_poller_job)
+        frame_clock.unsubscribe(self.poll_mouse_pos_for_setup)
         cron.cancel(self.update_environment_debouncer)
         if self.event_dispatch is not None:
             self.event_dispatch.unregister("persist_preferences", self.debounce_widget_preferences)
@@ -803,6 +931,9 @@ class HeadUpDisplay:
                 widget.show_animations = show_animations
             self.widget_manager.destroy()
         self.widget_manager = None
+        canvas_pool.clear()
+        self.subscription_index.destroy()
+        self.poller_references.clear()
         
     # ---------- KEYBOARD FOCUS METHODS ---------- #
     def focus(self):
@@ -976,6 +1107,25 @@ class Actions:
         global hud
         hud.deactivate_poller(topic)
 
+    def hud_get_context_statistics() -> dict:
+        """Get the amount of Talon list assignments made and skipped because their contents had not changed"""
+        global hud
+        return hud.get_context_statistics()
+
+    def hud_get_layout_cache_statistics() -> dict:
+        """Get the amount of text layouts, lines and word measurements that were reused along with the memory usage of the layout cache"""
+        statistics = rich_text_layout_cache.get_statistics()
+        statistics["word_measurements"] = text_measurements.get_statistics()
+        return statistics
+
+    def hud_get_frame_clock_statistics() -> dict:
+        """Get the frames per second and the time spent per frame by the clock that ticks all widget animations"""
+        return frame_clock.get_statistics()
+
+    def hud_get_canvas_pool_statistics() -> dict:
+        """Get the amount of screen region canvases that were created, reused and closed"""
+        return canvas_pool.get_statistics()
+
     def hud_get_theme() -> HeadUpDisplayTheme:
         """Get the current theme object from the HUD"""
         global hud
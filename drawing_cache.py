@@ -0,0 +1,86 @@
+from talon import skia, ui
+from typing import Callable
+import math
+
+class HudStaticDrawing:
+    """Records the part of a widget that does not change between frames, like the background, header and laid out text, into an image
+    Frames that only change hover states draw the recorded image and the dynamic parts on top of it,
+    The widget clears the recording when its content, theme or layout changes, and a change in dimensions or key records it again
+    """
+    supported: bool
+    key: tuple
+    rect: tuple
+    image: skia.Image
+
+    hits: int
+    misses: int
+
+    def __init__(self):
+        # Offscreen surfaces are not available in every version of Talon, in which case everything is drawn directly
+        self.supported = hasattr(skia, "Surface")
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def clear(self):
+        self.key = None
+        self.rect = None
+        self.image = None
+
+    def draw(self, canvas, rect: ui.Rect, key: tuple, draw_static: Callable):
+        """Draw the static part of a widget within the given rect, only calling draw_static when the recording is outdated"""
+        if not self.supported:
+            draw_static(canvas, canvas.paint)
+            return
+
+        # Pixel aligned bounds so the recorded image is not resampled when drawn
+        x = math.floor(rect.x)
+        y = math.floor(rect.y)
+        record_rect = ui.Rect(x, y, math.ceil(rect.x + rect.width) - x, math.ceil(rect.y + rect.height) - y)
+        if self.image is None or self.key != key or self.rect != (record_rect.x, record_rect.y, record_rect.width, record_rect.height):
+            self.misses += 1
+            if not self.record(canvas, record_rect, key, draw_static):
+                draw_static(canvas, canvas.paint)
+                return
+        else:
+            self.hits += 1
+
+        # Make sure the colour alpha of earlier drawing is not applied to the recording
+        canvas.paint.color = "FFFFFFFF"
+        canvas.draw_image(self.image, self.rect[0], self.rect[1])
+
+    def record(self, canvas, rect: ui.Rect, key: tuple, draw_static: Callable) -> bool:
+        self.clear()
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+
+        # Fall back to drawing directly from now on if the offscreen drawing API is missing parts
+        try:
+            surface = skia.Surface(int(rect.width), int(rect.height))
+            surface_canvas = surface.canvas()
+            surface_paint = surface_canvas.paint
+            surface_canvas.translate(-rect.x, -rect.y)
+        except (AttributeError, TypeError):
+            self.supported = False
+            return False
+
+        draw_static(surface_canvas, surface_paint)
+        try:
+            self.image = surface.snapshot()
+        except (AttributeError, TypeError):
+            self.supported = False
+            self.image = None
+            return False
+
+        self.key = key
+        self.rect = (rect.x, rect.y, rect.width, rect.height)
+        return True
+
+    def get_statistics(self) -> dict:
+        draws = self.hits + self.misses
+        return {
+            "supported": self.supported,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / draws if draws > 0 else 0.0
+        }
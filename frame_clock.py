@@ -0,0 +1,98 @@
+from talon import cron
+from typing import Callable
+import time
+
+class HudFrameClock:
+    """Single timer that ticks everything in the HUD that animates, once per frame
+    Callbacks are subscribed while they animate, and the timer only runs while there are subscribers
+    A callback that returns False is unsubscribed, just like a draw method that returns False stops drawing
+    """
+    frame_ms: int
+    job = None
+    subscribers: list
+    frame: int
+
+    frames: int
+    tick_seconds: float
+    max_tick_seconds: float
+    running_seconds: float
+    running_since: float
+
+    def __init__(self, frame_ms: int = 16):
+        self.frame_ms = frame_ms
+        self.job = None
+        self.subscribers = []
+        self.frame = 0
+        self.clear_statistics()
+
+    def clear_statistics(self):
+        self.frames = 0
+        self.tick_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self.running_seconds = 0.0
+        self.running_since = time.perf_counter()
+
+    def subscribe(self, callback: Callable[[], bool], frame_interval: int = 1):
+        """Call the callback every frame_interval frames until it returns False or is unsubscribed"""
+        if not self.is_subscribed(callback):
+            self.subscribers.append([callback, max(1, frame_interval)])
+        if self.job is None:
+            self.running_since = time.perf_counter()
+            self.job = cron.interval(str(self.frame_ms) + "ms", self.tick)
+
+    def unsubscribe(self, callback: Callable[[], bool]):
+        for subscriber in self.subscribers:
+            if subscriber[0] == callback:
+                # Removed subscribers are skipped by a tick that is still going through them
+                subscriber[0] = None
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber[0] is not None]
+        if len(self.subscribers) == 0:
+            self.stop()
+
+    def is_subscribed(self, callback: Callable[[], bool]) -> bool:
+        for subscriber in self.subscribers:
+            if subscriber[0] == callback:
+                return True
+        return False
+
+    def stop(self):
+        if self.job is not None:
+            cron.cancel(self.job)
+            self.job = None
+            self.running_seconds += time.perf_counter() - self.running_since
+
+    def tick(self):
+        start = time.perf_counter()
+        self.frame += 1
+        for subscriber in self.subscribers:
+            callback, frame_interval = subscriber
+            if callback is not None and self.frame % frame_interval == 0:
+                try:
+                    keep_ticking = callback()
+                except:
+                    # Make sure a broken callback does not raise an error on every frame
+                    self.unsubscribe(callback)
+                    raise
+                if keep_ticking == False:
+                    self.unsubscribe(callback)
+
+        tick_seconds = time.perf_counter() - start
+        self.frames += 1
+        self.tick_seconds += tick_seconds
+        self.max_tick_seconds = max(self.max_tick_seconds, tick_seconds)
+
+    def get_statistics(self) -> dict:
+        running_seconds = self.running_seconds
+        if self.job is not None:
+            running_seconds += time.perf_counter() - self.running_since
+        return {
+            "running": self.job is not None,
+            "subscribers": len(self.subscribers),
+            "frames": self.frames,
+            "frames_per_second": self.frames / running_seconds if running_seconds > 0 else 0.0,
+            "average_tick_ms": self.tick_seconds / self.frames * 1000 if self.frames > 0 else 0.0,
+            "max_tick_ms": self.max_tick_seconds * 1000
+        }
+
+# The frame clock shared by all widgets
+frame_clock = HudFrameClock()
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from typing import Any
+import math
+import sys
+
+class HudLayoutCache:
+    """Least recently used cache for calculated text layouts
+    The cache is capped by an estimate of the memory used by the cached layouts rather than the amount of entries,
+    As a single documentation page takes up a lot more memory than a single log message
+    Layouts that are stored with the range of widths they stay the same for are also found for the other widths in that range,
+    So resizing a widget only requires a new layout when a line break actually changes
+    """
+    max_bytes: int
+    used_bytes: int
+    entries: OrderedDict
+    width_ranges: dict
+    width_range_keys: dict
+
+    hits: int
+    width_hits: int
+    misses: int
+    evictions: int
+    reused_line_count: int
+    recomputed_line_count: int
+
+    def __init__(self, max_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.width_ranges = {}
+        self.width_range_keys = {}
+        self.used_bytes = 0
+        self.hits = 0
+        self.width_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reused_line_count = 0
+        self.recomputed_line_count = 0
+
+    def set_max_bytes(self, max_bytes: int):
+        self.max_bytes = max(0, max_bytes)
+        self.evict()
+
+    def get(self, key: tuple, range_key: tuple = None, width: float = None) -> Any:
+        """Get a cached value, or a value stored under the range key whose width range contains the given width"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        
+        if range_key in self.width_ranges:
+            for width_key, width_range in self.width_ranges[range_key].items():
+                if is_width_in_range(width, width_range):
+                    self.entries.move_to_end(width_key)
+                    self.hits += 1
+                    self.width_hits += 1
+                    return self.entries[width_key][0]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, value: Any, size: int, range_key: tuple = None, width_range: list = None):
+        if key in self.entries:
+            self.remove(key)
+
+        # Values that do not fit in the cache at all are not stored
+        if size <= self.max_bytes:
+            self.entries[key] = (value, size)
+            self.used_bytes += size
+            if range_key is not None:
+                if range_key not in self.width_ranges:
+                    self.width_ranges[range_key] = {}
+                self.width_ranges[range_key][key] = width_range
+                self.width_range_keys[key] = range_key
+            self.evict()
+
+    def remove(self, key: tuple):
+        _, size = self.entries.pop(key)
+        self.used_bytes -= size
+        if key in self.width_range_keys:
+            range_key = self.width_range_keys.pop(key)
+            del self.width_ranges[range_key][key]
+            if len(self.width_ranges[range_key]) == 0:
+                del self.width_ranges[range_key]
+
+    def evict(self):
+        while self.used_bytes > self.max_bytes and len(self.entries) > 0:
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def record_incremental_layout(self, reused_line_count: int, recomputed_line_count: int):
+        self.reused_line_count += reused_line_count
+        self.recomputed_line_count += recomputed_line_count
+
+    def get_statistics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "used_bytes": self.used_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "width_hits": self.width_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "incremental_reused_lines": self.reused_line_count,
+            "incremental_recomputed_lines": self.recomputed_line_count
+        }
+
+class HudIncrementalLayout:
+    """Layout of a single text that mostly grows at the end, like the content of a toolkit panel
+    The layout is kept in chunks that end at a line break where no style is active,
+    So the chunks that the next text starts with can be reused and only the text after them needs to be laid out again
+    Chunks are also reused for other widths within their width range
+    """
+    key: tuple
+    chunks: list
+
+    # The amount of lines that were reused and laid out again during the last layout
+    reused_line_count: int
+    recomputed_line_count: int
+
+    def __init__(self):
+        self.clear(None)
+
+    def clear(self, key: tuple):
+        self.key = key
+        self.chunks = []
+        self.reused_line_count = 0
+        self.recomputed_line_count = 0
+
+    def get_statistics(self) -> dict:
+        return {
+            "chunks": len(self.chunks),
+            "reused_lines": self.reused_line_count,
+            "recomputed_lines": self.recomputed_line_count
+        }
+
+def create_width_range(width: float = None) -> list:
+    """The widths for which a layout stays the same, starting out as every width
+    It consists of the width the widest line needs, the width of the widest word that is not split up, and the narrowest width that moves a word to the next line
+    A layout made for a single width only, like one with split up words, is given the range of just that width
+    """
+    if width is None:
+        return [0.0, -1.0, math.inf]
+    else:
+        return [width, -1.0, math.nextafter(width, math.inf)]
+
+def is_width_in_range(width: float, width_range: list) -> bool:
+    return width >= width_range[0] and width > width_range[1] and width < width_range[2]
+
+def intersect_width_ranges(width_range: list, other_width_range: list):
+    width_range[0] = max(width_range[0], other_width_range[0])
+    width_range[1] = max(width_range[1], other_width_range[1])
+    width_range[2] = min(width_range[2], other_width_range[2])
+
+def get_layout_size(key: tuple, rich_text: tuple) -> int:
+    """Estimate the memory used by a cached rich text layout and its key"""
+    size = sys.getsizeof(key) + sys.getsizeof(rich_text)
+    for key_part in key:
+        size += sys.getsizeof(key_part)
+    for text in rich_text:
+        size += sys.getsizeof(text) + sys.getsizeof(text.text) + sys.getsizeof(text.styles)
+    return size
@@ -1,8 +1,45 @@
 from talon import canvas, ui, actions
 from .base_widget import BaseWidget
 from .utils import layout_rich_text
+from .drawing_cache import HudStaticDrawing
 from .content.typing import HudContentPage, HudPanelContent
+from .theme import HudStyleValue
 from random import randint
+from typing import Callable
+
+class LayoutPages:
+    """Pages of a layout where only the amount of pages is known up front
+    A page is built the first time it is requested, and only the last requested page and its neighbours are kept around,
+    So paginating a long document does not build every page on each layout pass
+    """
+    page_count: int
+    build_page: Callable[[int], dict]
+    pages: dict
+
+    def __init__(self, page_count: int, build_page: Callable[[int], dict]):
+        self.page_count = page_count
+        self.build_page = build_page
+        self.pages = {}
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __getitem__(self, page_index: int) -> dict:
+        if page_index < 0:
+            page_index += self.page_count
+        if page_index < 0 or page_index >= self.page_count:
+            raise IndexError("Layout page index out of range")
+
+        if page_index not in self.pages:
+            for built_page_index in list(self.pages.keys()):
+                if abs(built_page_index - page_index) > 1:
+                    del self.pages[built_page_index]
+            self.pages[page_index] = self.build_page(page_index)
+        return self.pages[page_index]
+
+    def __iter__(self):
+        for page_index in range(self.page_count):
+            yield self[page_index]
 
 class LayoutWidget(BaseWidget):
     """This widget has a layout pass and changes the mouse capture area based on the content
@@ -15,6 +52,16 @@ class LayoutWidget(BaseWidget):
     mouse_capture_canvas: canvas.Canvas = None
     layout = []
     page_index = 0
+
+    style_values = BaseWidget.style_values + [
+        HudStyleValue("error_colour", default="AA0000"),
+        HudStyleValue("warning_colour", default="F75B00"),
+        HudStyleValue("success_colour", default="00CC00"),
+        HudStyleValue("info_colour", default="30AD9E")
+    ]
+    
+    # The recorded static part of the current page, cleared whenever the layout or the theme changes
+    static_drawing: HudStaticDrawing = None
     
     def enable(self, persisted=False):
         if not self.enabled:
@@ -145,6 +192,11 @@ class LayoutWidget(BaseWidget):
             self.refresh_drawing()
         return self.enabled and panel_content.topic in self.current_topics
 
+    def set_theme(self, theme):
+        if self.static_drawing is not None:
+            self.static_drawing.clear()
+        super().set_theme(theme)
+
     def layout_content(self, canvas, paint):
         # Determine the dimensions and positions of the content
         return [{"rect": ui.Rect(self.limit_x, self.limit_y, self.limit_width, self.limit_height)}]
@@ -158,6 +210,8 @@ class LayoutWidget(BaseWidget):
         
         if self.mark_layout_invalid:
             self.layout = self.layout_content(canvas, paint)
+            if self.static_drawing is not None:
+                self.static_drawing.clear()
             
         if self.page_index > len(self.layout) - 1:
             self.page_index = max(0, len(self.layout) -1)
@@ -177,6 +231,12 @@ class LayoutWidget(BaseWidget):
                 self.resize_mouse_canvas(content_dimensions)
         return continue_drawing
     
+    def draw_static_content(self, canvas, rect, key: tuple, draw_static: Callable):
+        """Draws the parts of the page that only change along with the layout, recording them so following frames can reuse them"""
+        if self.static_drawing is None:
+            self.static_drawing = HudStaticDrawing()
+        self.static_drawing.draw(canvas, rect, (self.page_index,) + key, draw_static)
+
     def resize_mouse_canvas(self, content_dimensions):
         rect = content_dimensions["rect"]
         self.capture_rect = rect
@@ -187,10 +247,10 @@ class LayoutWidget(BaseWidget):
     def draw_rich_text(self, canvas, paint, rich_text, x, y, line_padding, single_line=False):
         # Draw text line by line
         text_colour = paint.color
-        error_colour = self.theme.get_colour("error_colour", "AA0000")
-        warning_colour = self.theme.get_colour("warning_colour", "F75B00")
-        success_colour = self.theme.get_colour("success_colour", "00CC00")
-        info_colour = self.theme.get_colour("info_colour", "30AD9E")
+        error_colour = self.style.error_colour
+        warning_colour = self.style.warning_colour
+        success_colour = self.style.success_colour
+        info_colour = self.style.info_colour
     
         current_line = -1
         for index, text in enumerate(rich_text):
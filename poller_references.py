@@ -0,0 +1,44 @@
+from .base_widget import BaseWidget
+
+class HeadUpPollerReferences:
+    """Keeps count of the enabled widgets that display each topic
+    The pollers of a topic only need to be enabled or disabled when its count crosses zero
+    """
+    reference_counts: dict
+    widget_topics: dict
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.reference_counts = {}
+        self.widget_topics = {}
+
+    def update_widget(self, widget: BaseWidget, attached: bool) -> (list[str], list[str]):
+        """Update the references of a widget, returning the topics that gained their first reference and the topics that lost their last reference"""
+        previous_topics = self.widget_topics[widget.id] if widget.id in self.widget_topics else set()
+        current_topics = set(widget.current_topics) if attached and widget.current_topics else set()
+        if previous_topics == current_topics:
+            return [], []
+        self.widget_topics[widget.id] = current_topics
+
+        referenced_topics = []
+        for topic in current_topics - previous_topics:
+            self.reference_counts[topic] = self.reference_counts[topic] + 1 if topic in self.reference_counts else 1
+            if self.reference_counts[topic] == 1:
+                referenced_topics.append(topic)
+
+        dereferenced_topics = []
+        for topic in previous_topics - current_topics:
+            self.reference_counts[topic] -= 1
+            if self.reference_counts[topic] <= 0:
+                del self.reference_counts[topic]
+                dereferenced_topics.append(topic)
+
+        return referenced_topics, dereferenced_topics
+
+    def get_count(self, topic: str) -> int:
+        return self.reference_counts[topic] if topic in self.reference_counts else 0
+
+    def is_referenced(self, topic: str) -> bool:
+        return topic in self.reference_counts
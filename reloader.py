@@ -1,6 +1,7 @@
 from talon import Module, actions, cron
 from typing import Any
 import copy
+import time
 
 key_hud = "HeadUpDisplay"
 key_content = "HeadUpDisplayContent"
@@ -13,10 +14,12 @@ _reloader_state = {
 }
 
 initialized = False
+last_reload_ms = 0.0
 
 def clear_old_references():
     global _reloader_state
     global initialized
+    global last_reload_ms
     
     for index, hud in enumerate(_reloader_state[key_hud]):
         if index != len(_reloader_state[key_hud]) - 1:
@@ -24,6 +27,7 @@ def clear_old_references():
 
     # Keep the first content state around as it is the most likely to be filled
     content_topic_types = copy.copy(_reloader_state[key_content][0].topic_types) if len(_reloader_state[key_content]) > 0 else {}    
+    content_journal = getattr(_reloader_state[key_content][0], "journal", None) if len(_reloader_state[key_content]) > 0 else None
     for key in _reloader_state:
         if key not in [key_hud, key_poller] and len(_reloader_state[key]) > 0:
             for index, extra_type in enumerate(_reloader_state[key]):
@@ -33,10 +37,23 @@ def clear_old_references():
     
     if len(_reloader_state[key_content]) > 0:
         _reloader_state[key_content][0].topic_types = content_topic_types
+        if hasattr(_reloader_state[key_content][0], "restore_journal"):
+            _reloader_state[key_content][0].restore_journal(content_journal)
         
     if len(_reloader_state[key_hud]) > 0:
         _reloader_state[key_hud] = [_reloader_state[key_hud][-1]]
-        _reloader_state[key_hud][-1].start("initialize" if not initialized else "repair")
+        
+        # When the content events have been journaled, the widgets can be restored from the journal
+        # Instead of repairing the content by turning all the pollers off and on again
+        flow = "initialize"
+        if initialized:
+            flow = "restore" if content_journal is not None and getattr(_reloader_state[key_content][0], "journal", None) is not None else "repair"
+        
+        start_time = time.perf_counter()
+        _reloader_state[key_hud][-1].start(flow)
+        if initialized:
+            last_reload_ms = (time.perf_counter() - start_time) * 1000
+            print( "Talon HUD - Reloaded using the " + flow + " flow in " + str(round(last_reload_ms, 2)) + "ms" )
         initialized = True
 
 clean_older_references_job = None
@@ -45,6 +62,11 @@ mod = Module()
 @mod.action_class
 class Actions:
 
+    def hud_get_last_reload_duration() -> float:
+        """Get the amount of milliseconds it took to restart the HUD after the last reload caused by file updates"""
+        global last_reload_ms
+        return last_reload_ms
+
     def hud_internal_register(type: str, data: Any, name: str = None):        
         """Used to register new instances of HeadUpDisplay, HeadUpDisplayContent etc. for managing between reloads caused by file updates"""
         global _reloader_state
@@ -0,0 +1,165 @@
+from .base_widget import BaseWidget
+
+class HeadUpSubscriptionIndex:
+    """Keeps track of which widgets should receive content events for a topic type and topic
+    The routes are calculated once per topic type and topic and are kept until a subscription changes,
+    So routing a single content event only costs as much as the widgets it is sent to
+    """
+    widgets: list[BaseWidget]
+    widget_indexes: dict
+
+    # Index of the subscriptions by topic, and the widgets that listen to every topic
+    explicit_subscribers: dict
+    excluded_subscribers: dict
+    wildcard_subscribers: set
+    widget_subscriptions: dict
+
+    # Index of the topics that are currently displayed by widgets
+    topic_holders: dict
+    widget_topics: dict
+
+    # Calculated routes, stored by topic first to allow for invalidating a single topic
+    broadcast_routes: dict
+    claim_routes: dict
+
+    def __init__(self, widgets: list[BaseWidget] = None):
+        self.rebuild(widgets if widgets is not None else [])
+
+    def rebuild(self, widgets: list[BaseWidget]):
+        """Rebuild the full index, used when widgets are loaded or their preferences are reloaded"""
+        self.widgets = list(widgets)
+        self.widget_indexes = {id(widget): index for index, widget in enumerate(self.widgets)}
+        self.explicit_subscribers = {}
+        self.excluded_subscribers = {}
+        self.wildcard_subscribers = set()
+        self.widget_subscriptions = {}
+        self.topic_holders = {}
+        self.widget_topics = {}
+        self.broadcast_routes = {}
+        self.claim_routes = {}
+
+        for index in range(len(self.widgets)):
+            self.index_subscriptions(index)
+            self.index_current_topics(index)
+
+    def destroy(self):
+        self.rebuild([])
+
+    def get_widget_index(self, widget: BaseWidget) -> int:
+        return self.widget_indexes.get(id(widget), -1)
+
+    def update_subscriptions(self, widget: BaseWidget):
+        """Update the index after the subscriptions of a widget have changed"""
+        index = self.get_widget_index(widget)
+        if index != -1:
+            self.index_subscriptions(index)
+
+    def update_current_topics(self, widget: BaseWidget):
+        """Update the index after the current topics of a widget might have changed"""
+        index = self.get_widget_index(widget)
+        if index != -1:
+            self.index_current_topics(index)
+
+    def update_all_current_topics(self):
+        for index in range(len(self.widgets)):
+            self.index_current_topics(index)
+
+    def index_subscriptions(self, index: int):
+        widget = self.widgets[index]
+        previous_subscriptions = self.widget_subscriptions[index] if index in self.widget_subscriptions else set()
+        subscriptions = set(widget.subscriptions) if widget.subscriptions else set()
+        if subscriptions == previous_subscriptions:
+            return
+        self.widget_subscriptions[index] = subscriptions
+
+        for subscription in previous_subscriptions - subscriptions:
+            if subscription == "*":
+                self.wildcard_subscribers.discard(index)
+            elif subscription.startswith("!"):
+                self.excluded_subscribers[subscription[1:]].discard(index)
+            else:
+                self.explicit_subscribers[subscription].discard(index)
+
+        for subscription in subscriptions - previous_subscriptions:
+            if subscription == "*":
+                self.wildcard_subscribers.add(index)
+            elif subscription.startswith("!"):
+                if subscription[1:] not in self.excluded_subscribers:
+                    self.excluded_subscribers[subscription[1:]] = set()
+                self.excluded_subscribers[subscription[1:]].add(index)
+            else:
+                if subscription not in self.explicit_subscribers:
+                    self.explicit_subscribers[subscription] = set()
+                self.explicit_subscribers[subscription].add(index)
+
+        # A wildcard change can alter the route of every topic, other changes only alter the routes of their own topic
+        changed_subscriptions = subscriptions ^ previous_subscriptions
+        if "*" in changed_subscriptions:
+            self.broadcast_routes = {}
+            self.claim_routes = {}
+        else:
+            for subscription in changed_subscriptions:
+                topic = subscription[1:] if subscription.startswith("!") else subscription
+                if topic in self.broadcast_routes:
+                    del self.broadcast_routes[topic]
+                if topic in self.claim_routes:
+                    del self.claim_routes[topic]
+
+    def index_current_topics(self, index: int):
+        widget = self.widgets[index]
+        previous_topics = self.widget_topics[index] if index in self.widget_topics else set()
+        current_topics = set(widget.current_topics) if widget.current_topics else set()
+        if current_topics == previous_topics:
+            return
+        self.widget_topics[index] = current_topics
+
+        for topic in previous_topics - current_topics:
+            self.topic_holders[topic].discard(index)
+        for topic in current_topics - previous_topics:
+            if topic not in self.topic_holders:
+                self.topic_holders[topic] = set()
+            self.topic_holders[topic].add(index)
+
+    def get_broadcast_targets(self, topic_type: str, topic: str) -> list[BaseWidget]:
+        """Get the widgets that should receive a broadcasted content event in order"""
+        if topic in self.broadcast_routes and topic_type in self.broadcast_routes[topic]:
+            return self.broadcast_routes[topic][topic_type]
+
+        targets = []
+        explicit_subscribers = self.explicit_subscribers[topic] if topic in self.explicit_subscribers else set()
+        excluded_subscribers = self.excluded_subscribers[topic] if topic in self.excluded_subscribers else set()
+        for index, widget in enumerate(self.widgets):
+            if topic_type == "variable" or (topic_type in widget.topic_types and \
+                (index in explicit_subscribers or \
+                (index in self.wildcard_subscribers and index not in excluded_subscribers))):
+                targets.append(widget)
+
+        if topic not in self.broadcast_routes:
+            self.broadcast_routes[topic] = {}
+        self.broadcast_routes[topic][topic_type] = targets
+        return targets
+
+    def get_claim_candidates(self, topic_type: str, topic: str) -> list[BaseWidget]:
+        """Get the widgets that can lay claim to a topic in order, either by subscribing to it directly or through the wildcard"""
+        if topic in self.claim_routes and topic_type in self.claim_routes[topic]:
+            return self.claim_routes[topic][topic_type]
+
+        candidates = []
+        explicit_subscribers = self.explicit_subscribers[topic] if topic in self.explicit_subscribers else set()
+        for index, widget in enumerate(self.widgets):
+            if topic_type in widget.topic_types and \
+                (index in explicit_subscribers or index in self.wildcard_subscribers):
+                candidates.append(widget)
+
+        if topic not in self.claim_routes:
+            self.claim_routes[topic] = {}
+        self.claim_routes[topic][topic_type] = candidates
+        return candidates
+
+    def get_widgets_with_topic(self, topic_type: str, topic: str) -> list[BaseWidget]:
+        """Get the widgets that currently display the topic in order"""
+        if topic not in self.topic_holders:
+            return []
+
+        return [self.widgets[index] for index in sorted(self.topic_holders[topic]) \
+            if topic_type in self.widgets[index].topic_types]
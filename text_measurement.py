@@ -0,0 +1,184 @@
+from talon import skia, ui
+
+def get_paint_font_key(paint: skia.Paint) -> tuple:
+    """Get the state of the paint that influences the measurements of text"""
+    typeface = getattr(paint, "typeface", None)
+    return (str(typeface) if typeface is not None else "", paint.textsize, paint.font.embolden, paint.font.skew_x)
+
+class HudTextMeasurements:
+    """Caches the measurements of single words per font, size and boldness
+    The bounds of a line of words are composed from the advances and ink bounds of its words,
+    So only words that have not been seen before with the same font need to be measured by skia
+    """
+    fonts: dict
+    max_words_per_font: int
+
+    hits: int
+    misses: int
+
+    def __init__(self, max_words_per_font: int = 10000):
+        self.max_words_per_font = max_words_per_font
+        self.clear()
+
+    def clear(self):
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_font_measurements(self, paint: skia.Paint) -> dict:
+        font_key = get_paint_font_key(paint)
+        if font_key not in self.fonts:
+            self.fonts[font_key] = {}
+        return self.fonts[font_key]
+
+    def measure_word(self, paint: skia.Paint, word: str, font_measurements: dict = None) -> tuple:
+        """Get the advance and the ink bounds ( left, top, right, bottom ) of a word"""
+        if font_measurements is None:
+            font_measurements = self.get_font_measurements(paint)
+        if word in font_measurements:
+            self.hits += 1
+            return font_measurements[word]
+
+        self.misses += 1
+        if len(font_measurements) >= self.max_words_per_font:
+            font_measurements.clear()
+        advance, bounds = paint.measure_text(word)
+        measurement = (advance, bounds.x, bounds.y, bounds.x + bounds.width, bounds.y + bounds.height)
+        font_measurements[word] = measurement
+        return measurement
+
+    def measure_text(self, paint: skia.Paint, text: str) -> ui.Rect:
+        """Get the bounds of a piece of text, like paint.measure_text would"""
+        _, left, top, right, bottom = self.measure_word(paint, text)
+        return ui.Rect(left, top, right - left, bottom - top)
+
+    def measure_words(self, paint: skia.Paint, words: list[str], space_text_bounds: ui.Rect) -> ui.Rect:
+        """Get the bounds of words joined by spaces, where leading and trailing spaces add the width of a space"""
+        # Edge case - dealing with single space, returned as a copy as callers may change the bounds they get
+        if len(words) == 1 and words[0] == "":
+            return ui.Rect(space_text_bounds.x, space_text_bounds.y, space_text_bounds.width, space_text_bounds.height)
+
+        first_index = -1
+        last_index = -1
+        for index, word in enumerate(words):
+            if word != "":
+                if first_index == -1:
+                    first_index = index
+                last_index = index
+
+        # Edge case - No words or spaces only, which are rare enough to measure directly
+        if first_index == -1:
+            _, line_bounds = paint.measure_text(" ".join(words))
+            line_bounds.width += max(0, len(words) - 1) * space_text_bounds.width
+            return line_bounds
+
+        font_measurements = self.get_font_measurements(paint)
+        space_advance = self.measure_word(paint, " ", font_measurements)[0]
+
+        advance, left, top, right, bottom = self.measure_word(paint, words[first_index], font_measurements)
+        position = advance
+        for index in range(first_index + 1, last_index + 1):
+            position += space_advance
+            word = words[index]
+            if word != "":
+                if word in font_measurements:
+                    self.hits += 1
+                    advance, _, word_top, word_right, word_bottom = font_measurements[word]
+                else:
+                    advance, _, word_top, word_right, word_bottom = self.measure_word(paint, word, font_measurements)
+                right = position + word_right
+                if word_top < top:
+                    top = word_top
+                if word_bottom > bottom:
+                    bottom = word_bottom
+                position += advance
+
+        extra_spaces_count = first_index + len(words) - 1 - last_index
+        return ui.Rect(left + first_index * space_advance, top, right - left + extra_spaces_count * space_text_bounds.width, bottom - top)
+
+    def get_statistics(self) -> dict:
+        measurements = self.hits + self.misses
+        return {
+            "fonts": len(self.fonts),
+            "words": sum([len(font_measurements) for font_measurements in self.fonts.values()]),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / measurements if measurements > 0 else 0.0
+        }
+
+class HudLineMeasurement:
+    """Running measurement of words joined by spaces, where adding a word takes constant time
+    Results in the same bounds as HudTextMeasurements.measure_words would for the added words
+    """
+    measurements: HudTextMeasurements
+    paint: skia.Paint
+    space_text_bounds: ui.Rect
+    font_measurements: dict
+    space_advance: float
+
+    count: int
+    first_index: int
+    last_index: int
+    position: float
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+    def __init__(self, measurements: HudTextMeasurements, paint: skia.Paint, space_text_bounds: ui.Rect):
+        self.measurements = measurements
+        self.paint = paint
+        self.space_text_bounds = space_text_bounds
+        self.font_measurements = measurements.get_font_measurements(paint)
+        self.space_advance = measurements.measure_word(paint, " ", self.font_measurements)[0]
+        self.clear()
+
+    def clear(self):
+        self.set_state((0, -1, -1, 0, 0, 0, 0, 0))
+
+    def get_state(self) -> tuple:
+        return (self.count, self.first_index, self.last_index, self.position, self.left, self.top, self.right, self.bottom)
+
+    def set_state(self, state: tuple):
+        self.count, self.first_index, self.last_index, self.position, self.left, self.top, self.right, self.bottom = state
+
+    def add(self, word: str):
+        if word != "":
+            advance, word_left, word_top, word_right, word_bottom = self.measurements.measure_word(self.paint, word, self.font_measurements)
+            if self.first_index == -1:
+                self.first_index = self.count
+                self.left = word_left
+                self.top = word_top
+                self.right = word_right
+                self.bottom = word_bottom
+                self.position = advance
+            else:
+                for _ in range(self.count - self.last_index):
+                    self.position += self.space_advance
+                self.right = self.position + word_right
+                if word_top < self.top:
+                    self.top = word_top
+                if word_bottom > self.bottom:
+                    self.bottom = word_bottom
+                self.position += advance
+            self.last_index = self.count
+        self.count += 1
+
+    def get_width(self) -> float:
+        if self.first_index == -1:
+            return self.get_bounds().width
+        extra_spaces_count = self.first_index + self.count - 1 - self.last_index
+        return self.right - self.left + extra_spaces_count * self.space_text_bounds.width
+
+    def get_bounds(self) -> ui.Rect:
+        # Edge case - dealing with single space
+        if self.count == 1 and self.first_index == -1:
+            return self.space_text_bounds
+
+        # Edge case - No words or spaces only
+        if self.first_index == -1:
+            _, line_bounds = self.paint.measure_text(" " * max(0, self.count - 1))
+            line_bounds.width += max(0, self.count - 1) * self.space_text_bounds.width
+            return line_bounds
+
+        return ui.Rect(self.left + self.first_index * self.space_advance, self.top, self.get_width(), self.bottom - self.top)
@@ -1,13 +1,29 @@
 from talon import skia, app
 from talon import ui
+from dataclasses import dataclass
+from typing import Any
 import os
 import random
 import re
+import string
 from .utils import hex_to_ints
 import logging
 
 semantic_directory = os.path.dirname(os.path.abspath(__file__))
 
+# A theme value that a widget draws with, along with the type it is used as
+# The types are colour, colour_ints, opacity, int and float, the attribute defaults to the name of the value
+@dataclass
+class HudStyleValue:
+    name: str
+    type: str = "colour"
+    default: Any = None
+    attribute: str = None
+
+# The theme values of a widget, looked up once whenever the theme is loaded so they do not need to be looked up while drawing
+class HudStyle:
+    pass
+
 # Contains all the values related to styling ( images, colours etc )
 class HeadUpDisplayTheme:
 
@@ -16,13 +32,16 @@ class HeadUpDisplayTheme:
     template_dict = None    
     values = None
     colours = None
+    colour_ints = None
+    opacities = None
+    ints = None
+    floats = None
     theme_dir = ''
 
     def __init__(self, theme_name, theme_dir=None):
         self.image_dict = {}
         self.template_dict = {}        
         self.values = {}
-        self.colours = {}
     
         self.name = theme_name
         base_theme_dir = os.path.join(os.path.join(semantic_directory, "themes"), "_base_theme")
@@ -35,7 +54,54 @@ class HeadUpDisplayTheme:
         
         # Here, override the base theme values
         self.load_dir(theme_dir)
+        self.compile_values()
     
+    # Parse all the values once into typed tables, so getting them while drawing does not parse them again
+    # Values that can not be used are reported here, after which the widgets use their own defaults in their place
+    def compile_values(self):
+        self.colours = {}
+        self.colour_ints = {}
+        self.opacities = {}
+        self.ints = {}
+        self.floats = {}
+        for name, value in self.values.items():
+            value = value.strip()
+            colour_value = value.replace("#", "")
+            is_colour = len(colour_value) in [6, 8] and all(character in string.hexdigits for character in colour_value)
+            if is_colour:
+                self.colours[name] = colour_value
+                self.colour_ints[name] = hex_to_ints(colour_value)
+            elif value.startswith("#"):
+                logging.warning( "Talon HUD - " + name + " has an invalid colour value of " + value + ", using the default colour instead")
+                continue
+
+            try:
+                number = float(value)
+            except ValueError:
+                if not is_colour:
+                    logging.warning( "Talon HUD - " + name + " has a value of " + value + " which is neither a number nor a colour, using the default value instead")
+                continue
+
+            self.floats[name] = number
+            self.ints[name] = int(number)
+            self.opacities[name] = max(0, min(255, int(number * 255)))
+
+    # Create the style of a widget out of the theme values it draws with
+    def create_style(self, style_values: list[HudStyleValue]) -> HudStyle:
+        style = HudStyle()
+        getters = {
+            "colour": self.get_colour,
+            "colour_ints": self.get_colour_as_ints,
+            "opacity": self.get_opacity,
+            "int": self.get_int_value,
+            "float": self.get_float_value
+        }
+        for style_value in style_values:
+            getter = getters[style_value.type]
+            value = getter(style_value.name) if style_value.default is None else getter(style_value.name, style_value.default)
+            setattr(style, style_value.attribute if style_value.attribute is not None else style_value.name, value)
+        return style
+
     # Get a list of the directories to watch for changes
     def get_watch_directories(self) -> list[str]:
         base_dir = os.path.join(os.path.join(semantic_directory, "themes"), "_base_theme")
@@ -177,38 +243,22 @@ class HeadUpDisplayTheme:
             return None
 
     def get_colour(self, colour, default_colour="000000"):
-        if colour in self.colours:
-            return self.colours[colour]
-        else:
-            if colour in self.values:
-                colour_value = self.values[colour]
-                if colour_value.startswith("#"):
-                    colour_value = colour_value.replace("#", "")                
-                if len(colour_value) != 6 and len(colour_value) != 8:
-                    logging.warning( "Talon HUD - " + colour + " has an invalid colour value of " + colour_value + ", using default " + default_colour)                    
-                    colour_value = default_colour
-                self.colours[colour] = colour_value
-            else:
-                self.colours[colour] = default_colour
-            return self.colours[colour]
+        return self.colours.get(colour, default_colour)
 
     def get_opacity(self, opacity_name, default_opacity=1.0):
-        if opacity_name in self.values:
-            return int( float(self.values[opacity_name]) * 255 )
+        if opacity_name in self.opacities:
+            return self.opacities[opacity_name]
         else:
             return int(default_opacity * 255)
             
     def get_float_value(self, name, default_value=1.0):
-        if name in self.values:
-            return float(self.values[name])
-        else:
-            return default_value
+        return self.floats.get(name, default_value)
             
     def get_int_value(self, name, default_value=1):
-        if name in self.values:
-            return int(self.values[name])
-        else:
-            return default_value
+        return self.ints.get(name, default_value)
             
-    def get_colour_as_ints(self, colour):
-        return hex_to_ints(self.get_colour(colour))
+    def get_colour_as_ints(self, colour, default_colour="000000"):
+        if colour in self.colour_ints:
+            return list(self.colour_ints[colour])
+        else:
+            return hex_to_ints(default_colour)
@@ -1,9 +1,12 @@
 from talon import skia, ui
 from talon.types.point import Point2d
-from .content.typing import HudRichText, HudRichTextLine, HudButton, HudIcon
-from textwrap import wrap
-import math
+from .content.typing import HudRichText, HudRichTextLine, HudButton, HudIcon, HudRichTextTokens, \
+    RICH_TEXT_TOKEN_TEXT, RICH_TEXT_TOKEN_STYLE_START, RICH_TEXT_TOKEN_STYLE_END, RICH_TEXT_TOKEN_LINE_END
+from .layout_cache import HudLayoutCache, HudIncrementalLayout, get_layout_size, create_width_range, is_width_in_range, intersect_width_ranges
+from .text_measurement import HudTextMeasurements, HudLineMeasurement, get_paint_font_key
 import re
+import math
+import os
 import numpy
 
 rich_text_delims_dict = {
@@ -21,32 +24,75 @@ rich_text_delims_dict = {
 rich_text_delims = rich_text_delims_dict.keys()
 rich_text_delims_regex = r"(/>|<\*|</|<\+|<\!\!|<\!|<@|<cmd@)"
 
-def remove_tokens_from_rich_text(text:str):
-    return re.sub(rich_text_delims_regex, "", text)
+rich_text_delims_pattern = re.compile(rich_text_delims_regex)
+rich_text_style_delims = {style: delim for delim, style in rich_text_delims_dict.items()}
+
+# The tokens of the delimiters never change, so they are shared between all tokenized texts
+rich_text_delim_tokens = {delim: (RICH_TEXT_TOKEN_STYLE_END, "") if style == "end" else (RICH_TEXT_TOKEN_STYLE_START, style) \
+    for delim, style in rich_text_delims_dict.items()}
+
+def tokenize_rich_text(text: str) -> HudRichTextTokens:
+    """Split a rich text into text runs, style starts, style ends and line endings"""
+    tokens = []
+    for line, line_with_ending in zip(text.splitlines(), text.splitlines(True)):
+        # Splitting results in the text runs at the even indexes and the delimiters at the odd indexes
+        split_line = rich_text_delims_pattern.split(line)
+        for index in range(0, len(split_line) - 1, 2):
+            if split_line[index] != "":
+                tokens.append((RICH_TEXT_TOKEN_TEXT, split_line[index]))
+            tokens.append(rich_text_delim_tokens[split_line[index + 1]])
+        if split_line[-1] != "":
+            tokens.append((RICH_TEXT_TOKEN_TEXT, split_line[-1]))
+        
+        if len(line_with_ending) > len(line):
+            tokens.append((RICH_TEXT_TOKEN_LINE_END, line_with_ending[len(line):]))
+    return HudRichTextTokens(text, tuple(tokens))
+
+def get_rich_text_tokens(text: str, rich_text_tokens: HudRichTextTokens = None) -> HudRichTextTokens:
+    """Get the tokens of a rich text, reusing the given tokens if they were made from the same text"""
+    if rich_text_tokens is not None and (rich_text_tokens.text is text or rich_text_tokens.text == text):
+        return rich_text_tokens
+    return tokenize_rich_text(text)
+
+def get_rich_text_token_lines(rich_text_tokens: HudRichTextTokens) -> list[list[tuple[int, str]]]:
+    """Split the tokens of a rich text into lines, in the same way str.splitlines splits the text"""
+    lines = []
+    line = []
+    for token in rich_text_tokens.tokens:
+        if token[0] == RICH_TEXT_TOKEN_LINE_END:
+            lines.append(line)
+            line = []
+        else:
+            line.append(token)
+    if len(line) > 0:
+        lines.append(line)
+    return lines
+
+def remove_tokens_from_rich_text(text:str, rich_text_tokens: HudRichTextTokens = None):
+    # Without earlier tokens, removing the delimiters directly is cheaper than tokenizing the text
+    if rich_text_tokens is None or rich_text_tokens.text != text:
+        return rich_text_delims_pattern.sub("", text)
+    return "".join([value for kind, value in rich_text_tokens.tokens if kind == RICH_TEXT_TOKEN_TEXT or kind == RICH_TEXT_TOKEN_LINE_END])
     
-def retrieve_available_voice_commands(text: str):
+def retrieve_available_voice_commands(text: str, rich_text_tokens: HudRichTextTokens = None):
     voice_commands = []
-    tokened_text = re.split( rich_text_delims_regex, text)
-    tokened_text = [x for x in tokened_text if x != ""]
     words_to_use = []
     
     styles = []
-    for token in tokened_text:
-        if token in rich_text_delims:
-            if token == "/>":
-                if len(styles) > 0:
-                    in_voice_command = "command_available" in styles
-                    styles.pop()
-                    if in_voice_command and "command_available" not in styles and len(words_to_use) > 0:
-                        voice_commands.append(string_to_speakable_string(" ".join(words_to_use)))
-                        words_to_use = []                        
-            else:
-                if rich_text_delims_dict[token] == "command_available" and \
-                    "command_available" not in styles:
-                    words_to_use = []
-                styles.append(rich_text_delims_dict[token])
-        else:
-            words_to_use += token.split()
+    for kind, value in get_rich_text_tokens(text, rich_text_tokens).tokens:
+        if kind == RICH_TEXT_TOKEN_STYLE_END:
+            if len(styles) > 0:
+                in_voice_command = "command_available" in styles
+                styles.pop()
+                if in_voice_command and "command_available" not in styles and len(words_to_use) > 0:
+                    voice_commands.append(string_to_speakable_string(" ".join(words_to_use)))
+                    words_to_use = []                        
+        elif kind == RICH_TEXT_TOKEN_STYLE_START:
+            if value == "command_available" and "command_available" not in styles:
+                words_to_use = []
+            styles.append(value)
+        elif kind == RICH_TEXT_TOKEN_TEXT:
+            words_to_use += value.split()
         
     # Edge case - Clean up remaining commands        
     if "command_available" in styles:
@@ -54,44 +100,78 @@ def retrieve_available_voice_commands(text: str):
 
     return voice_commands
 
-def layout_rich_text(paint:skia.Paint, text:str, width:int = 1920, height:int = 1080) -> list[HudRichTextLine]:
-    """Layout a string of text inside the given dimensions"""
-    _, e_text_bounds = paint.measure_text("E")
-    _, space_text_bounds = paint.measure_text("E E")
+# Line breaking modes of the rich text layout
+# Greedy fills every line as far as possible, minimum raggedness spreads the words evenly over the lines of a paragraph
+LINE_BREAKING_GREEDY = "greedy"
+LINE_BREAKING_MINIMUM_RAGGEDNESS = "minimum_raggedness"
+
+# Cache of rich text layouts, as the same texts get laid out on every frame or layout pass
+rich_text_layout_cache = HudLayoutCache()
+
+# Cache of word measurements, so only new words need to be measured when laying out text
+text_measurements = HudTextMeasurements()
+
+def layout_rich_text(paint:skia.Paint, text:str, width:int = 1920, height:int = 1080, line_breaking: str = LINE_BREAKING_GREEDY, rich_text_tokens: HudRichTextTokens = None, incremental_layout: HudIncrementalLayout = None) -> tuple[HudRichText]:
+    """Layout a string of text inside the given dimensions, reusing earlier layouts of the same text and font that have the same line breaks for this width"""
+    font_key = get_paint_font_key(paint)
+    key = (text, width, font_key, line_breaking)
+    range_key = (text, font_key, line_breaking)
+    rich_text = rich_text_layout_cache.get(key, range_key, width)
+    if rich_text is None:
+        width_range = create_width_range()
+        if incremental_layout is None:
+            rich_text = tuple(calculate_rich_text_layout(paint, text, width, height, line_breaking, rich_text_tokens, width_range))
+        else:
+            rich_text = calculate_incremental_rich_text_layout(paint, text, width, height, line_breaking, rich_text_tokens, incremental_layout, width_range)
+        rich_text_layout_cache.put(key, rich_text, get_layout_size(key, rich_text), range_key, width_range)
+    
+    # Keep the paint in the same state as after a layout calculation
+    paint.font.embolden = False
+    return rich_text
+
+def calculate_rich_text_layout(paint:skia.Paint, text:str, width:int = 1920, height:int = 1080, line_breaking: str = LINE_BREAKING_GREEDY, rich_text_tokens: HudRichTextTokens = None, width_range: list = None) -> list[HudRichTextLine]:
+    """Layout a string of text inside the given dimensions, narrowing down the given width range to the widths that result in the same layout"""
+    lines = get_rich_text_token_lines(get_rich_text_tokens(text, rich_text_tokens))
+    e_text_bounds = text_measurements.measure_text(paint, "E")
+    space_text_bounds = text_measurements.measure_text(paint, "E E")
     space_text_bounds.width -= e_text_bounds.width * 2
     
-    lines = text.splitlines()
+    if line_breaking == LINE_BREAKING_MINIMUM_RAGGEDNESS:
+        # The balance of every line depends on the exact width
+        if width_range is not None:
+            intersect_width_ranges(width_range, create_width_range(width))
+        return calculate_minimum_raggedness_layout(paint, lines, width, space_text_bounds)
+    
+    # The widths at which any of the decisions to break a line would turn out differently
+    fitting_width = 0.0
+    unsplit_word_width = -1.0
+    breaking_width = math.inf
+    split_words = False
+    
     final_lines = []
     
     styles = []
-    for line_index, line in enumerate(lines):        
-        current_char_index = 0
-        char_indexes = {}
-        
-        tokened_line = re.split(rich_text_delims_regex, line)
-        tokened_line = [x for x in tokened_line if x != ""]
-            
+    for tokened_line in lines:
         x = 0
         
         # Edge case - Empty newline
         if len(tokened_line) == 0:
-            final_lines.append(HudRichText(x, space_text_bounds.y, space_text_bounds.width, space_text_bounds.height, [], " "))
+            final_lines.append(HudRichText(x, space_text_bounds.y, space_text_bounds.width, space_text_bounds.height, (), " "))
             continue
         
         words_to_use = []
-        current_line_bounds = None
-        for token in tokened_line:
-            if token in rich_text_delims:                
+        measured_words = False
+        for kind, token in tokened_line:
+            if kind != RICH_TEXT_TOKEN_TEXT:
                 # Finish the current words if there are any
-                if current_line_bounds != None and len(words_to_use) > 0:
+                if measured_words and len(words_to_use) > 0:
                     current_line_bounds = calculate_words_bounds(words_to_use, paint, space_text_bounds)
-                    final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, styles.copy(), " ".join(words_to_use)))                
+                    final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, tuple(styles), " ".join(words_to_use)))                
                     x = x + current_line_bounds.width
-                    current_line_bounds.y = current_line_bounds.y
                     current_line_bounds.width = 0
                     current_line_bounds.height = 0
                 words_to_use = []
-                if token == "/>":
+                if kind == RICH_TEXT_TOKEN_STYLE_END:
                     if len(styles) > 0:
                         styles.pop()
                         
@@ -100,119 +180,341 @@ def layout_rich_text(paint:skia.Paint, text:str, width:int = 1920, height:int =
                         paint.font.embolden = False
                 else:
                     # Bold the text for the proper height measurements
-                    if rich_text_delims_dict[token] == "bold":                        
+                    if token == "bold":                        
                         paint.font.embolden = True
-                    styles.append(rich_text_delims_dict[token])
+                    styles.append(token)
                 
             # Add text
             else:
-                words = token.split(" ")
+                # The width of the current words is kept up to date word by word,
+                # So deciding on a break does not require measuring the whole line again
                 current_words = []
-                amount_of_words = len(words)
-                for index, word in enumerate(words):
+                line_measurement = HudLineMeasurement(text_measurements, paint, space_text_bounds)
+                for word in token.split(" "):
+                    previous_line_state = line_measurement.get_state()
                     current_words.append(word)
+                    line_measurement.add(word)
+                    measured_words = True
                     
-                    # Edge case - string starts with a space
-                    if word == "" and len(current_words) == 0:
-                        current_line_bounds = space_text_bounds
-                        word_bounds = space_text_bounds
-                    else:
-                        _, word_bounds = paint.measure_text(word)
-                        current_line_bounds = calculate_words_bounds(current_words, paint, space_text_bounds)
-                    
-                    if x + current_line_bounds.width > width:
+                    line_width = x + line_measurement.get_width()
+                    if line_width > width:
+                        if line_width < breaking_width:
+                            breaking_width = line_width
                         current_words.pop()
-                        current_line_bounds = calculate_words_bounds(current_words, paint, space_text_bounds)
-                        final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, styles.copy(), " ".join(words_to_use)))
+                        line_measurement.set_state(previous_line_state)
+                        current_line_bounds = line_measurement.get_bounds()
+                        final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, tuple(styles), " ".join(words_to_use)))
                         x = 0
-                        y = 0
                         
-                        if word_bounds.width < width:
-                            current_words = [word]
-                            words_to_use = [word]
+                        word_bounds = text_measurements.measure_text(paint, word)
+                        if word_bounds.width >= width:
+                            # Edgecase - Single word that exceeds the width - Split it into parts that fit on a line
+                            split_words = True
+                            wrapped_words = split_overlong_word(paint, word, width)
+                            for wrapped_word in wrapped_words[:-1]:
+                                wrapped_word_bounds = text_measurements.measure_text(paint, wrapped_word)
+                                final_lines.append(HudRichText(x, wrapped_word_bounds.y, wrapped_word_bounds.width, wrapped_word_bounds.height, tuple(styles), wrapped_word))
+                            word = wrapped_words[-1]
                             
-                        # Edgecase - Single word that exceeds the width - Split according to rough estimate or character width
-                        else:
-                            word_length = len(word)
-                            split_ratio = width / word_bounds.width
-                            wrapped_words = wrap(word, max(1, int(math.floor(word_length * split_ratio))))
-                            for index, wrapped_word in enumerate(wrapped_words):
-                                _, wrapped_word_bounds = paint.measure_text(wrapped_word)                            
-                                if index < len(wrapped_words) - 1:
-                                    final_lines.append(HudRichText(x, wrapped_word_bounds.y, wrapped_word_bounds.width, wrapped_word_bounds.height, styles.copy(), wrapped_word))
-                                else:
-                                    current_line_bounds = wrapped_word_bounds
-                                    words_to_use = [wrapped_word]
+                        elif word_bounds.width > unsplit_word_width:
+                            unsplit_word_width = word_bounds.width
                             
+                        current_words = [word]
+                        words_to_use = [word]
+                        line_measurement.clear()
+                        line_measurement.add(word)
                     else:
+                        if line_width > fitting_width:
+                            fitting_width = line_width
                         words_to_use.append(word)
                     
         if len(words_to_use) > 0:
             current_line_bounds = calculate_words_bounds(words_to_use, paint, space_text_bounds)
         
-            final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, styles.copy(), " ".join(words_to_use)))            
+            final_lines.append(HudRichText(x, current_line_bounds.y, current_line_bounds.width, current_line_bounds.height, tuple(styles), " ".join(words_to_use)))            
+    
+    # The parts of split words depend on the exact width
+    if width_range is not None:
+        intersect_width_ranges(width_range, create_width_range(width) if split_words else [fitting_width, unsplit_word_width, breaking_width])
     
     paint.font.embolden = False
     return final_lines
 
-def md_to_richtext_content(md_string: str):
-    sanitized_content = sanitize_md_from_unsupported_tags(md_string)
+def calculate_incremental_rich_text_layout(paint:skia.Paint, text:str, width:int, height:int, line_breaking: str, rich_text_tokens: HudRichTextTokens, incremental_layout: HudIncrementalLayout, width_range: list = None) -> tuple[HudRichText]:
+    """Layout a string of text, reusing the layout of the chunks of the previous text that the text starts with"""
+    key = (get_paint_font_key(paint), line_breaking)
+    if incremental_layout.key != key:
+        incremental_layout.clear(key)
+    
+    # Chunks are made up of the text, the amount of tokens, the layout, the amount of lines in the layout and the width range up to and including the chunk
+    chunks = incremental_layout.chunks
+    chunk_index = 0
+    text_index = 0
+    token_index = 0
+    while chunk_index < len(chunks) and text.startswith(chunks[chunk_index][0], text_index) and is_width_in_range(width, chunks[chunk_index][4]):
+        # Edge case - A carriage return followed by a newline is a single line break
+        chunk_end_index = text_index + len(chunks[chunk_index][0])
+        if text[chunk_end_index - 1] == "\r" and text.startswith("\n", chunk_end_index):
+            break
     
-    # Marks to be translated to the internal rich text delimiters
-    mark_voice_command = "-MARK-VOICE-COMMAND-"
-    mark_italic = "-MARK-ITALIC-"
-    mark_italic_u = "-MARK-U-ITALIC-"    
-    mark_emphasis = "-MARK-EMPHASIS-"
-    mark_emphasis_u = "-MARK-U-EMPHASIS-"
-    mark_error = "-MARK-ERROR-"
+        text_index = chunk_end_index
+        token_index += chunks[chunk_index][1]
+        chunk_index += 1
+    del chunks[chunk_index:]
+    
+    # Only the text after the reused chunks needs to be tokenized
+    if rich_text_tokens is None or rich_text_tokens.text != text:
+        rich_text_tokens = tokenize_rich_text(text[text_index:])
+        tokens = rich_text_tokens.tokens
+    else:
+        tokens = rich_text_tokens.tokens[token_index:]
+    
+    # Find the last line break where no style is active, as the layout up to it does not depend on the text after it
+    stable_text_index = text_index
+    stable_token_index = 0
+    current_text_index = text_index
+    style_depth = 0
+    for current_token_index, (kind, value) in enumerate(tokens):
+        if kind == RICH_TEXT_TOKEN_STYLE_START:
+            current_text_index += len(rich_text_style_delims[value])
+            style_depth += 1
+        elif kind == RICH_TEXT_TOKEN_STYLE_END:
+            current_text_index += 2
+            style_depth = max(0, style_depth - 1)
+        else:
+            current_text_index += len(value)
+            if kind == RICH_TEXT_TOKEN_LINE_END and style_depth == 0:
+                stable_text_index = current_text_index
+                stable_token_index = current_token_index + 1
+    
+    recomputed_line_count = 0
+    if stable_token_index > 0:
+        chunk_text = text[text_index:stable_text_index]
+        chunk_tokens = HudRichTextTokens(chunk_text, tokens[:stable_token_index])
+        # The width range of a chunk includes the ranges of the chunks before it, as those have to be reused for it to be reused
+        chunk_width_range = list(chunks[-1][4]) if len(chunks) > 0 else create_width_range()
+        chunk_layout = calculate_rich_text_layout(paint, chunk_text, width, height, line_breaking, chunk_tokens, chunk_width_range)
+        chunk_line_count = count_rich_text_lines(chunk_layout)
+        chunks.append((chunk_text, stable_token_index, chunk_layout, chunk_line_count, chunk_width_range))
+        recomputed_line_count += chunk_line_count
+    
+    remaining_text = text[stable_text_index:]
+    remaining_tokens = HudRichTextTokens(remaining_text, tokens[stable_token_index:])
+    remaining_layout = calculate_rich_text_layout(paint, remaining_text, width, height, line_breaking, remaining_tokens, width_range)
+    recomputed_line_count += count_rich_text_lines(remaining_layout)
+    
+    rich_text = []
+    for chunk in chunks:
+        rich_text.extend(chunk[2])
+    rich_text.extend(remaining_layout)
+    if width_range is not None and len(chunks) > 0:
+        intersect_width_ranges(width_range, chunks[-1][4])
+    
+    reused_line_count = sum([chunk[3] for chunk in chunks[:chunk_index]])
+    incremental_layout.reused_line_count = reused_line_count
+    incremental_layout.recomputed_line_count = recomputed_line_count
+    rich_text_layout_cache.record_incremental_layout(reused_line_count, recomputed_line_count)
+    return tuple(rich_text)
+
+def count_rich_text_lines(rich_text: list[HudRichText]) -> int:
+    """Count the lines in a layout, where every line starts with a text at the left"""
+    return len([text for text in rich_text if text.x == 0])
+
+def split_overlong_word(paint: skia.Paint, word: str, width: int) -> list[str]:
+    """Split a word into the longest character prefixes that fit inside the width, found using a binary search"""
+    wrapped_words = []
+    while len(word) > 0:
+        # Every part contains at least a single character to always make progress
+        low = 1
+        high = len(word)
+        while low < high:
+            middle = (low + high + 1) // 2
+            _, prefix_bounds = paint.measure_text(word[:middle])
+            if prefix_bounds.width <= width:
+                low = middle
+            else:
+                high = middle - 1
+        wrapped_words.append(word[:low])
+        word = word[low:]
+    return wrapped_words
+
+def calculate_minimum_raggedness_layout(paint:skia.Paint, lines: list[list[tuple[int, str]]], width:int, space_text_bounds: ui.Rect) -> list[HudRichTextLine]:
+    """Layout a string of text where the lines of every paragraph are balanced, rather than filling every line as far as possible
+    The squared space left over at the end of every line but the last line of a paragraph is kept as low as possible
+    """
+    final_lines = []
     
-    # Escaped marks
-    escaped_backtick = "-ESCAPED-BACKTICK-"
-    escaped_star = "-ESCAPED-STAR-"
-    escaped_underscore = "-ESCAPED-UNDERSCORE-"
+    styles = []
+    for tokened_line in lines:
+        # Edge case - Empty newline
+        if len(tokened_line) == 0:
+            final_lines.append(HudRichText(0, space_text_bounds.y, space_text_bounds.width, space_text_bounds.height, (), " "))
+            continue
+        
+        # Gather the words of the paragraph with their styles and the width they add to a line
+        words = []
+        preceded_by_space = False
+        for kind, token in tokened_line:
+            if kind == RICH_TEXT_TOKEN_STYLE_END:
+                if len(styles) > 0:
+                    styles.pop()
+                if "bold" not in styles:
+                    paint.font.embolden = False
+            elif kind == RICH_TEXT_TOKEN_STYLE_START:
+                if token == "bold":
+                    paint.font.embolden = True
+                styles.append(token)
+            else:
+                font_measurements = text_measurements.get_font_measurements(paint)
+                space_advance = text_measurements.measure_word(paint, " ", font_measurements)[0]
+                for index, word in enumerate(token.split(" ")):
+                    preceded_by_space = preceded_by_space or index > 0
+                    if word == "":
+                        continue
+                    
+                    advance, left, _, right, _ = text_measurements.measure_word(paint, word, font_measurements)
+                    wrapped_words = [word] if right - left < width else split_overlong_word(paint, word, width)
+                    for wrapped_index, wrapped_word in enumerate(wrapped_words):
+                        if len(wrapped_words) > 1:
+                            advance = text_measurements.measure_word(paint, wrapped_word, font_measurements)[0]
+                        words.append((wrapped_word, tuple(styles), preceded_by_space and wrapped_index == 0, advance, space_advance))
+                    preceded_by_space = False
+        
+        if len(words) == 0:
+            final_lines.append(HudRichText(0, space_text_bounds.y, space_text_bounds.width, space_text_bounds.height, tuple(styles), " "))
+            continue
+        
+        # Prefix sums of the widths, so the width of any line of words is known in constant time
+        prefix_widths = [0]
+        for _, _, spaced, advance, space_advance in words:
+            prefix_widths.append(prefix_widths[-1] + advance + (space_advance if spaced else 0))
+        
+        # Find the cheapest breaks from the end of the paragraph to the start
+        amount_of_words = len(words)
+        costs = [0] * (amount_of_words + 1)
+        breaks = [amount_of_words] * (amount_of_words + 1)
+        for start_index in range(amount_of_words - 1, -1, -1):
+            start_offset = prefix_widths[start_index] + (words[start_index][4] if words[start_index][2] else 0)
+            best_cost = None
+            for end_index in range(start_index + 1, amount_of_words + 1):
+                line_width = prefix_widths[end_index] - start_offset
+                if line_width > width and end_index > start_index + 1:
+                    break
+                
+                line_cost = costs[end_index] + (0 if end_index == amount_of_words else (width - line_width) ** 2)
+                if best_cost is None or line_cost < best_cost:
+                    best_cost = line_cost
+                    breaks[start_index] = end_index
+            costs[start_index] = best_cost
+        
+        # Place the words of every line, grouping words of the same style together
+        start_index = 0
+        while start_index < amount_of_words:
+            end_index = breaks[start_index]
+            x = 0
+            index = start_index
+            while index < end_index:
+                word_styles = words[index][1]
+                group_words = []
+                while index < end_index and words[index][1] == word_styles:
+                    word, _, spaced, _, _ = words[index]
+                    if len(group_words) == 0:
+                        group_words = ["", word] if spaced and index > start_index else [word]
+                    elif spaced:
+                        group_words.append(word)
+                    else:
+                        group_words[-1] += word
+                    index += 1
+                
+                paint.font.embolden = "bold" in word_styles
+                group_bounds = calculate_words_bounds(group_words, paint, space_text_bounds)
+                final_lines.append(HudRichText(x, group_bounds.y, group_bounds.width, group_bounds.height, word_styles, " ".join(group_words)))
+                x += group_bounds.width
+            start_index = end_index
+        paint.font.embolden = "bold" in styles
     
-    # Keep escaped characters around
-    md_content = sanitized_content.replace("\\`", escaped_backtick).replace("\\*", escaped_star).replace("\\_", escaped_underscore)\
-        .replace(" ` ", " " + escaped_backtick + " ").replace(" * ", " " + escaped_star + " ").replace(" _ ", " " + escaped_underscore + " ")
-    content_escaped = len(md_content) != len(sanitized_content)
+    paint.font.embolden = False
+    return final_lines
+
+# Markdown marks that are turned into rich text delimiters, where longer marks take precedence over shorter ones
+# Backslashes escape a mark, so the character is kept as is
+md_marks_regex = re.compile(r"\\[`*_]|```|`|!!|__|_|\*\*|\*")
+md_mark_types = {"```": "voice_command", "`": "voice_command", "!!": "error", "__": "emphasis_u", "_": "italic_u", "**": "emphasis", "*": "italic"}
+md_mark_tokens = {"voice_command": "<cmd@", "error": "<!!", "italic": "</", "italic_u": "</", "emphasis": "<*", "emphasis_u": "<*"}
+
+# Markdown files that have been turned into rich text, along with the modification time and size of the file at that moment
+md_file_cache = {}
+
+def md_file_to_richtext_content(filename: str) -> str:
+    """Read a markdown file and turn it into rich text, reusing the earlier result if the file has not changed"""
+    file_stat = os.stat(filename)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    if filename in md_file_cache and md_file_cache[filename][0] == file_version:
+        return md_file_cache[filename][1]
+
+    with open(filename, "r") as md_file:
+        richtext_content = md_to_richtext_content(md_file.read())
+    md_file_cache[filename] = (file_version, richtext_content)
+    return richtext_content
+
+def md_to_richtext_content(md_string: str):
+    sanitized_content = sanitize_md_from_unsupported_tags(md_string)
     
-    # Replace all the MD markers
-    md_content = md_content.replace("!!", mark_error)            
-    md_content = md_content.replace("__", mark_emphasis_u).replace("**", mark_emphasis)
-    md_content = md_content.replace("_", mark_italic_u).replace("*", mark_italic)
-    md_content = md_content.replace(mark_emphasis + mark_emphasis_u, mark_emphasis + mark_italic_u)\
-    	.replace(mark_emphasis_u + mark_emphasis, mark_emphasis_u + mark_italic)            
-    md_content = md_content.replace("```", "`").replace("`", mark_voice_command)
+    # Find all the marks in a single pass, where every mark is made up of its type, its start and its end
+    parts = []
+    marks = []
+    text_index = 0
+    space_escaped_indexes = {}
+    for match in md_marks_regex.finditer(sanitized_content):
+        mark = match.group()
+        start = match.start()
+        
+        # Escaped marks, either through a backslash or by being surrounded by spaces,
+        # Where two marks sharing a single space only have the first one escaped
+        if mark[0] == "\\":
+            parts.append(sanitized_content[text_index:start] + mark[1])
+            text_index = match.end()
+            continue
+        elif len(mark) == 1:
+            if sanitized_content[start - 1:start] == " " and sanitized_content[start + 1:start + 2] == " " and \
+                space_escaped_indexes.get(mark) != start - 2:
+                space_escaped_indexes[mark] = start
+                continue
+
+        parts.append(sanitized_content[text_index:start])
+        marks.append([md_mark_types[mark], start, match.end()])
+        parts.append(marks[-1])
+        text_index = match.end()
+    parts.append(sanitized_content[text_index:])
     
-    # This is probably a highly inefficient way of replacing tokens, but it should probably be atleast consistent?
-    md_content = replace_md_content_mark(md_content, mark_voice_command, "<cmd@")
-    md_content = replace_md_content_mark(md_content, mark_error, "<!!")
-    md_content = replace_md_content_mark(md_content, mark_italic, "</")
-    md_content = replace_md_content_mark(md_content, mark_italic_u, "</")
-    md_content = replace_md_content_mark(md_content, mark_emphasis, "<*")
-    md_content = replace_md_content_mark(md_content, mark_emphasis_u, "<*")
+    # Emphasis directly followed by an underscore emphasis is read as emphasis with italic, and the other way around
+    join_adjacent_md_marks(marks, "emphasis", "emphasis_u", "italic_u")
+    join_adjacent_md_marks(marks, "emphasis_u", "emphasis", "italic")
     
-    # Only unescape the content if we have escaped
-    if content_escaped:
-        md_content = md_content.replace(escaped_backtick, "`").replace(escaped_star, "*").replace(escaped_underscore, "_")
+    # Every type of mark alternates between opening and closing its style
+    opened_marks = {}
+    for index, part in enumerate(parts):
+        if isinstance(part, list):
+            mark_type = part[0]
+            opened_marks[mark_type] = not opened_marks.get(mark_type, False)
+            parts[index] = md_mark_tokens[mark_type] if opened_marks[mark_type] else "/>"
             
-    return md_content
+    return "".join(parts)
 
-def replace_md_content_mark(md_content: str, mark_to_replace: str, token: str) -> str:
-    mark_opened = False
-    token_splits = md_content.split(mark_to_replace)
-    if len(token_splits) > 0:
-        replaced_content = token_splits[0]
-        for split_token in token_splits[1:]:
-            mark_opened = not mark_opened
-            replaced_content += ( token if mark_opened else "/>" ) + split_token
-        md_content = replaced_content
-    return md_content
+def join_adjacent_md_marks(marks: list[list], first_type: str, second_type: str, replaced_type: str):
+    """Change the type of the second mark of every pair of adjacent marks of the given types, where a mark can only be part of a single pair"""
+    index = 0
+    while index < len(marks) - 1:
+        if marks[index][0] == first_type and marks[index + 1][0] == second_type and marks[index][2] == marks[index + 1][1]:
+            marks[index + 1][0] = replaced_type
+            index += 2
+        else:
+            index += 1
 
 def sanitize_md_from_unsupported_tags(md_content: str) -> str:
     content = []
     lines = md_content.splitlines()
-    line_added = False
+    content_added = False
     
     for line in lines:
         stripped_line = line.strip()
@@ -244,23 +546,7 @@ def sanitize_md_from_unsupported_tags(md_content: str) -> str:
     return "\n".join(content)    
 
 def calculate_words_bounds(words: list[str], paint, space_text_bounds) -> ui.Rect:
-    current_words_joined = " ".join(words)
-    _, current_line_bounds = paint.measure_text(current_words_joined)            
-    
-    # Edge case - dealing with single space
-    if len(words) == 1 and words[0] == "":
-        current_line_bounds = space_text_bounds
-    else:
-        leading_spaces_count = len(current_words_joined) - len(current_words_joined.lstrip(" "))
-        trailing_spaces_count = len(current_words_joined) - len(current_words_joined.rstrip(" "))
-        extra_spaces_count = leading_spaces_count + trailing_spaces_count
-        
-        # Edge case - Spaces only
-        if len(current_words_joined.lstrip(" ")) == 0:
-            extra_spaces_count = leading_spaces_count
-        current_line_bounds.width += extra_spaces_count * space_text_bounds.width
-
-    return current_line_bounds
+    return text_measurements.measure_words(paint, words, space_text_bounds)
     
 def hex_to_ints(hex: str) -> list[int]:
     # Snippet used https://stackoverflow.com/questions/41848722/how-to-convert-hex-str-into-int-array
@@ -278,8 +564,23 @@ def lighten_hex_colour(hex: str, percent: int) -> str:
         new_hex += "0" + format(value, "x") if value <= 15 else format(value, "x")
     return new_hex
     
+# Bounded memo of the speakable forms of ad-hoc strings like widget ids and focused item names
+speakable_string_cache = {}
+speakable_string_cache_limit = 512
+
 def string_to_speakable_string(str: str) -> str:
-    return re.sub(r"([!?-_\,\.])", " ", str.lower()).strip()
+    if str in speakable_string_cache:
+        return speakable_string_cache[str]
+    
+    speakable_string = re.sub(r"([!?-_\,\.])", " ", str.lower()).strip()
+    if len(speakable_string_cache) >= speakable_string_cache_limit:
+        del speakable_string_cache[next(iter(speakable_string_cache))]
+    speakable_string_cache[str] = speakable_string
+    return speakable_string
+
+# Get the speakable form of a text, using the precomputed form made during the creation of the content if it is available
+def get_speakable_text(text: str, speakable_text: str = None) -> str:
+    return speakable_text if speakable_text is not None else string_to_speakable_string(text)
     
 def determine_screen_for_pos(pos) -> ui.Screen:
     for index, screen in enumerate(ui.screen.screens()):
@@ -303,6 +604,10 @@ def hit_test_rect(rect: ui.Rect, pos: Point2d):
     return pos.x >= rect.x and pos.x <= rect.x + rect.width \
         and pos.y >= rect.y and pos.y <= rect.y + rect.height
         
+def hit_test_rects(rect_a: ui.Rect, rect_b: ui.Rect):
+    return rect_a.x < rect_b.x + rect_b.width and rect_b.x < rect_a.x + rect_a.width \
+        and rect_a.y < rect_b.y + rect_b.height and rect_b.y < rect_a.y + rect_a.height
+        
 def hit_test_icon(icon: HudIcon, pos: Point2d):
     pos = numpy.array(pos)
     icon_pos = numpy.array(icon.pos)
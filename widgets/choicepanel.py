@@ -4,10 +4,16 @@ from ..widgets.textpanel import HeadUpTextPanel
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
 from ..utils import layout_rich_text, remove_tokens_from_rich_text, linear_gradient, hit_test_button
 from ..content.typing import HudRichTextLine, HudPanelContent, HudButton, HudIcon, HudChoice
+from ..theme import HudStyleValue
 from talon.types.point import Point2d
 
 class HeadUpChoicePanel(HeadUpTextPanel):
     preferences = HeadUpDisplayUserWidgetPreferences(type="choices", x=810, y=100, width=300, height=150, limit_x=810, limit_y=100, limit_width=300, limit_height=600, enabled=False, alignment="left", expand_direction="down", font_size=18)
+
+    style_values = HeadUpTextPanel.style_values + [
+        HudStyleValue("button_hover_text_colour", default="000000"),
+        HudStyleValue("button_text_colour", default="000000")
+    ]
     mouse_enabled = True
 
     # Top, right, bottom, left, same order as CSS padding
@@ -233,8 +239,8 @@ class HeadUpChoicePanel(HeadUpTextPanel):
         icon_button_x = base_button_x + self.image_size + self.padding[3] / 2
 
         for index, choice_layout in enumerate(layout["choice_layouts"]):
-            paint.color = self.theme.get_colour("button_hover_background", "AAAAAA") if self.choice_hovered == choice_layout["choice_index"] \
-                else self.theme.get_colour("button_background", "CCCCCC")
+            paint.color = self.style.button_hover_background if self.choice_hovered == choice_layout["choice_index"] \
+                else self.style.button_background
                 
             self.visible_indecis.append(choice_layout["choice_index"])
             button_height = self.padding[0] / 2 + choice_layout["text_height"] + self.padding[2] / 2 
@@ -244,7 +250,7 @@ class HeadUpChoicePanel(HeadUpTextPanel):
             
             if self.focused and choice_layout["choice_index"] == focused_index:
                 focus_width = 3
-                focus_colour = self.theme.get_colour("focus_colour")
+                focus_colour = self.style.focus_colour
                 paint.style = canvas.paint.Style.STROKE
                 paint.stroke_width = focus_width
                 paint.color = focus_colour
@@ -253,7 +259,7 @@ class HeadUpChoicePanel(HeadUpTextPanel):
             
             # Selected style applied
             if choice_layout["choice"].selected:
-                selected_colour = self.theme.get_colour("success_colour", "00CC00")
+                selected_colour = self.style.success_colour
                 if len(selected_colour) == 6:
                     selected_colour = selected_colour + "33"
                 paint.color = selected_colour
@@ -278,15 +284,14 @@ class HeadUpChoicePanel(HeadUpTextPanel):
                     ui.Rect(content_dimensions.x + self.padding[3], choice_layout["choice_y"] + button_height / 2 - height / 2, width, height),
                 )
             
-            paint.color = self.theme.get_colour("button_hover_text_colour", "000000") if self.choice_hovered == choice_layout["choice_index"] \
-                else self.theme.get_colour("button_text_colour", "000000")
+            paint.color = self.style.button_hover_text_colour if self.choice_hovered == choice_layout["choice_index"] \
+                else self.style.button_text_colour
             self.draw_rich_text(canvas, paint, choice_layout["rich_text"], 
                 base_button_x + self.padding[3] if not choice_icon else base_button_x + self.padding[3] + self.image_size, 
                 choice_layout["choice_y"] - self.padding[0] / 2, self.line_padding)
 
-    def draw_content_text(self, canvas, paint, layout):
-        """Draws the text, choices and confirm button"""
-        super().draw_content_text(canvas, paint, layout)
+    def draw_dynamic_content(self, canvas, paint, layout):
+        """Draws the choices and confirm button, which change with hovering, on top of the static text"""
         if self.minimized:
             return
         scale = self.theme.get_scale_for_coord(self.x, self.y)
@@ -296,13 +301,13 @@ class HeadUpChoicePanel(HeadUpTextPanel):
         if self.panel_content.choices and self.panel_content.choices.multiple:
             base_button_x = layout["rect"].x
             self.confirm_button.rect = ui.Rect(layout["confirm"]["rect"].x, layout["confirm"]["rect"].y, layout["confirm"]["rect"].width, layout["confirm"]["rect"].height )
-            paint.color = self.theme.get_colour("button_hover_background", "AAAAAA") if self.confirm_hovered else self.theme.get_colour("button_background", "CCCCCC")
+            paint.color = self.style.button_hover_background if self.confirm_hovered else self.style.button_background
             button_rect = ui.Rect(base_button_x, self.confirm_button.rect.y, layout["rect"].width, self.confirm_button.rect.height)
             canvas.draw_rrect( skia.RoundRect.from_rect(button_rect, x=10, y=10) )
 
             if self.current_focus and self.current_focus.equals("confirm"):
                 focus_width = 3
-                focus_colour = self.theme.get_colour("focus_colour")
+                focus_colour = self.style.focus_colour
                 paint.style = canvas.paint.Style.STROKE
                 paint.stroke_width = focus_width
                 paint.color = focus_colour
@@ -319,7 +324,7 @@ class HeadUpChoicePanel(HeadUpTextPanel):
                     ui.Rect(base_button_x + self.padding[3], self.confirm_button.rect.y + self.confirm_button.rect.height / 2 - height / 2, width, height),
                 )
             
-            paint.color = self.theme.get_colour("button_hover_text_colour", "000000") if self.confirm_hovered else self.theme.get_colour("button_text_colour", "000000")
+            paint.color = self.style.button_hover_text_colour if self.confirm_hovered else self.style.button_text_colour
             line_height = ( self.confirm_button.rect.height - self.padding[0] - self.padding[2] ) / layout["confirm"]["line_count"]
             self.draw_rich_text(canvas, paint, layout["confirm"]["rich_text"], 
                 base_button_x + self.padding[3] * 2 if not confirm_icon else base_button_x + self.padding[3] * 2 + self.image_size, 
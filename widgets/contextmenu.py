@@ -5,6 +5,7 @@ from ..layout_widget import LayoutWidget
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
 from ..utils import determine_screen_for_pos, layout_rich_text, hit_test_button
 from ..content.typing import HudButton
+from ..theme import HudStyleValue
 import numpy
 
 def close_widget(widget: BaseWidget):
@@ -15,6 +16,15 @@ def noop(widget: BaseWidget):
 
 class HeadUpContextMenu(LayoutWidget):
     preferences = HeadUpDisplayUserWidgetPreferences(type="context_menu", x=50, y=100, width=200, height=50, limit_x=50, limit_y=100, limit_width=300, limit_height=500, enabled=False, alignment="left", expand_direction="down", font_size=18)
+
+    style_values = LayoutWidget.style_values + [
+        HudStyleValue("context_menu_background", default="F5F5F5"),
+        HudStyleValue("button_hover_background", default="AAAAAA"),
+        HudStyleValue("button_background", default="CCCCCC"),
+        HudStyleValue("button_hover_text_colour", default="000000"),
+        HudStyleValue("button_text_colour", default="000000"),
+        HudStyleValue("context_menu_border", default="000000")
+    ]
     mouse_enabled = True
     mark_position_invalid = False
 
@@ -193,7 +203,7 @@ class HeadUpContextMenu(LayoutWidget):
         paint.style = paint.Style.FILL
         
         # Draw the background first
-        background_colour = self.theme.get_colour("context_menu_background", "F5F5F5")
+        background_colour = self.style.context_menu_background
         paint.color = background_colour
         self.draw_background(canvas, paint, dimensions["rect"])
         
@@ -209,7 +219,7 @@ class HeadUpContextMenu(LayoutWidget):
         """Draws the content buttons"""
         paint.textsize = self.font_size
         content_dimensions = dimensions["rect"]
-        focus_colour = self.theme.get_colour("focus_colour")
+        focus_colour = self.style.focus_colour
         scale = self.theme.get_scale_for_coord(self.x, self.y)
        
         base_button_x = content_dimensions.x + self.padding[3]
@@ -217,8 +227,8 @@ class HeadUpContextMenu(LayoutWidget):
         button_y = content_dimensions.y + self.padding[0]
 
         for index, button_layout in enumerate(dimensions["button_layouts"]):
-            paint.color = self.theme.get_colour("button_hover_background", "AAAAAA") if self.button_hovered == index \
-                else self.theme.get_colour("button_background", "CCCCCC")
+            paint.color = self.style.button_hover_background if self.button_hovered == index \
+                else self.style.button_background
             paint.style = paint.Style.FILL
             button_height = self.padding[0] + button_layout["text_height"] + self.padding[2]
             
@@ -252,8 +262,8 @@ class HeadUpContextMenu(LayoutWidget):
                 if button_layout["text_height"] < self.image_size:
                     button_text_y += ( self.image_size - button_layout["text_height"] ) / 2
             
-            paint.color = self.theme.get_colour("button_hover_text_colour", "000000") if self.button_hovered == index \
-                else self.theme.get_colour("button_text_colour", "000000")
+            paint.color = self.style.button_hover_text_colour if self.button_hovered == index \
+                else self.style.button_text_colour
                 
             self.draw_rich_text(canvas, paint, button_layout["rich_text"], 
                 base_button_x + self.padding[3] if not button_icon else icon_button_x + self.padding[3] / 2, 
@@ -266,7 +276,7 @@ class HeadUpContextMenu(LayoutWidget):
         rrect = skia.RoundRect.from_rect(rect, x=radius, y=radius)
         canvas.draw_rrect(rrect)
         paint.style = paint.Style.STROKE
-        paint.color = self.theme.get_colour("focus_colour") if focused else self.theme.get_colour("context_menu_border", "000000")
+        paint.color = self.style.focus_colour if focused else self.style.context_menu_border
         paint.stroke_width = 4 if focused else 1
         
         if focused:
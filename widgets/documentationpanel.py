@@ -1,5 +1,6 @@
 from ..widgets.textpanel import HeadUpTextPanel
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
+from ..utils import LINE_BREAKING_MINIMUM_RAGGEDNESS
 
 class HeadUpDocumentationPanel(HeadUpTextPanel):
     preferences = HeadUpDisplayUserWidgetPreferences(type="documentation_panel", x=50, y=50, width=400, height=300, limit_x=50, limit_y=50, limit_width=500, limit_height=700, enabled=False, alignment="left", expand_direction="down", font_size=18, subscriptions=["documentation"])
@@ -8,3 +9,6 @@ class HeadUpDocumentationPanel(HeadUpTextPanel):
     topic_types = ["text"]
     current_topics = []
     subscriptions = ["documentation"]
+    
+    # Documentation is read in full, so its lines are balanced rather than filled as far as possible
+    line_breaking = LINE_BREAKING_MINIMUM_RAGGEDNESS
@@ -5,10 +5,33 @@ import numpy
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences, ExtraPreference
 from ..utils import layout_rich_text
 from ..content.typing import HudButton, HudLogMessage
+from ..theme import HudStyleValue
 
 class HeadUpEventLogPreferences(HeadUpDisplayUserWidgetPreferences):
         extra_preferences = [ExtraPreference("ttl_duration_seconds", str, float)]
 
+class HudVisualLog:
+    """A log message as it is shown on the screen, along with its layout so it does not need to be laid out again every frame"""
+    __slots__ = ("id", "type", "message", "show_on", "ttl", "animation_tick", "animation_goal", "lines", "layout_key", "text_width", "text_height", "line_height", "height")
+
+    def __init__(self, id, type: str, message: str, show_on: float, ttl: float, animation_tick: int, animation_goal: int):
+        self.id = id
+        self.type = type
+        self.show_on = show_on
+        self.ttl = ttl
+        self.animation_tick = animation_tick
+        self.animation_goal = animation_goal
+        self.set_message(message)
+
+    def set_message(self, message: str):
+        self.message = message
+        self.lines = None
+        self.layout_key = None
+        self.text_width = 0
+        self.text_height = 0
+        self.line_height = 0
+        self.height = 0
+
 class HeadUpEventLog(BaseWidget):
 
     allowed_setup_options = ["position", "dimension", "limit", "font_size"]
@@ -45,6 +68,23 @@ class HeadUpEventLog(BaseWidget):
     
     # Special canvas for key handling
     focus_canvas = None
+
+    style_values = BaseWidget.style_values + [
+        HudStyleValue("event_log_between_margin", "int", 10),
+        HudStyleValue("event_log_horizontal_padding", "int", 8),
+        HudStyleValue("event_log_vertical_padding", "int", 4),
+        HudStyleValue("event_log_opacity", "opacity"),
+        HudStyleValue("event_log_text_opacity", "opacity", 1.0),
+        HudStyleValue("text_colour"),
+        HudStyleValue("info_colour", default="30AD9E"),
+        HudStyleValue("error_colour", default="AA0000"),
+        HudStyleValue("warning_colour", default="F75B00"),
+        HudStyleValue("success_colour", default="00CC00")
+    ]
+
+    # Background colour, maximum background opacity, text colour and maximum text opacity per log type
+    log_styles = {}
+    default_log_style = None
     
     def update_buttons(self):
         buttons = []
@@ -61,18 +101,22 @@ class HeadUpEventLog(BaseWidget):
         # Set and reset TTL on theme change
         self.set_log_ttl()
 
+    def load_theme_values(self):
+        super().load_theme_values()
+        style = self.style
+        max_text_opacity = style.event_log_text_opacity
+        self.default_log_style = (style.event_log_background, style.event_log_opacity, 
+            self.theme.get_colour("event_log_text_colour", style.text_colour), max_text_opacity)
+        self.log_styles = {
+            "event": (style.info_colour, 255, "FFFFFF", max_text_opacity),
+            "error": (style.error_colour, 255, "FFFFFF", max_text_opacity),
+            "warning": (style.warning_colour, 255, "FFFFFF", max_text_opacity),
+            "success": (style.success_colour, 255, "FFFFFF", max_text_opacity)
+        }
+
     def append_log(self, log: HudLogMessage):
         if self.soft_enabled and self.enabled and len(log.message) > 0 and not self.locked:
-            visual_log = {
-                "show_on": log.time,
-                "ttl": log.time + self.ttl_duration_seconds, 
-                "id": log.time,
-                "type": log.type, 
-                "message": log.message, 
-                "animation_tick": self.ttl_animation_max_duration if self.show_animations else 0, 
-                "animation_goal": 0
-            }
-            
+            visual_log = self.create_visual_log(log)
             if (self.expand_direction == "up"):
                 self.visual_logs.insert(0, visual_log)
             else:
@@ -83,37 +127,73 @@ class HeadUpEventLog(BaseWidget):
             if self.ttl_poller is None:
                 self.ttl_poller = cron.interval(str(int(self.ttl_animation_duration_seconds / 2 * 1000)) +"ms", self.poll_ttl_visuals)
 
+    def create_visual_log(self, log: HudLogMessage, visual_delay: float = 0) -> HudVisualLog:
+        return HudVisualLog(
+            log.id if getattr(log, "id", None) is not None else log.time,
+            log.type,
+            log.message,
+            log.time + visual_delay,
+            log.time + self.ttl_duration_seconds + visual_delay,
+            self.ttl_animation_max_duration if self.show_animations else 0,
+            0
+        )
+
+    def layout_visual_log(self, paint, visual_log: HudVisualLog, layout_key: tuple):
+        """Split up the text of a log into lines and calculate their dimensions, which only happens again when the message, font size, dimensions or theme change"""
+        lines = layout_rich_text(paint, visual_log.message, self.limit_width - self.style.event_log_horizontal_padding * 2, self.limit_height)
+        total_text_width = 0
+        total_text_height = 0
+        current_line_width = 0
+        line_count = 0
+        current_line_height = 0
+        for line in lines:
+            if line.x == 0:
+                line_count += 1
+                current_line_width = line.width
+                current_line_height = line.height
+                total_text_height += current_line_height
+            else:
+                current_line_width += line.width
+                total_text_height -= current_line_height
+                current_line_height = max(current_line_height, line.height)
+                total_text_height += current_line_height
+            total_text_width = max( total_text_width, current_line_width )
+
+        visual_log.lines = lines
+        visual_log.layout_key = layout_key
+        visual_log.text_width = total_text_width
+        visual_log.text_height = total_text_height
+        visual_log.line_height = total_text_height / line_count if line_count > 0 else 0
+        visual_log.height = self.style.event_log_vertical_padding * 2 + total_text_height
+
+    # Revise the visible logs in place, logs that are not visible yet are placed directly after the log before them in the patch
     def revise_logs(self, logs):
         if self.soft_enabled and self.enabled and len(logs) > 0:
-            for log_index, log in enumerate(logs):                
+            previous_index = -1
+            inserted_count = 0
+            for log in logs:
+                log_id = log.id if getattr(log, "id", None) is not None else log.time
                 revise_index = -1
                 for index, visual_log in enumerate(self.visual_logs):
-                    if visual_log["id"] == log.time:
+                    if visual_log.id == log_id:
                         revise_index = index
                         break
             
                 if revise_index != -1:
-                    self.visual_logs.pop(revise_index)
-                    new_logs = []
-                    for index, new_log in enumerate(logs):
-                        visual_delay = self.ttl_delayed_seconds * index
-                        
-                        visual_log = {
-                            "show_on": new_log.time + visual_delay,
-                            "ttl": new_log.time + self.ttl_duration_seconds + visual_delay, 
-                            "id": new_log.time,
-                            "type": new_log.type, 
-                            "message": new_log.message, 
-                            "animation_tick": self.ttl_animation_max_duration if self.show_animations else 0, 
-                            "animation_goal": 0
-                        }
-                        
-                        if (self.expand_direction == "up"):
-                            self.visual_logs.insert(revise_index, visual_log)
-                        else:
-                            self.visual_logs.append(visual_log)
+                    self.visual_logs[revise_index].set_message(log.message)
+                    previous_index = revise_index
+                    inserted_count = 0
+                elif previous_index != -1:
+                    if len(log.message) > 0:
+                        inserted_count += 1
+                        if self.expand_direction != "up":
+                            previous_index += 1
+                        self.visual_logs.insert(previous_index, self.create_visual_log(log, self.ttl_delayed_seconds * inserted_count))
                 else:
+                    visual_log_length = len(self.visual_logs)
                     self.append_log(log)
+                    if visual_log_length != len(self.visual_logs):
+                        previous_index = 0 if self.expand_direction == "up" else len(self.visual_logs) - 1
                 
             # Poll for TTL expiration at half the rate of the animation duration - It"s not mission critical to make the logs disappear at exactly the right time
             if self.ttl_poller is None:
@@ -147,10 +227,10 @@ class HeadUpEventLog(BaseWidget):
         # Set the TTL to all non-expired messages            
         if self.show_animations:
             for visual_log in self.visual_logs:
-                if visual_log["ttl"] - self.ttl_animation_duration_seconds > current_time and visual_log["animation_tick"] >= 0:
-                    visual_log["ttl"] = current_time + self.ttl_animation_duration_seconds
-                    visual_log["animation_tick"] = -1
-                    visual_log["animation_goal"] = -self.ttl_animation_max_duration
+                if visual_log.ttl - self.ttl_animation_duration_seconds > current_time and visual_log.animation_tick >= 0:
+                    visual_log.ttl = current_time + self.ttl_animation_duration_seconds
+                    visual_log.animation_tick = -1
+                    visual_log.animation_goal = -self.ttl_animation_max_duration
         # Just clear all the logs if not animated
         else:
             self.visual_logs = []
@@ -194,7 +274,7 @@ class HeadUpEventLog(BaseWidget):
         
         self.ttl_duration_seconds = self.ttl_duration_seconds if self.ttl_duration_seconds != -1 else self.infinite_ttl
         for visual_log in self.visual_logs:
-            visual_log["ttl"] = visual_log["ttl"] - previous_duration + self.ttl_duration_seconds
+            visual_log.ttl = visual_log.ttl - previous_duration + self.ttl_duration_seconds
         
         if self.ttl_duration_seconds != self.infinite_ttl and self.locked:
             self.locked = False
@@ -210,13 +290,13 @@ class HeadUpEventLog(BaseWidget):
         
         resume_canvas = self.visual_log_length != len(self.visual_logs)
         for visual_log in self.visual_logs:
-            if self.show_animations and visual_log["ttl"] - self.ttl_animation_duration_seconds <= current_time and visual_log["animation_tick"] >= 0:
-                visual_log["animation_tick"] = -1
-                visual_log["animation_goal"] = -self.ttl_animation_max_duration
+            if self.show_animations and visual_log.ttl - self.ttl_animation_duration_seconds <= current_time and visual_log.animation_tick >= 0:
+                visual_log.animation_tick = -1
+                visual_log.animation_goal = -self.ttl_animation_max_duration
                 resume_canvas = True
         
         # Clear the logs marked for deletion
-        self.visual_logs = [visual_log for visual_log in self.visual_logs if visual_log["ttl"] > current_time ]
+        self.visual_logs = [visual_log for visual_log in self.visual_logs if visual_log.ttl > current_time ]
 
         # Only start drawing when changes have been made
         if resume_canvas and self.enabled and self.visible:
@@ -232,49 +312,29 @@ class HeadUpEventLog(BaseWidget):
         paint = self.draw_setup_mode(canvas)
             
         # Clear logs that are no longer visible    
-        self.visual_logs = [visual_log for visual_log in self.visual_logs if not (visual_log["animation_tick"] < 0 and visual_log["animation_tick"] == visual_log["animation_goal"]) ]
+        self.visual_logs = [visual_log for visual_log in self.visual_logs if not (visual_log.animation_tick < 0 and visual_log.animation_tick == visual_log.animation_goal) ]
         self.visual_log_length = len(self.visual_logs)
         
         if (self.visual_log_length > 0) and self.visible:
             paint.textsize = self.font_size
             continue_drawing = False
 
-            default_background_colour = self.theme.get_colour("event_log_background", "F5F5F5")
-            background_colour = default_background_colour
-            log_margin = self.theme.get_int_value("event_log_between_margin", 10)
-            text_padding = self.theme.get_int_value("event_log_horizontal_padding", 8)
-            vertical_text_padding = self.theme.get_int_value("event_log_vertical_padding", 4)
-            log_height = 30
+            log_margin = self.style.event_log_between_margin
+            text_padding = self.style.event_log_horizontal_padding
+            vertical_text_padding = self.style.event_log_vertical_padding
+            layout_key = (self.font_size, self.limit_width, self.limit_height, text_padding, vertical_text_padding)
+            current_time = time.monotonic()
             
             current_y = self.y if self.expand_direction == "down" else self.y + self.height
             cut_off_index = 0
             for index, visual_log in enumerate(self.visual_logs):
-                if visual_log["show_on"] > time.monotonic():
+                if visual_log.show_on > current_time:
                     continue_drawing = True
                     continue
             
-                # Split up the text into lines if there are linebreaks
-                # And calculate their dimensions
-                lines = layout_rich_text(paint, visual_log["message"], self.limit_width - text_padding * 2, self.limit_height)
-                total_text_width = 0
-                total_text_height = 0
-                current_line_width = 0
-                line_count = 0
-                current_line_height = 0
-                for line in lines:
-                    if line.x == 0:
-                        line_count += 1
-                        current_line_width = line.width
-                        current_line_height = line.height
-                        total_text_height += current_line_height                        
-                    else:
-                        current_line_width += line.width
-                        total_text_height -= current_line_height
-                        current_line_height = max(current_line_height, line.height)
-                        total_text_height += current_line_height
-                    total_text_width = max( total_text_width, current_line_width )
-                
-                log_height = vertical_text_padding * 2 + total_text_height
+                if visual_log.layout_key != layout_key:
+                    self.layout_visual_log(paint, visual_log, layout_key)
+                log_height = visual_log.height
             
                 if self.expand_direction == "down":                    
                     offset = 0 if index == 0 else log_margin + log_height
@@ -282,7 +342,7 @@ class HeadUpEventLog(BaseWidget):
                     
                     # Clear visual logs that should no longer be visible
                     if current_y + log_height > self.limit_y + self.limit_height:
-                        self.visual_logs[cut_off_index]["ttl"] = time.monotonic()
+                        self.visual_logs[cut_off_index].ttl = current_time
                         cut_off_index += 1
                         continue
                 else:
@@ -291,61 +351,41 @@ class HeadUpEventLog(BaseWidget):
                     
                     # Clear the first visual logs that should no longer be visible
                     if current_y < self.limit_y:
-                        visual_log["ttl"] = time.monotonic()
+                        visual_log.ttl = current_time
                         continue
                 
-                text_width = total_text_width
+                text_width = visual_log.text_width
                 element_width = text_padding * 2 + text_width
 
                 text_x = self.x + text_padding if self.alignment == "left" else self.x + self.width - text_padding - text_width
                 element_x = text_x - text_padding
                 
                 # Fade the opacity of the message
-                opacity = 1.0 if visual_log["animation_tick"] >= 0 else 0.0
-                if (visual_log["animation_tick"] != visual_log["animation_goal"] ):
+                opacity = 1.0 if visual_log.animation_tick >= 0 else 0.0
+                if (visual_log.animation_tick != visual_log.animation_goal ):
                     continue_drawing = True
-                    if visual_log["animation_tick"] < visual_log["animation_goal"]:
-                        visual_log["animation_tick"] = visual_log["animation_tick"] + 1
+                    if visual_log.animation_tick < visual_log.animation_goal:
+                        visual_log.animation_tick = visual_log.animation_tick + 1
                     else:
-                        visual_log["animation_tick"] = visual_log["animation_tick"] - 1
-                    opacity = ( self.ttl_animation_max_duration - abs(visual_log["animation_tick"]) ) / self.ttl_animation_max_duration
+                        visual_log.animation_tick = visual_log.animation_tick - 1
+                    opacity = ( self.ttl_animation_max_duration - abs(visual_log.animation_tick) ) / self.ttl_animation_max_duration
                 
-                max_opacity = self.theme.get_opacity("event_log_opacity")
-                text_colour = self.theme.get_colour("event_log_text_colour", self.theme.get_colour("text_colour") )                
-                if visual_log["type"] not in ["event", "success", "error", "warning"]:
-                    background_colour = default_background_colour
-                else:
-                    if visual_log["type"] == "event":
-                        background_colour = self.theme.get_colour("info_colour", "30AD9E")
-                    elif visual_log["type"] == "error":
-                        background_colour = self.theme.get_colour("error_colour", "AA0000")
-                    elif visual_log["type"] == "warning":
-                        background_colour = self.theme.get_colour("warning_colour", "F75B00")
-                    elif visual_log["type"] == "success":
-                        background_colour = self.theme.get_colour("success_colour", "00CC00")
-                    max_opacity = 255
-                    text_colour = "FFFFFF"
-                opacity_int = min(max_opacity, int(max_opacity * opacity))
-                opacity_hex = hex(opacity_int)[-2:] if opacity_int > 15 else "0" + hex(opacity_int)[-1:]
+                background_colour, max_opacity, text_colour, max_text_opacity = self.log_styles.get(visual_log.type, self.default_log_style)
+                opacity_hex = "%02x" % min(max_opacity, int(max_opacity * opacity))
                 
                 paint.color = background_colour + opacity_hex
                 self.draw_background(canvas, element_x, current_y, element_width, log_height, paint)
                 
-                if visual_log["type"] == "narrate":
-                    paint.color = self.theme.get_colour("focus_colour") + opacity_hex
+                if visual_log.type == "narrate":
+                    paint.color = self.style.focus_colour + opacity_hex
                     paint.style = paint.Style.STROKE
                     paint.stroke_width = 3
                     self.draw_background(canvas, element_x, current_y, element_width, log_height, paint)                
                     paint.style = paint.Style.FILL                    
                 
                 # Draw text line by line
-                max_text_opacity = self.theme.get_opacity("event_log_text_opacity", 1.0)
-                opacity_int = min(max_text_opacity, int(max_text_opacity * opacity))
-                opacity_hex = hex(opacity_int)[-2:] if opacity_int > 15 else "0" + hex(opacity_int)[-1:]
-                paint.color = text_colour + opacity_hex
-                
-                line_height = total_text_height / line_count#paint.textsize# total_text_height / len(lines)b
-                self.draw_rich_text(canvas, paint, lines, text_x, current_y + vertical_text_padding * 2, line_height )
+                paint.color = text_colour + "%02x" % min(max_text_opacity, int(max_text_opacity * opacity))
+                self.draw_rich_text(canvas, paint, visual_log.lines, text_x, current_y + vertical_text_padding * 2, visual_log.line_height )
                 
             return continue_drawing and self.visible
         else:
@@ -1,8 +1,12 @@
 from ..base_widget import BaseWidget
-from ..utils import layout_rich_text, hit_test_rect, is_light_colour, hex_to_ints
+from ..utils import layout_rich_text, hit_test_rect, hit_test_rects, is_light_colour, hex_to_ints
 from ..content.typing import HudScreenRegion, HudParticle
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
-from talon import skia, ui, cron, ctrl, canvas, settings
+from ..frame_clock import frame_clock
+from ..canvas_pool import canvas_pool
+from ..drawing_cache import HudStaticDrawing
+from ..theme import HudStyleValue
+from talon import skia, ui, cron, ctrl, canvas
 from talon.types.point import Point2d
 import time
 import numpy
@@ -51,6 +55,22 @@ class HeadUpScreenOverlay(BaseWidget):
     canvas_visibility = True
 
     preferences = HeadUpDisplayUserWidgetPreferences(type="screen_overlay", x=0, y=0, width=300, height=30, font_size=12, enabled=True, alignment="center", expand_direction="down", sleep_enabled=False)
+
+    style_values = BaseWidget.style_values + [
+        HudStyleValue("screen_overlay_region_horizontal_margin", "int", 10),
+        HudStyleValue("screen_overlay_region_vertical_margin", "int", 2),
+        HudStyleValue("screen_overlay_background_colour", default="F5F5F588"),
+        HudStyleValue("screen_overlay_active_background_colour", default="F5F5F5"),
+        HudStyleValue("screen_overlay_vertical_padding", "int", 4),
+        HudStyleValue("screen_overlay_horizontal_padding", "int", 4),
+        HudStyleValue("screen_overlay_text_colour", default="00000044"),
+        HudStyleValue("screen_overlay_active_text_colour", default="000000FF"),
+        HudStyleValue("screen_overlay_icon_padding", "int", 4),
+        HudStyleValue("error_colour", default="AA0000"),
+        HudStyleValue("warning_colour", default="F75B00"),
+        HudStyleValue("success_colour", default="00CC00"),
+        HudStyleValue("info_colour", default="30AD9E")
+    ]
     
     # New content topic types
     topic_types = ["screen_regions", "particles"]
@@ -61,10 +81,18 @@ class HeadUpScreenOverlay(BaseWidget):
     active_regions = None
     canvases = None
     
-    particle_poller = None
+    # Above this amount of regions, all the regions of a screen are drawn on a single click-through canvas instead of a canvas per region
+    # Every region drawn on it is recorded, so only the regions that changed are drawn again
+    composite_region_threshold = 50
+    composite_canvases = None
+    region_drawings = None
+    
     particles = []
     particle_canvases = []
     
+    # Particles move along every other frame of the frame clock
+    particle_frame_interval = 2
+    
     def __init__(self, id, preferences_dict, theme, event_dispatch, subscriptions = None, current_topics = None):
         super().__init__(id, preferences_dict, theme, event_dispatch, subscriptions, current_topics)
         self.regions = []
@@ -72,6 +100,8 @@ class HeadUpScreenOverlay(BaseWidget):
         self.particles = []
         self.canvases = []
         self.particle_canvases = {}
+        self.composite_canvases = []
+        self.region_drawings = {}
     
     def refresh(self, new_content):
         if "event" in new_content and new_content["event"].topic_type == "screen_regions":
@@ -87,8 +117,7 @@ class HeadUpScreenOverlay(BaseWidget):
                     "center_y": particle_data.y,
                 }, particle_data.type))
             
-            cron.cancel(self.particle_poller)
-            self.particle_poller = cron.after("16ms", self.update_particles)            
+            frame_clock.subscribe(self.update_particles, self.particle_frame_interval)
         elif "event" in new_content and new_content["event"].topic_type == "variable" and new_content["event"].topic == "mode":
             if (new_content["event"].content == "sleep" and self.sleep_enabled == False):
                 self.soft_disable()
@@ -145,14 +174,14 @@ class HeadUpScreenOverlay(BaseWidget):
         if not self.soft_enabled:
             self.soft_enabled = True
             self.activate_mouse_tracking()
-            self.particle_poller = cron.after("16ms", self.update_particles)
+            frame_clock.subscribe(self.update_particles, self.particle_frame_interval)
 
     def soft_disable(self):
         self.clear_canvases()
+        self.clear_composite_canvases()
         if self.soft_enabled:
             self.particles = []
-            cron.cancel(self.particle_poller)
-            self.particle_poller = None
+            frame_clock.unsubscribe(self.update_particles)
             self.update_particles()
             self.soft_enabled = False
             cron.cancel(self.mouse_poller)
@@ -160,7 +189,8 @@ class HeadUpScreenOverlay(BaseWidget):
             self.regions = []
             self.active_regions = []
 
-    def update_particles(self):        
+    def update_particles(self) -> bool:
+        """Moves the particles along by a frame, returning whether any particles are left to animate"""
         # Determine the required canvas grid based on 400x400 chunks
         chunk_size = 500
         needed_chunks = {}
@@ -183,36 +213,40 @@ class HeadUpScreenOverlay(BaseWidget):
         for chunk_key in chunks:
             if chunk_key not in self.particle_canvases or self.particle_canvases[chunk_key] is None:
                 chunk_data = needed_chunks[chunk_key]
-                particle_canvas = canvas.Canvas(chunk_data[0], chunk_data[1], chunk_data[2], chunk_data[3])
-                particle_canvas.allows_capture = settings.get("user.talon_hud_allows_capture")
+                particle_canvas = canvas_pool.acquire(ui.Rect(chunk_data[0], chunk_data[1], chunk_data[2], chunk_data[3]), self.generate_canvas)
                 particle_canvas.register('draw', self.draw_particles)
                 self.particle_canvases[chunk_key] = particle_canvas
 
-        cron.cancel(self.particle_poller)
         if len(self.particles) > 0:
             for chunk_key in self.particle_canvases:
                 if self.particle_canvases[chunk_key] is not None:
                     self.particle_canvases[chunk_key].freeze()
-            self.particle_poller = cron.after("32ms", self.update_particles)
+            return True
         # Clear all the particle canvases if no particles remain
         else:
             for chunk_key in self.particle_canvases:
                 if self.particle_canvases[chunk_key] is not None:
                     self.particle_canvases[chunk_key].unregister('draw', self.draw_particles)
-                    self.particle_canvases[chunk_key].close()                    
+                    canvas_pool.release(self.particle_canvases[chunk_key])
                     self.particle_canvases[chunk_key] = None
-            self.particle_poller = None
+            return False
 
     def update_regions(self):
-        self.active_regions = []
         if not self.enabled:
+            self.active_regions = []
             self.regions = self.content.get_topic("screen_regions")
             return
         
+        regions = self.content.get_topic("screen_regions")
+        if regions is not None and len(regions) > self.composite_region_threshold:
+            self.update_composited_regions(regions)
+            return
+        
+        self.clear_composite_canvases()
+        self.active_regions = []
         soft_enable = False
         indices_to_clear = []
         region_indices_used = []
-        regions = self.content.get_topic("screen_regions")
         
         if regions is not None:
             new_regions = regions
@@ -236,12 +270,7 @@ class HeadUpScreenOverlay(BaseWidget):
                 
                 if region_found == False:
                     indices_to_clear.append(index)
-                    canvas_reference["canvas"].unregister("draw", canvas_reference["callback"])
-                    canvas_reference["callback"] = None
-                    canvas_reference["canvas"].close()
-                    canvas_reference["region"] = None
-                    canvas_reference["canvas"] = None
-                    canvas_reference = None
+                    self.release_canvas_reference(canvas_reference)
             
             soft_enable = ( self.regions != new_regions or not self.soft_enabled ) and len(new_regions) > 0
             self.regions = new_regions
@@ -267,30 +296,95 @@ class HeadUpScreenOverlay(BaseWidget):
         for index, region in enumerate(self.regions):
             if index not in region_indices_used:
                 canvas_rect = self.align_region_canvas_rect(region)
-                canvas_reference = {"canvas": self.generate_canvas(canvas_rect.x, canvas_rect.y, canvas_rect.width, canvas_rect.height)}
+                canvas_reference = {"canvas": canvas_pool.acquire(canvas_rect, self.generate_canvas, self.canvas_visibility)}
                 canvas_reference["callback"] = lambda canvas, self=self, region=region: self.draw_region(canvas, region)
                 canvas_reference["region"] = region
                 canvas_reference["canvas"].register("draw", canvas_reference["callback"])
-                if not self.canvas_visibility:
-                    canvas_reference["canvas"].hide()
                 canvas_reference["canvas"].freeze()
                 self.canvases.append(canvas_reference)
 
+    # Hide the canvas of a region that is no longer shown, so it can be reused by the next region that is shown
+    def release_canvas_reference(self, canvas_reference):
+        canvas_reference["canvas"].unregister("draw", canvas_reference["callback"])
+        canvas_pool.release(canvas_reference["canvas"])
+        canvas_reference["callback"] = None
+        canvas_reference["region"] = None
+        canvas_reference["canvas"] = None
+
     def clear_canvases(self):
         for canvas_reference in self.canvases:
             if canvas_reference:
-                canvas_reference["canvas"].unregister("draw", canvas_reference["callback"])
-                canvas_reference["callback"] = None
-                canvas_reference["canvas"].close()
-                canvas_reference["region"] = None
-                canvas_reference["canvas"] = None
-                canvas_reference = None
+                self.release_canvas_reference(canvas_reference)
         self.canvases = []
         
+    def update_composited_regions(self, regions):
+        self.clear_canvases()
+        soft_enable = self.regions != regions or not self.soft_enabled
+        self.regions = regions
+        if soft_enable:
+            self.soft_enable()
+
+        if not self.composite_canvases:
+            for screen in ui.screens():
+                composite = {"rect": screen.rect, "regions": [], "region_keys": set()}
+                composite["canvas"] = canvas_pool.acquire(screen.rect, self.generate_canvas, self.canvas_visibility)
+                composite["canvas"].blocks_mouse = False
+                composite["callback"] = lambda canvas, self=self, composite=composite: self.draw_composited_regions(canvas, composite)
+                composite["canvas"].register("draw", composite["callback"])
+                self.composite_canvases.append(composite)
+
+        # Keep the recorded drawings of the regions that are still shown
+        region_drawings = {}
+        for region in regions:
+            region_key = self.get_region_key(region)
+            region_drawings[region_key] = self.region_drawings[region_key] if region_key in self.region_drawings else HudStaticDrawing()
+        self.region_drawings = region_drawings
+
+        # Only draw the screens again whose regions have changed
+        for composite in self.composite_canvases:
+            screen_regions = [(self.get_region_key(region), region) for region in regions
+                if region.rect is not None and hit_test_rects(composite["rect"], self.align_region_canvas_rect(region))]
+            region_keys = set([region_key for region_key, _ in screen_regions])
+            damaged = region_keys != composite["region_keys"]
+            composite["regions"] = screen_regions
+            composite["region_keys"] = region_keys
+            if damaged:
+                composite["canvas"].freeze()
+
+        self.activate_mouse_tracking()
+        self.determine_active_regions(ctrl.mouse_pos())
+
+    def clear_composite_canvases(self):
+        for composite in self.composite_canvases:
+            composite["canvas"].unregister("draw", composite["callback"])
+            canvas_pool.release(composite["canvas"])
+            composite["canvas"] = None
+            composite["callback"] = None
+        self.composite_canvases = []
+        self.region_drawings = {}
+
+    # Draw the composited regions again, recording them again as well if their looks have changed
+    def freeze_composite_canvases(self, clear_drawings = False):
+        if clear_drawings:
+            for region_drawing in self.region_drawings.values():
+                region_drawing.clear()
+        for composite in self.composite_canvases:
+            composite["canvas"].freeze()
+
+    def get_region_key(self, region) -> tuple:
+        rect = None if region.rect is None else (region.rect.x, region.rect.y, region.rect.width, region.rect.height)
+        return (region.topic, region.title, region.icon, region.colour, region.text_colour, region.hover_visibility, region.vertical_centered, rect)
+
+    def draw_composited_regions(self, canvas, composite):
+        active_region_keys = set([self.get_region_key(region) for region in self.active_regions])
+        for region_key, region in composite["regions"]:
+            self.region_drawings[region_key].draw(canvas, self.align_region_canvas_rect(region), (region_key in active_region_keys, self.soft_enabled),
+                lambda canvas, paint, region=region: self.draw_region(canvas, region))
+
     def align_region_canvas_rect(self, region):
         if region.rect:
-            horizontal_margin = self.theme.get_int_value("screen_overlay_region_horizontal_margin", 10)
-            vertical_margin = self.theme.get_int_value("screen_overlay_region_vertical_margin", 2)
+            horizontal_margin = self.style.screen_overlay_region_horizontal_margin
+            vertical_margin = self.style.screen_overlay_region_vertical_margin
         
             y = region.rect.y    
             if self.expand_direction == "up":
@@ -356,6 +450,13 @@ class HeadUpScreenOverlay(BaseWidget):
                         active_regions.append(region)
                         
         if self.active_regions != active_regions:
+            # Only the screens with regions that became active or inactive need to be drawn again
+            if self.composite_canvases and self.canvas_visibility:
+                changed_region_keys = set([self.get_region_key(region) for region in self.active_regions]) ^ set([self.get_region_key(region) for region in active_regions])
+                for composite in self.composite_canvases:
+                    if not composite["region_keys"].isdisjoint(changed_region_keys):
+                        composite["canvas"].freeze()
+
             self.active_regions = active_regions
             for canvas_reference in self.canvases:
                 if self.canvas_visibility:
@@ -367,11 +468,11 @@ class HeadUpScreenOverlay(BaseWidget):
         if self.soft_enabled:
             active = setup_region or region in self.active_regions
             
-            background_colour = region.colour if active else self.theme.get_colour("screen_overlay_background_colour", "F5F5F588")
-            paint.color = background_colour if background_colour else self.theme.get_colour("screen_overlay_active_background_colour", "F5F5F5")
+            background_colour = region.colour if active else self.style.screen_overlay_background_colour
+            paint.color = background_colour if background_colour else self.style.screen_overlay_active_background_colour
             
-            vertical_padding = self.theme.get_int_value("screen_overlay_vertical_padding", 4)
-            horizontal_padding = self.theme.get_int_value("screen_overlay_horizontal_padding", 4)
+            vertical_padding = self.style.screen_overlay_vertical_padding
+            horizontal_padding = self.style.screen_overlay_horizontal_padding
             icon_size = self.height if region.icon or region.colour and not region.title else 0
             text_width = 0
 
@@ -419,9 +520,9 @@ class HeadUpScreenOverlay(BaseWidget):
             
             # Finally draw the text on top
             if region.title:
-                text_colour = region.text_colour if active else self.theme.get_colour("screen_overlay_text_colour", "00000044")
+                text_colour = region.text_colour if active else self.style.screen_overlay_text_colour
                 if not text_colour:
-                    text_colour = self.theme.get_colour("screen_overlay_text_colour", "00000044") if not active else self.theme.get_colour("screen_overlay_active_text_colour", "000000FF")
+                    text_colour = self.style.screen_overlay_text_colour if not active else self.style.screen_overlay_active_text_colour
                 
                 # Draw the background colour of the text
                 text_colour_ints = hex_to_ints(text_colour)
@@ -445,7 +546,7 @@ class HeadUpScreenOverlay(BaseWidget):
         
         image, image_scale = self.theme.get_image_and_scale(region.icon, scale)
         if (region.icon is not None and image is not None ):
-            icon_border = self.theme.get_int_value("screen_overlay_icon_padding", 4)
+            icon_border = self.style.screen_overlay_icon_padding
             width, height = self.theme.get_dimensions(image, image_scale, diameter - icon_border, diameter - icon_border)
             canvas.draw_image_rect(
                 image,
@@ -456,10 +557,10 @@ class HeadUpScreenOverlay(BaseWidget):
     def draw_rich_text(self, canvas, paint, rich_text, x, y, line_padding, single_line=False):
         # Draw text line by line
         text_colour = paint.color
-        error_colour = self.theme.get_colour("error_colour", "AA0000")
-        warning_colour = self.theme.get_colour("warning_colour", "F75B00")
-        success_colour = self.theme.get_colour("success_colour", "00CC00")
-        info_colour = self.theme.get_colour("info_colour", "30AD9E")
+        error_colour = self.style.error_colour
+        warning_colour = self.style.warning_colour
+        success_colour = self.style.success_colour
+        info_colour = self.style.info_colour
     
         current_line = -1
         for index, text in enumerate(rich_text):
@@ -545,12 +646,14 @@ class HeadUpScreenOverlay(BaseWidget):
                     canvas_rect = self.align_region_canvas_rect(canvas_reference["region"])
                     canvas_reference["canvas"].rect = canvas_rect
                     canvas_reference["canvas"].freeze()
+                self.freeze_composite_canvases(True)
                     
         elif setup_type == "reload":
             self.drag_position = []  
             self.setup_type = ""
             for canvas_reference in self.canvases:
                 canvas_reference["canvas"].freeze()
+            self.freeze_composite_canvases(True)
                 
         # Start the setup by mocking a full screen screen region to place the canvas in
         else:
@@ -580,6 +683,7 @@ class HeadUpScreenOverlay(BaseWidget):
                 canvas_rect = self.align_region_canvas_rect(canvas_reference["region"])
                 canvas_reference["canvas"].rect = canvas_rect            
                 canvas_reference["canvas"].freeze()
+            self.freeze_composite_canvases(True)
 
     def setup_draw_cycle(self, canvas):
         """Drawing cycle that mimics a screen region set up"""
@@ -601,6 +705,7 @@ class HeadUpScreenOverlay(BaseWidget):
                 canvas_rect = self.align_region_canvas_rect(canvas_reference["region"])
                 canvas_reference["canvas"].move(canvas_rect.x, canvas_rect.y)
                 canvas_reference["canvas"].freeze()
+            self.freeze_composite_canvases(True)
         
         if persisted:
             self.preferences.mark_changed = True
@@ -616,6 +721,7 @@ class HeadUpScreenOverlay(BaseWidget):
             self.animation_tick = self.animation_max_duration if self.show_animations else 0
             for canvas_reference in self.canvases:
                 canvas_reference["canvas"].freeze()
+            self.freeze_composite_canvases(True)
 
     def generate_accessible_nodes(self, parent):
         parent = self.generate_accessible_context(parent)
@@ -636,8 +742,12 @@ class HeadUpScreenOverlay(BaseWidget):
                     self.canvas.show()
                 for canvas_reference in self.canvases:
                     canvas_reference["canvas"].show()
+                for composite in self.composite_canvases:
+                    composite["canvas"].show()
             else:
                 if self.canvas:
                     self.canvas.hide()
                 for canvas_reference in self.canvases:
                     canvas_reference["canvas"].hide()
+                for composite in self.composite_canvases:
+                    composite["canvas"].hide()
@@ -2,6 +2,7 @@ from ..base_widget import BaseWidget
 from ..utils import linear_gradient
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
 from ..content.typing import HudButton, HudStatusOption, HudStatusIcon
+from ..theme import HudStyleValue
 from talon import skia, ui, Module, cron, actions
 import time
 import numpy
@@ -16,6 +17,17 @@ class HeadUpStatusBar(BaseWidget):
     # Where the status bar sits just above the time in Windows
     preferences = HeadUpDisplayUserWidgetPreferences(type="status_bar", x=1630, y=930, width=250, height=50, enabled=True, sleep_enabled=True)
 
+    style_values = BaseWidget.style_values + [
+        HudStyleValue("top_stroke_colour"),
+        HudStyleValue("down_stroke_colour"),
+        HudStyleValue("button_hover_colour"),
+        HudStyleValue("button_colour"),
+        HudStyleValue("text_colour"),
+        HudStyleValue("close_icon_hover_colour"),
+        HudStyleValue("close_icon_accent_colour"),
+        HudStyleValue("close_icon_colour")
+    ]
+
     # Difference array for colour transitions in animations
     blink_state = 0    
     blink_difference = [0, 0, 0]
@@ -114,6 +126,7 @@ class HeadUpStatusBar(BaseWidget):
             super().enable(persist)
     
     def load_theme_values(self):
+        super().load_theme_values()
         self.command_blink_colour = self.theme.get_colour_as_ints("command_blink_colour")
         self.sleep_blink_colour = self.theme.get_colour_as_ints("sleep_blink_colour")
         self.dictation_blink_colour = self.theme.get_colour_as_ints("dictation_blink_colour")
@@ -127,7 +140,7 @@ class HeadUpStatusBar(BaseWidget):
         paint.antialias = True
         self.icon_positions = []
         stroke_width = 1.5
-        focus_colour = self.theme.get_colour("focus_colour")
+        focus_colour = self.style.focus_colour
         focus_width = 4
         circle_margin = 4
         element_height = self.height - ( stroke_width * 2 )
@@ -135,7 +148,7 @@ class HeadUpStatusBar(BaseWidget):
         element_width = self.width 
         
         # Draw the background with bigger stroke than 1px
-        stroke_colours = (self.theme.get_colour("top_stroke_colour"), self.theme.get_colour("down_stroke_colour"))
+        stroke_colours = (self.style.top_stroke_colour, self.style.down_stroke_colour)
         paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height * 2, stroke_colours)
         self.draw_background(canvas, self.x, self.y, element_width, element_height + (stroke_width * 2), paint)
         focus_shader = linear_gradient(self.x, self.y, self.x, self.y + element_height * 2, (focus_colour, focus_colour))
@@ -189,8 +202,8 @@ class HeadUpStatusBar(BaseWidget):
             elif (not icon.callback or (mode == "sleep" and self.icon_hover_index != hover_index)):
                 paint.shader = background_shader
             else:
-                button_colour = self.theme.get_colour("button_hover_colour") if self.icon_hover_index == hover_index else self.theme.get_colour("button_colour")                
-                paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height, (self.theme.get_colour("button_colour"), button_colour))
+                button_colour = self.style.button_hover_colour if self.icon_hover_index == hover_index else self.style.button_colour                
+                paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height, (self.style.button_colour, button_colour))
             
             self.draw_icon(canvas, self.x + stroke_width + circle_margin + icon_offset, self.y + circle_margin, icon_diameter, paint, icon, scale)
             paint.style = paint.Style.FILL
@@ -202,7 +215,7 @@ class HeadUpStatusBar(BaseWidget):
         # Draw selected programming language
         text_value = " ".join(icon_texts)
         if len(text_value) > 0:
-            text_colour = self.theme.get_colour("text_colour")
+            text_colour = self.style.text_colour
             paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height, (text_colour, text_colour))
             paint.style = paint.Style.STROKE
             paint.textsize = self.font_size
@@ -214,8 +227,8 @@ class HeadUpStatusBar(BaseWidget):
         # Draw closing icon
         if not self.minimized:
             paint.style = paint.Style.FILL
-            close_colour = self.theme.get_colour("close_icon_hover_colour") if self.icon_hover_index == len(self.icons) else self.theme.get_colour("close_icon_accent_colour")
-            paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height, (self.theme.get_colour("close_icon_colour"), close_colour))
+            close_colour = self.style.close_icon_hover_colour if self.icon_hover_index == len(self.icons) else self.style.close_icon_accent_colour
+            paint.shader = linear_gradient(self.x, self.y, self.x, self.y + element_height, (self.style.close_icon_colour, close_colour))
             close_icon_diameter = icon_diameter / 2
             close_status_icon = HudStatusIcon("close", None, None, "Close Head up display", lambda widget, icon: actions.user.hud_disable())
             self.draw_icon(canvas, self.x + element_width - close_icon_diameter - close_icon_diameter / 2 - stroke_width, height_center - close_icon_diameter / 2, close_icon_diameter, paint, close_status_icon, scale)
@@ -1,8 +1,10 @@
 from talon import skia, ui, cron, actions, clip
-from ..layout_widget import LayoutWidget
+from ..layout_widget import LayoutWidget, LayoutPages
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
-from ..utils import layout_rich_text, remove_tokens_from_rich_text, linear_gradient, hit_test_icon
-from ..content.typing import HudRichTextLine, HudPanelContent, HudButton, HudIcon, HudAccessibleNode
+from ..utils import layout_rich_text, remove_tokens_from_rich_text, linear_gradient, hit_test_icon, LINE_BREAKING_GREEDY
+from ..layout_cache import HudIncrementalLayout
+from ..content.typing import HudRichText, HudRichTextLine, HudPanelContent, HudButton, HudIcon, HudAccessibleNode
+from ..theme import HudStyleValue
 from talon.types.point import Point2d
 
 icon_radius = 10
@@ -23,6 +25,18 @@ def minimize_toggle_widget(widget):
 
 class HeadUpTextPanel(LayoutWidget):
     preferences = HeadUpDisplayUserWidgetPreferences(type="text_box", x=1680, y=50, width=200, height=200, limit_x=1580, limit_y=50, limit_width=300, limit_height=400, enabled=False, alignment="left", expand_direction="down", font_size=18)
+
+    style_values = LayoutWidget.style_values + [
+        HudStyleValue("text_box_background", default="F5F5F5"),
+        HudStyleValue("text_colour"),
+        HudStyleValue("text_box_line", default="000000"),
+        HudStyleValue("button_hover_background", default="999999"),
+        HudStyleValue("button_background", default="CCCCCC"),
+        HudStyleValue("icon_colour", default="000000"),
+        HudStyleValue("close_icon_hover_colour"),
+        HudStyleValue("close_icon_accent_colour"),
+        HudStyleValue("close_icon_colour")
+    ]
     mouse_enabled = True
     
     # New content topic types
@@ -34,6 +48,15 @@ class HeadUpTextPanel(LayoutWidget):
     padding = [3, 20, 10, 8]
     line_padding = 6
     
+    # How the lines of the content are broken up
+    line_breaking = LINE_BREAKING_GREEDY
+    
+    # Content that grows at the end only has its new lines laid out
+    incremental_layout: HudIncrementalLayout = None
+    
+    # The last found page breaks, so switching pages does not need to go through all the content again
+    page_breaks: tuple = None
+    
     # Options given to the context menu
     default_buttons = [
         HudButton("copy_icon", "Copy contents", ui.Rect(0,0,0,0), lambda widget: widget.copy_contents())
@@ -57,7 +80,7 @@ class HeadUpTextPanel(LayoutWidget):
     animation_max_duration = 60
         
     def copy_contents(self):
-        clip.set_text(remove_tokens_from_rich_text(self.panel_content.content[0]))
+        clip.set_text(remove_tokens_from_rich_text(self.panel_content.content[0], self.panel_content.rich_text_tokens))
         actions.user.hud_add_log("event", "Copied contents to clipboard!")
     
     def update_panel(self, panel_content) -> bool:
@@ -71,6 +94,7 @@ class HeadUpTextPanel(LayoutWidget):
         super().set_preference(preference, value, persisted)
         
     def load_theme_values(self):
+        super().load_theme_values()
         self.intro_animation_start_colour = self.theme.get_colour_as_ints("intro_animation_start_colour")
         self.intro_animation_end_colour = self.theme.get_colour_as_ints("intro_animation_end_colour")
         self.blink_difference = [
@@ -136,8 +160,12 @@ class HeadUpTextPanel(LayoutWidget):
         """Calculates the width and the height of the content"""
         header_title = self.panel_content.title if self.panel_content.title != "" else self.id
         header_text = layout_rich_text(paint, header_title, self.limit_width - icon_size, self.limit_height)
-        content_text = [] if self.minimized else layout_rich_text(paint, self.panel_content.content[0], layout_width, self.limit_height)
+        if self.incremental_layout is None:
+            self.incremental_layout = HudIncrementalLayout()
+        content_text = [] if self.minimized else layout_rich_text(paint, self.panel_content.content[0], layout_width, self.limit_height, \
+            self.line_breaking, self.panel_content.rich_text_tokens, self.incremental_layout)
         
+        # Only the boundaries of the pages are determined here, the pages themselves are built when they are shown
         layout_pages = []
         
         line_count = 0
@@ -158,57 +186,28 @@ class HeadUpTextPanel(LayoutWidget):
         page_height_limit = self.limit_height - header_height * 2
         
         # We do not render content if the text box is minimized
-        current_content_height = self.font_size + self.line_padding
-        current_page_text = []
+        page_start_index = 0
         current_line_height = 0
         if not self.minimized:
-            line_count = 0
-            for index, text in enumerate(content_text):
-                line_count = line_count + 1 if text.x == 0 else line_count
-                current_line_length = current_line_length + text.width if text.x != 0 else text.width
-                total_text_width = max( total_text_width, current_line_length )
-                total_text_height = total_text_height + current_line_height if text.x == 0 else total_text_height
-                current_content_height = total_text_height + self.padding[0] + self.padding[2] + header_height
-                
-                # Recalculate current line height if we are starting a new line
-                if text.x == 0:
-                    current_line_height = max(text.height, self.font_size) + self.line_padding
-                else:
-                    current_line_height = max(current_line_height,  max(text.height, self.font_size) + self.line_padding)
-
-                if page_height_limit > current_content_height:
-                    current_page_text.append(text)
-                    
-                # We have exceeded the page height limit, append the layout and try again
-                else:
-                    width = min( self.limit_width, max(self.width, total_text_width + self.padding[1] + self.padding[3]))
-                    height = self.limit_height
-                    x = self.x if horizontal_alignment == "left" else self.limit_x + self.limit_width - width
-                    y = self.limit_y if vertical_alignment == "top" else self.limit_y + self.limit_height - height
-                    layout_pages.append({
-                        "rect": ui.Rect(x, y, width, height), 
-                        "line_count": max(1, line_count - 1),
-                        "header_text": header_text,
-                        "icon_size": icon_size,
-                        "content_text": current_page_text,
-                        "header_height": header_height,
-                        "content_height": current_content_height
-                    })
-                    
-                    # Reset the variables
-                    total_text_height = current_line_height
-                    current_page_text = [text]
-                    line_count = 1
+            page_breaks, (total_text_width, total_text_height, line_count, current_line_height) = \
+                self.find_page_breaks(content_text, page_height_limit, header_height, total_text_width, current_line_length)
+            for page_break_index, page_text_width, page_line_count, page_content_height in page_breaks:
+                width = min( self.limit_width, max(self.width, page_text_width + self.padding[1] + self.padding[3]))
+                height = self.limit_height
+                x = self.x if horizontal_alignment == "left" else self.limit_x + self.limit_width - width
+                y = self.limit_y if vertical_alignment == "top" else self.limit_y + self.limit_height - height
+                layout_pages.append([x, y, width, height, page_line_count, page_start_index, page_break_index, page_content_height])
+                page_start_index = page_break_index
                   
         # Make sure the remainder of the content gets placed on the final page
-        if len(current_page_text) > 0 or len(layout_pages) == 0:
+        if len(content_text) > page_start_index or len(layout_pages) == 0:
             
             # If we are dealing with a single line going over to the only other page
             # Just remove the footer to make up for space
             if len(layout_pages) == 1 and line_count == 1:
-                layout_pages[0]["line_count"] = layout_pages[0]["line_count"] + 1
-                layout_pages[0]["content_text"].extend(current_page_text)
-                layout_pages[0]["content_height"] += current_line_height
+                layout_pages[0][4] += 1
+                layout_pages[0][6] = len(content_text)
+                layout_pages[0][7] += current_line_height
             else: 
                 width = min( self.limit_width, max(self.width, total_text_width + self.padding[1] + self.padding[3]))
                 content_height = header_height if self.minimized else total_text_height + self.padding[0] + self.padding[2] + header_height * 2
@@ -216,31 +215,86 @@ class HeadUpTextPanel(LayoutWidget):
                 x = self.x if horizontal_alignment == "left" else self.limit_x + self.limit_width - width
                 y = self.limit_y if vertical_alignment == "top" else self.limit_y + self.limit_height - height
                 
-                layout_pages.append({
-                    "rect": ui.Rect(x, y, width, height), 
-                    "line_count": max(1, line_count + 2 ),
-                    "header_text": header_text,
-                    "icon_size": icon_size,
-                    "content_text": current_page_text,
-                    "header_height": header_height,
-                    "content_height": content_height
-                })
+                layout_pages.append([x, y, width, height, max(1, line_count + 2), page_start_index, len(content_text), content_height])
+        
+        def build_page(page_index: int) -> dict:
+            x, y, width, height, page_line_count, start_index, end_index, content_height = layout_pages[page_index]
+            return {
+                "rect": ui.Rect(x, y, width, height),
+                "line_count": page_line_count,
+                "header_text": header_text,
+                "icon_size": icon_size,
+                "content_text": content_text[start_index:end_index],
+                "header_height": header_height,
+                "content_height": content_height
+            }
+        return LayoutPages(len(layout_pages), build_page)
+    
+    def find_page_breaks(self, content_text: tuple[HudRichText], page_height_limit: int, header_height: int, total_text_width: int, current_line_length: int) -> tuple:
+        """Find the texts that start a new page along with the dimensions of the pages before them
+        The previous result is reused when neither the content nor the sizes have changed, like when switching pages"""
+        key = (page_height_limit, header_height, total_text_width, current_line_length, self.font_size, self.line_padding, self.padding[0], self.padding[2])
+        if self.page_breaks is not None and self.page_breaks[0] is content_text and self.page_breaks[1] == key:
+            return self.page_breaks[2]
+        
+        page_breaks = []
+        line_count = 0
+        total_text_height = 0
+        current_line_height = 0
+        for index, text in enumerate(content_text):
+            line_count = line_count + 1 if text.x == 0 else line_count
+            current_line_length = current_line_length + text.width if text.x != 0 else text.width
+            total_text_width = max( total_text_width, current_line_length )
+            total_text_height = total_text_height + current_line_height if text.x == 0 else total_text_height
+            current_content_height = total_text_height + self.padding[0] + self.padding[2] + header_height
+            
+            # Recalculate current line height if we are starting a new line
+            if text.x == 0:
+                current_line_height = max(text.height, self.font_size) + self.line_padding
+            else:
+                current_line_height = max(current_line_height,  max(text.height, self.font_size) + self.line_padding)
+
+            # We have exceeded the page height limit, start a new page from this text
+            if page_height_limit <= current_content_height:
+                page_breaks.append((index, total_text_width, max(1, line_count - 1), current_content_height))
                 
-        return layout_pages
+                # Reset the variables
+                total_text_height = current_line_height
+                line_count = 1
+        
+        result = (page_breaks, (total_text_width, total_text_height, line_count, current_line_height))
+        self.page_breaks = (content_text, key, result)
+        return result
     
     def draw_content(self, canvas, paint, dimensions) -> bool:
+        focus_outlined = self.focused and ( self.current_focus is None or self.current_focus.role == "widget" )
+        self.draw_static_content(canvas, dimensions["rect"], (self.minimized, focus_outlined),
+            lambda static_canvas, static_paint: self.draw_static_page(static_canvas, static_paint, dimensions, focus_outlined))
+
+        paint.textsize = self.font_size
+        paint.style = paint.Style.FILL
+        self.draw_read_contents_focus(canvas, paint, dimensions)
+        self.draw_dynamic_content(canvas, paint, dimensions)
+        if not self.minimized and len(self.layout) > 1:
+            self.draw_footer_buttons(canvas, paint, dimensions)
+        self.draw_header_buttons(canvas, paint, dimensions)
+        
+        return False
+
+    def draw_static_page(self, canvas, paint, dimensions, focus_outlined):
+        """Draws the background, header, footer and text of the page, which do not change when hovering over the panel"""
         paint.textsize = self.font_size
         
         paint.style = paint.Style.FILL
         
         # Draw the background first
-        background_colour = self.theme.get_colour("text_box_background", "F5F5F5")
+        background_colour = self.style.text_box_background
         paint.color = background_colour
         self.draw_background(canvas, paint, dimensions["rect"])
 
         focus_width = 4
-        focus_colour = self.theme.get_colour("focus_colour")
-        if self.focused and ( self.current_focus is None or self.current_focus.role == "widget" ):
+        focus_colour = self.style.focus_colour
+        if focus_outlined:
             paint.style = canvas.paint.Style.STROKE
             paint.stroke_width = focus_width + 1
             paint.color = focus_colour
@@ -249,15 +303,15 @@ class HeadUpTextPanel(LayoutWidget):
             paint.style = canvas.paint.Style.FILL
             paint.stroke_width = 1
         
-        paint.color = self.theme.get_colour("text_colour")
+        paint.color = self.style.text_colour
         self.draw_content_text(canvas, paint, dimensions)
         self.draw_header(canvas, paint, dimensions)
         if not self.minimized and len(self.layout) > 1:
             self.draw_footer(canvas, paint, dimensions)
-            self.draw_footer_buttons(canvas, paint, dimensions)        
-        self.draw_header_buttons(canvas, paint, dimensions)
         
-        return False
+    def draw_dynamic_content(self, canvas, paint, dimensions):
+        """Draws the parts of the content that change with hovering or focus, on top of the static page"""
+        pass
 
     def draw_animation(self, canvas, animation_tick):
         if self.enabled:
@@ -298,7 +352,7 @@ class HeadUpTextPanel(LayoutWidget):
         header_height = dimensions["header_height"]
         dimensions = dimensions["rect"]
         
-        paint.color = self.theme.get_colour("text_colour")
+        paint.color = self.style.text_colour
         paint.font.embolden = True
         
         x = dimensions.x + self.padding[3]
@@ -306,7 +360,7 @@ class HeadUpTextPanel(LayoutWidget):
         
         # Small divider between the content and the header
         if not self.minimized:
-            paint.color = self.theme.get_colour("text_box_line", "000000")
+            paint.color = self.style.text_box_line
             canvas.draw_rect(ui.Rect(x - self.padding[3], dimensions.y + header_height + self.padding[0] * 2, dimensions.width, 1))
 
     def draw_header_buttons(self, canvas, paint, dimensions):
@@ -321,12 +375,12 @@ class HeadUpTextPanel(LayoutWidget):
             self.icons[index].pos = icon_position
             paint.style = paint.Style.FILL
             if icon.id == "minimize":
-                hover_colour = self.theme.get_colour("button_hover_background", "999999") if self.icon_hovered == index \
-                    else self.theme.get_colour("button_background", "CCCCCC")
+                hover_colour = self.style.button_hover_background if self.icon_hovered == index \
+                    else self.style.button_background
                 paint.shader = linear_gradient(self.x, self.y, self.x, self.y + header_height, (hover_colour, hover_colour))
                 canvas.draw_circle(icon_position.x, icon_position.y, self.icon_radius, paint)
                 
-                text_colour = self.theme.get_colour("icon_colour", "000000")
+                text_colour = self.style.icon_colour
                 paint.shader = linear_gradient(self.x, self.y, self.x, self.y + header_height, (text_colour, text_colour))
         
                 if not self.minimized:
@@ -338,15 +392,15 @@ class HeadUpTextPanel(LayoutWidget):
                 
                 if self.focused and self.current_focus is not None and self.current_focus.equals("minimize_toggle"):
                     focus_width = 3
-                    focus_colour = self.theme.get_colour("focus_colour")
+                    focus_colour = self.style.focus_colour
                     paint.stroke_width = focus_width                  
                     paint.style = canvas.paint.Style.STROKE
                     paint.shader = linear_gradient(self.x, self.y, self.x, self.y + header_height, (focus_colour, focus_colour))
                     canvas.draw_circle(icon_position.x, icon_position.y, self.icon_radius, paint)
                     paint.style = canvas.paint.Style.FILL                    
             elif icon.id == "close":
-                close_colour = self.theme.get_colour("close_icon_hover_colour") if self.icon_hovered == index else self.theme.get_colour("close_icon_accent_colour")            
-                paint.shader = linear_gradient(self.x, self.y, self.x, self.y + header_height, (self.theme.get_colour("close_icon_colour"), close_colour))
+                close_colour = self.style.close_icon_hover_colour if self.icon_hovered == index else self.style.close_icon_accent_colour            
+                paint.shader = linear_gradient(self.x, self.y, self.x, self.y + header_height, (self.style.close_icon_colour, close_colour))
                 canvas.draw_circle(icon_position.x, icon_position.y, self.icon_radius, paint)
     
 
@@ -358,9 +412,9 @@ class HeadUpTextPanel(LayoutWidget):
         x = dimensions.x + self.padding[3]
         start_y = dimensions.y + dimensions.height - self.padding[0] - self.padding[2] / 2
         
-        paint.color = self.theme.get_colour("text_colour")
+        paint.color = self.style.text_colour
         canvas.draw_text(str(self.page_index + 1 ) + " of " + str(len(self.layout)), x, start_y)
-        paint.color = self.theme.get_colour("text_box_line", "000000")        
+        paint.color = self.style.text_box_line        
         canvas.draw_rect(ui.Rect(x - self.padding[3], start_y - footer_height, dimensions.width, 1))
 
     def draw_footer_buttons(self, canvas, paint, dimensions):
@@ -377,8 +431,8 @@ class HeadUpTextPanel(LayoutWidget):
             self.footer_icons[index].pos = icon_position
             paint.style = paint.Style.FILL
             
-            hover_colour = self.theme.get_colour("button_hover_background", "999999") if self.footer_icon_hovered == index \
-                else self.theme.get_colour("button_background", "CCCCCC")
+            hover_colour = self.style.button_hover_background if self.footer_icon_hovered == index \
+                else self.style.button_background
             paint.shader = linear_gradient(self.x, self.y, self.x, self.y + footer_height, ("AAAAAA", hover_colour))
             canvas.draw_circle(icon_position.x, icon_position.y, self.icon_radius, paint)
             image, image_scale = self.theme.get_image_and_scale(icon.image, scale)
@@ -392,7 +446,7 @@ class HeadUpTextPanel(LayoutWidget):
                 
             if self.focused and self.current_focus is not None and self.current_focus.equals(icon.id + "_page"):
                 focus_width = 3
-                focus_colour = self.theme.get_colour("focus_colour")
+                focus_colour = self.style.focus_colour
                 paint.style = canvas.paint.Style.STROKE
                 paint.stroke_width = focus_width
                 paint.color = focus_colour
@@ -415,14 +469,20 @@ class HeadUpTextPanel(LayoutWidget):
         
         #line_height = ( content_height - header_height - self.padding[0] - self.padding[2] ) / line_count
         self.draw_rich_text(canvas, paint, rich_text, text_x, text_y, self.line_padding)
+
+    def draw_read_contents_focus(self, canvas, paint, dimensions):
+        """Draws the focus outline around the text, which is not part of the static page as it changes with the focus"""
         if self.focused and self.current_focus is not None and self.current_focus.equals("read_contents"):
+            header_height = dimensions["header_height"]
+            dimensions = dimensions["rect"]
             focus_width = 3
-            focus_colour = self.theme.get_colour("focus_colour")
+            focus_colour = self.style.focus_colour
             paint.style = canvas.paint.Style.STROKE
             paint.stroke_width = focus_width
             paint.color = focus_colour
             canvas.draw_rect(ui.Rect(dimensions.x, dimensions.y + header_height + self.padding[0] + 4, dimensions.width, dimensions.height - header_height * 2 - self.padding[0] - self.padding[2]))
             paint.style = canvas.paint.Style.FILL
+            paint.stroke_width = 1
 
     def draw_background(self, canvas, paint, rect):
         radius = 10
@@ -4,6 +4,7 @@ from ..layout_widget import LayoutWidget
 from ..widget_preferences import HeadUpDisplayUserWidgetPreferences
 from ..utils import layout_rich_text, remove_tokens_from_rich_text, linear_gradient, retrieve_available_voice_commands, hex_to_ints, string_to_speakable_string, hit_test_icon, hit_test_button
 from ..content.typing import HudRichTextLine, HudPanelContent, HudButton, HudIcon, HudContentPage
+from ..theme import HudStyleValue
 from talon.types.point import Point2d
 from talon.skia import Paint
 import copy
@@ -15,6 +16,22 @@ def close_widget(widget):
 
 class HeadUpWalkthroughPanel(LayoutWidget):
     preferences = HeadUpDisplayUserWidgetPreferences(type="walkthrough", x=910, y=1000, width=100, height=20, limit_x=420, limit_y=784, limit_width=1080, limit_height=230, enabled=False, sleep_enabled=True, alignment="center", expand_direction="up", font_size=24)
+
+    style_values = LayoutWidget.style_values + [
+        HudStyleValue("button_background", default="BBBBBB"),
+        HudStyleValue("button_text_colour", default="000000FF"),
+        HudStyleValue("button_hover_background", default="CCCCCC"),
+        HudStyleValue("button_hover_text_colour", default="000000FF"),
+        HudStyleValue("text_colour"),
+        HudStyleValue("text_box_background", default="F5F5F5"),
+        HudStyleValue("spoken_voice_command_background_colour", default="6CC653"),
+        HudStyleValue("voice_command_background_colour", default="535353"),
+        HudStyleValue("spoken_voice_command_text_colour", default="000000FF"),
+        HudStyleValue("voice_command_text_colour", default="DDDDDD"),
+        HudStyleValue("close_icon_hover_colour"),
+        HudStyleValue("close_icon_accent_colour"),
+        HudStyleValue("close_icon_colour")
+    ]
     mouse_enabled = True
     step_scheduled = None
 
@@ -176,6 +193,7 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         super().set_preference(preference, value, persisted)
         
     def load_theme_values(self):
+        super().load_theme_values()
         self.intro_animation_start_colour = self.theme.get_colour_as_ints("intro_animation_start_colour")
         self.intro_animation_end_colour = self.theme.get_colour_as_ints("intro_animation_end_colour")
         self.blink_difference = [
@@ -204,7 +222,10 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         icon_padding = icon_radius
         layout_width = self.limit_width - self.padding[1] * 2 - self.padding[3] * 2 - icon_padding
         max_text_width = layout_width - icon_padding - self.padding[1] if self.width < self.limit_width else self.limit_width - self.padding[1] - self.padding[3] - icon_padding
-        content_text = [] if self.minimized else layout_rich_text(paint, current_walkthrough_step.content if not current_walkthrough_step.show_context_hint else current_walkthrough_step.context_hint, max_text_width, self.limit_height)
+        if current_walkthrough_step.show_context_hint:
+            content_text = [] if self.minimized else layout_rich_text(paint, current_walkthrough_step.context_hint, max_text_width, self.limit_height)
+        else:
+            content_text = [] if self.minimized else layout_rich_text(paint, current_walkthrough_step.content, max_text_width, self.limit_height, rich_text_tokens=current_walkthrough_step.rich_text_tokens)
         
         footer_height = self.font_size + self.padding[2] + self.padding[0]
         
@@ -350,7 +371,7 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         
         paint.style = paint.Style.FILL
         focus_width = 4
-        focus_colour = self.theme.get_colour("focus_colour")
+        focus_colour = self.style.focus_colour
         
         progress_bar_offset = 0
         progress_bar_height = 7
@@ -363,20 +384,20 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         buttons = dimensions["layout_buttons"]
         for index, button_layout in enumerate(buttons):
             self.walkthrough_buttons[index].rect = button_layout["rect"]
-            button_colour = self.theme.get_colour("button_background", "BBBBBB")
-            text_colour = self.theme.get_colour("button_text_colour", "000000FF")
+            button_colour = self.style.button_background
+            text_colour = self.style.button_text_colour
             button_hovered = self.walkthrough_button_hovered == index
             if animation_in_progress:
                 if len(button_colour) == 8:
                     button_colour = button_colour[:-2]
                 button_colour += "55" # More transparent during transition
             elif button_hovered:
-                button_colour = self.theme.get_colour("button_hover_background", "CCCCCC")
-                text_colour = self.theme.get_colour("button_hover_text_colour", "000000FF")
+                button_colour = self.style.button_hover_background
+                text_colour = self.style.button_hover_text_colour
                 
             paint.color = button_colour
             canvas.draw_rrect( skia.RoundRect.from_rect(button_layout["rect"], x=10, y=10) )
-            paint.color = self.theme.get_colour("text_colour")
+            paint.color = self.style.text_colour
             self.draw_rich_text(canvas, paint, button_layout["text"], button_layout["rect"].x + self.button_padding, button_layout["rect"].y, self.font_size, False,  current_walkthrough_step)
             if self.focused and self.current_focus and ( \
                 ( index == 0 and ( self.current_focus.equals("previous_step") or self.current_focus.equals("previous_page") ) or \
@@ -389,7 +410,7 @@ class HeadUpWalkthroughPanel(LayoutWidget):
                 paint.stroke_width = 1            
 
         # Draw the background first
-        background_colour = self.theme.get_colour("text_box_background", "F5F5F5")
+        background_colour = self.style.text_box_background
         paint.color = background_colour
         
         if animation_in_progress:
@@ -413,7 +434,7 @@ class HeadUpWalkthroughPanel(LayoutWidget):
             
             # Draw the progress bar
             progress = ( self.previous_progress.percent + ( growth * (abs(current_walkthrough_step.progress.percent - self.previous_progress.percent))) ) * 0.01
-            paint.color = self.theme.get_colour("spoken_voice_command_background_colour", "6CC653")
+            paint.color = self.style.spoken_voice_command_background_colour
             rect = ui.Rect(background_rect.x + progress_bar_offset, background_rect.y, \
                 min(background_rect.width - progress_bar_offset * 2, (background_rect.width - progress_bar_offset * 2) * progress), progress_bar_height)
             canvas.draw_rect(rect)
@@ -422,40 +443,58 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         else:
             self.animated_word_state = max(0, self.animated_word_state - 1)
             
-            # Draw the background first
-            background_rect = ui.Rect(dimensions["rect"].x, dimensions["rect"].y, dimensions["rect"].width, dimensions["rect"].height - dimensions["footer_height"])
-            self.draw_background(canvas, paint, background_rect)
-            
-            if self.focused and ( self.current_focus is None or self.current_focus.role == "widget"):
-                paint.style = canvas.paint.Style.STROKE
-                paint.stroke_width = focus_width
-                paint.color = focus_colour
-                self.draw_background(canvas, paint, background_rect)                
-                paint.style = canvas.paint.Style.FILL
-                paint.stroke_width = 1
-            
-            # Draw the progress bar
-            paint.color = self.theme.get_colour("spoken_voice_command_background_colour", "6CC653")
-            rect = ui.Rect(dimensions["rect"].x + progress_bar_offset, dimensions["rect"].y, \
-                min(dimensions["rect"].width - progress_bar_offset * 2, (dimensions["rect"].width  - progress_bar_offset * 2) * ( current_walkthrough_step.progress.percent * 0.01 )), progress_bar_height)
-            canvas.draw_rect(rect)
-                    
-            paint.color = self.theme.get_colour("text_colour")
+            focus_outlined = self.focused and ( self.current_focus is None or self.current_focus.role == "widget")
             
-            # Keep an offset of previous pages to make sure the animations are properly taken into account for highlighting commands
-            text_index_offset = 0
-            if self.page_index > 0:
-                current_page_index = self.page_index
-                while(current_page_index > 0):
-                    current_page_index -= 1
-                    text_index_offset += len(self.layout[current_page_index]["content_text"])
-                text_index_offset = max(0, text_index_offset)
-            self.draw_voice_command_backgrounds(canvas, paint, dimensions, self.animated_word_state, current_walkthrough_step, text_index_offset)
-            self.draw_content_text(canvas, paint, dimensions, current_walkthrough_step, text_index_offset)
+            # The spoken voice commands are only static when they are not being animated
+            if self.animated_word_state > 0:
+                self.draw_step_content(canvas, paint, dimensions, current_walkthrough_step, focus_outlined)
+            else:
+                self.draw_static_content(canvas, dimensions["rect"], (focus_outlined,),
+                    lambda static_canvas, static_paint: self.draw_step_content(static_canvas, static_paint, dimensions, current_walkthrough_step, focus_outlined))
             self.draw_header_buttons(canvas, paint, dimensions["rect"])
         
         return self.transition_animation_state > 0 or self.animated_word_state > 0
 
+    def draw_step_content(self, canvas, paint, dimensions, current_walkthrough_step, focus_outlined):
+        """Draws the background, progress bar and text of the current step"""
+        paint.textsize = self.font_size
+        paint.style = paint.Style.FILL
+        focus_width = 4
+        focus_colour = self.style.focus_colour
+        progress_bar_offset = 0
+        progress_bar_height = 7
+        
+        # Draw the background first
+        background_rect = ui.Rect(dimensions["rect"].x, dimensions["rect"].y, dimensions["rect"].width, dimensions["rect"].height - dimensions["footer_height"])
+        self.draw_background(canvas, paint, background_rect)
+        
+        if focus_outlined:
+            paint.style = canvas.paint.Style.STROKE
+            paint.stroke_width = focus_width
+            paint.color = focus_colour
+            self.draw_background(canvas, paint, background_rect)                
+            paint.style = canvas.paint.Style.FILL
+            paint.stroke_width = 1
+        
+        # Draw the progress bar
+        paint.color = self.style.spoken_voice_command_background_colour
+        rect = ui.Rect(dimensions["rect"].x + progress_bar_offset, dimensions["rect"].y, \
+            min(dimensions["rect"].width - progress_bar_offset * 2, (dimensions["rect"].width  - progress_bar_offset * 2) * ( current_walkthrough_step.progress.percent * 0.01 )), progress_bar_height)
+        canvas.draw_rect(rect)
+                
+        paint.color = self.style.text_colour
+        
+        # Keep an offset of previous pages to make sure the animations are properly taken into account for highlighting commands
+        text_index_offset = 0
+        if self.page_index > 0:
+            current_page_index = self.page_index
+            while(current_page_index > 0):
+                current_page_index -= 1
+                text_index_offset += len(self.layout[current_page_index]["content_text"])
+            text_index_offset = max(0, text_index_offset)
+        self.draw_voice_command_backgrounds(canvas, paint, dimensions, self.animated_word_state, current_walkthrough_step, text_index_offset)
+        self.draw_content_text(canvas, paint, dimensions, current_walkthrough_step, text_index_offset)
+
     def draw_animation(self, canvas, animation_tick):
         if self.enabled and self.should_enable():
             paint = canvas.paint
@@ -536,8 +575,8 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         x = dimensions.x + self.padding[3]
         y = dimensions.y + self.padding[0]
             
-        non_spoken_background_colour = self.theme.get_colour("voice_command_background_colour", "535353")
-        spoken_background_colour = self.theme.get_colour("spoken_voice_command_background_colour", "6CC653")
+        non_spoken_background_colour = self.style.voice_command_background_colour
+        spoken_background_colour = self.style.spoken_voice_command_background_colour
         
         current_line = -1
         for index, text in enumerate(rich_text):
@@ -609,13 +648,13 @@ class HeadUpWalkthroughPanel(LayoutWidget):
         # Mostly copied over from layout_widget
         # Draw text line by line
         text_colour = paint.color
-        error_colour = self.theme.get_colour("error_colour", "AA0000")
-        warning_colour = self.theme.get_colour("warning_colour", "F75B00")
-        success_colour = self.theme.get_colour("success_colour", "00CC00")
-        info_colour = self.theme.get_colour("info_colour", "30AD9E")
+        error_colour = self.style.error_colour
+        warning_colour = self.style.warning_colour
+        success_colour = self.style.success_colour
+        info_colour = self.style.info_colour
         
-        spoken_voice_command_text_colour = self.theme.get_colour("spoken_voice_command_text_colour", "000000FF")
-        voice_command_text_colour = self.theme.get_colour("voice_command_text_colour", "DDDDDD")
+        spoken_voice_command_text_colour = self.style.spoken_voice_command_text_colour
+        voice_command_text_colour = self.style.voice_command_text_colour
     
         current_line = -1
         for index, text in enumerate(rich_text):
@@ -661,8 +700,8 @@ class HeadUpWalkthroughPanel(LayoutWidget):
             self.icons[index].pos = icon_position
             paint.style = paint.Style.FILL
             if icon.id == "close":
-                close_colour = self.theme.get_colour("close_icon_hover_colour") if self.icon_hovered == index else self.theme.get_colour("close_icon_accent_colour")
-                paint.shader = linear_gradient(icon_position.x, dimensions.y, icon_position.x, icon_position.y + icon_radius, (self.theme.get_colour("close_icon_colour"), close_colour))
+                close_colour = self.style.close_icon_hover_colour if self.icon_hovered == index else self.style.close_icon_accent_colour
+                paint.shader = linear_gradient(icon_position.x, dimensions.y, icon_position.x, icon_position.y + icon_radius, (self.style.close_icon_colour, close_colour))
                 canvas.draw_circle(icon_position.x, icon_position.y, icon_radius, paint)
                 
     def generate_accessible_nodes(self, parent):